@@ -1,6 +1,8 @@
+from decimal import Decimal
 from os import getenv
 import json
 import boto3
+from botocore.exceptions import ClientError
 
 from aws_lambda_powertools.utilities.data_classes import AppSyncResolverEvent
 from aws_lambda_powertools import Logger, Tracer
@@ -15,6 +17,52 @@ session = boto3.Session()
 events = session.client('events')
 event_bus_name = getenv('EVENT_BUS')
 
+# Wallets are created here on sign-up, so a new user can deposit straight away without
+# waiting for the UserSignedUp event to reach the wallet service. The wallet service
+# publishes its table name in the WALLET_TABLE_PARAMETER SSM parameter, which is read
+# once per container, unless WALLET_TABLE names the table directly
+dynamodb = session.resource('dynamodb')
+ssm = session.client('ssm')
+wallet_table = None
+
+def get_wallet_table():
+    """
+    Get the wallet table, looking up its name on first use.
+    
+    Returns:
+        The wallet DynamoDB table
+    """
+    global wallet_table
+    if wallet_table is None:
+        table_name = getenv('WALLET_TABLE') or ssm.get_parameter(
+            Name=getenv('WALLET_TABLE_PARAMETER'))['Parameter']['Value']
+        wallet_table = dynamodb.Table(table_name)
+    return wallet_table
+
+def create_wallet(userId: str) -> bool:
+    """
+    Create an empty wallet for a new user unless one already exists.
+    
+    The put is conditional, so it never overwrites a wallet created by the
+    event driven createWallet mutation or by an earlier invocation.
+    
+    Args:
+        userId: ID of the user
+        
+    Returns:
+        True if the wallet was created, False if it already existed
+    """
+    try:
+        get_wallet_table().put_item(
+            Item={'userId': userId, 'balance': Decimal(0)},
+            ConditionExpression='attribute_not_exists(userId)'
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
 @tracer.capture_lambda_handler
 @logger.inject_lambda_context(log_event=True)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
@@ -22,7 +70,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     Lambda handler for Cognito post confirmation.
     
     This function is triggered after a user confirms their registration.
-    It sends a UserSignedUp event to EventBridge.
+    It creates the user's wallet and sends a UserSignedUp event to
+    EventBridge. A failure to create the wallet does not fail the sign-up,
+    as the wallet service still creates it from the event.
     
     Args:
         event: Cognito post confirmation event
@@ -34,6 +84,12 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     try:
         detail = {'userId': event['userName']}
 
+        if event.get('triggerSource') == 'PostConfirmation_ConfirmSignUp':
+            try:
+                create_wallet(detail['userId'])
+            except Exception as e:
+                logger.exception(f"Error creating wallet on sign-up: {str(e)}")
+
         events.put_events(
             Entries=[
                 {
@@ -1,35 +1,37 @@
 from os import getenv
-import json
-import boto3
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 from botocore.exceptions import ClientError
-from gql_utils import get_client
+import aws_clients
+import json_utils
+from event_publisher import EventPublisher
+from gql_utils import get_client, gql
 from mutations import lock_bets_for_event
-from gql import gql
+from projection import UserLockProjection
 
 processor = BatchProcessor(event_type=EventType.SQS)
 tracer = Tracer()
 logger = Logger()
 
 event_bus_name = getenv('EVENT_BUS')
-session = boto3.Session()
-events = session.client('events')
+events = aws_clients.client('events')
+publisher = EventPublisher(events)
 
 table_name = getenv('DB_TABLE')
 region = getenv("REGION")
-step_function = boto3.client('stepfunctions')
+step_function = aws_clients.client('stepfunctions')
 
-session = boto3.Session()
-dynamodb = session.resource('dynamodb')
-table = dynamodb.Table(table_name)
+table = aws_clients.table(table_name)
 
 appsync_url = getenv("APPSYNC_URL")
 gql_client = get_client(region, appsync_url)
 
+# Lock status of users, projected from com.pam userLocked events for bet placement to read
+user_locks = UserLockProjection(aws_clients.table(getenv('USER_LOCKS_TABLE')))
+
 def form_event(source, detailType, detail):
     """
     Form an event for EventBridge.
@@ -45,7 +47,7 @@ def form_event(source, detailType, detail):
     return {
         'Source': source,
         'DetailType': detailType,
-        'Detail': json.dumps(detail, default=str),
+        'Detail': json_utils.dumps(detail),
         'EventBusName': event_bus_name
     }
 
@@ -63,10 +65,13 @@ def record_handler(record: SQSRecord):
     try:
         payload = record.body
         if payload:
-            item = json.loads(payload)
+            item = json_utils.loads(payload)
             if item['source'] == 'com.livemarket':
                 if item['detail-type'] == 'EventClosed':
                     return handle_event_closed(item)
+            elif item['source'] == 'com.pam':
+                if item['detail-type'] == 'userLocked':
+                    return handle_user_locked(item)
 
         return None
     except Exception as e:
@@ -100,7 +105,7 @@ def handle_event_closed(item: dict) -> dict:
         for bet in update_info['bets']:
             result = step_function.start_execution(
                 stateMachineArn=getenv('STEP_FUNCTION_ARN'),
-                input=json.dumps(bet, default=str)
+                input=json_utils.dumps(bet)
                 )
             bet['result'] = result
 
@@ -113,26 +118,40 @@ def handle_event_closed(item: dict) -> dict:
         logger.exception("Error handling event closed")
         raise
 
-def raise_bet_event(formevent) -> dict:
+@tracer.capture_method
+def handle_user_locked(item: dict) -> None:
     """
-    Raise a bet event.
+    Handle a user locked event by updating the user lock projection.
     
     Args:
-        formevent: Event to raise
+        item: Event data
         
     Returns:
-        EventBridge response
+        None, as no event is raised
     """
     try:
-        return events.put_events(
-            Entries=[
-                formevent
-            ]
-        )
+        if not user_locks.apply(item):
+            logger.info(f"Ignoring out of order lock status for user {item['detail']['userId']}")
+        return None
     except Exception as e:
-        logger.exception("Error raising bet event")
+        logger.exception("Error handling user locked")
         raise
 
+def raise_bet_event(formevent) -> dict:
+    """
+    Raise a bet event.
+    
+    Args:
+        formevent: Event to raise
+        
+    Returns:
+        Dictionary of index to error code, empty if the event was published
+    """
+    errors = publisher.publish([formevent])
+    if errors:
+        logger.error(f"Error raising bet event: {errors[0]}")
+    return errors
+
 def bet_list_response(data: dict) -> dict:
     """
     Create a bet list response.
@@ -178,6 +197,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     output_events = [x[1]
                      for x in processed_messages if x[0] == "success" and x[1] is not None]
     if output_events:
-        events.put_events(Entries=output_events)
+        errors = publisher.publish(output_events)
+        if errors:
+            logger.error(f"Failed to publish {len(errors)} of {len(output_events)} events",
+                         extra={'errors': sorted(set(errors.values()))})
 
     return processor.response()
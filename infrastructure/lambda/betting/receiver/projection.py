@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+
+def parse_locked(value) -> bool:
+    """
+    Parse the isLocked flag of a userLocked event.
+
+    Args:
+        value: Flag as sent by the lockUser mutation, a string or a boolean
+
+    Returns:
+        True if the user is locked
+    """
+    return str(value).lower() == 'true'
+
+
+class UserLockProjection:
+    """
+    Lock status of users projected from com.pam userLocked events.
+
+    One item per user holds whether they are locked and the time of the
+    event that set it. Events can arrive out of order, so an event older
+    than the one already projected for the user is ignored.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def apply(self, item: dict) -> bool:
+        """
+        Project a userLocked event.
+
+        Args:
+            item: EventBridge event with the userId and isLocked of the user in its detail
+
+        Returns:
+            True if the projection was updated, False if a newer event was already projected
+
+        Raises:
+            KeyError: If the event has no userId
+        """
+        detail = item['detail']
+        updated_at = event_time(item)
+        try:
+            self.table.put_item(
+                Item={
+                    'userId': detail['userId'],
+                    'isLocked': parse_locked(detail.get('isLocked')),
+                    'updatedAt': updated_at
+                },
+                ConditionExpression='attribute_not_exists(updatedAt) OR updatedAt <= :t',
+                ExpressionAttributeValues={':t': updated_at}
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+
+def event_time(item: dict) -> str:
+    """
+    Get the time of an EventBridge event in a form that sorts chronologically.
+
+    Args:
+        item: EventBridge event
+
+    Returns:
+        ISO 8601 UTC time of the event, or the current time if it has none
+    """
+    value = item.get('time')
+    if value:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
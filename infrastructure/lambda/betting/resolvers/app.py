@@ -2,12 +2,13 @@ import time
 from datetime import datetime
 from decimal import Decimal
 from os import getenv
-import json
-import boto3
-from gql_utils import get_client
+import aws_clients
+import json_utils
+from event_publisher import EventPublisher
+from gql_utils import get_client, gql
 from queries import get_event 
 from mutations import deduct_funds
-from gql import gql
+from locks import UserLockCache
 
 from botocore.exceptions import ClientError
 
@@ -29,12 +30,18 @@ app = AppSyncResolver()
 table_name = getenv('DB_TABLE')
 appsync_url = getenv("APPSYNC_URL")
 region = getenv("REGION")
-session = boto3.Session()
-dynamodb = session.resource('dynamodb')
-table = dynamodb.Table(table_name)
+table = aws_clients.table(table_name)
 gql_client = get_client(region, appsync_url)
 event_bus_name = getenv('EVENT_BUS')
-events = session.client('events')
+events = aws_clients.client('events')
+publisher = EventPublisher(events)
+
+# Lock status of users is read from the projection kept by the receiver and cached
+# per container for USER_LOCK_CACHE_TTL seconds
+user_locks = UserLockCache(
+    aws_clients.table(getenv('USER_LOCKS_TABLE')),
+    ttl=float(getenv('USER_LOCK_CACHE_TTL', '30'))
+)
 
 
 @app.resolver(type_name="Query", field_name="getBets")
@@ -88,9 +95,13 @@ def create_bets(input: dict) -> dict:
     """
     try:
         userId = get_user_id(app.current_event)
+        if user_locks.is_locked(userId):
+            return betting_error('InputError', 'The account is locked and cannot place bets.')
+
         processed_bets = []
         now = time.time()
         placement_time = scalar_types_utils.aws_datetime()
+        placement_epoch = Decimal(str(now))
         total_stakes = 0.0
         
         for bet in input['bets']:
@@ -103,6 +114,7 @@ def create_bets(input: dict) -> dict:
             bet['betId'] = scalar_types_utils.make_id()
             bet['event'] = event
             bet['placedAt'] = placement_time
+            bet['placedAtEpoch'] = placement_epoch
             bet['amount'] = Decimal(bet['amount'])
             bet['betStatus'] = 'placed'
             total_stakes += float(bet['amount'])
@@ -125,6 +137,7 @@ def create_bets(input: dict) -> dict:
                     'eventId': bet['event']['eventId'],
                     'odds': bet['odds'],
                     'placedAt': bet['placedAt'],
+                    'placedAtEpoch': bet['placedAtEpoch'],
                     'outcome': bet['outcome'],
                     'betStatus': bet['betStatus'],
                     'amount': bet['amount']
@@ -336,7 +349,7 @@ def form_event(bet):
     return {
         'Source': 'com.betting',
         'DetailType': 'BetsPlaced',
-        'Detail': json.dumps(bet, default=str),
+        'Detail': json_utils.dumps(bet),
         'EventBusName': event_bus_name
     }
 
@@ -349,15 +362,12 @@ def send_event(bet):
         bet: Bet data
         
     Returns:
-        EventBridge response
+        Dictionary of index to error code, empty if the event was published
     """
-    try:
-        data = form_event(bet)
-        response = events.put_events(Entries=[data])
-        return response
-    except Exception as e:
-        logger.exception("Error sending event")
-        raise
+    errors = publisher.publish([form_event(bet)])
+    if errors:
+        logger.error(f"Error sending event: {errors[0]}")
+    return errors
 
 
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.APPSYNC_RESOLVER, log_event=True)
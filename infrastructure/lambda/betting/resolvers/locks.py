@@ -0,0 +1,49 @@
+import time
+from collections import OrderedDict
+
+
+class UserLockCache:
+    """
+    Lock status of users, read from the user lock projection and cached per container.
+
+    The receiver keeps the projection up to date from com.pam userLocked
+    events, so bet placement never has to ask Cognito. A user's status is
+    read from the projection once and then served from memory for ttl
+    seconds; users with no projection item have never been locked. The
+    cache holds a bounded number of users, evicting the least recently
+    used first.
+    """
+
+    def __init__(self, table, max_users: int = 10000, ttl: float = 30.0, clock=time.monotonic):
+        self.table = table
+        self.max_users = max_users
+        self.ttl = ttl
+        self.clock = clock
+        self._users = OrderedDict()
+
+    def is_locked(self, user_id: str) -> bool:
+        """
+        Check whether a user is locked.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            True if the user is locked
+
+        Raises:
+            ClientError: If the projection cannot be read
+        """
+        now = self.clock()
+        cached = self._users.get(user_id)
+        if cached is not None and now - cached[1] < self.ttl:
+            self._users.move_to_end(user_id)
+            return cached[0]
+
+        item = self.table.get_item(Key={'userId': user_id}).get('Item')
+        locked = bool(item and item.get('isLocked'))
+        self._users[user_id] = (locked, now)
+        self._users.move_to_end(user_id)
+        if len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return locked
@@ -1,6 +1,4 @@
 from os import getenv
-import json
-import boto3
 from decimal import Decimal
 
 from queries import get_event 
@@ -9,23 +7,23 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 from botocore.exceptions import ClientError
-from gql_utils import get_client
+import aws_clients
+import json_utils
+from event_publisher import EventPublisher
+from gql_utils import get_client, gql
 from mutations import deduct_funds, deposit_funds
-from gql import gql
 
 tracer = Tracer()
 logger = Logger()
 
 event_bus_name = getenv('EVENT_BUS')
-session = boto3.Session()
-events = session.client('events')
+events = aws_clients.client('events')
+publisher = EventPublisher(events)
 
 table_name = getenv('DB_TABLE')
 region = getenv("REGION")
 
-session = boto3.Session()
-dynamodb = session.resource('dynamodb')
-table = dynamodb.Table(table_name)
+table = aws_clients.table(table_name)
 
 appsync_url = getenv("APPSYNC_URL")
 gql_client = get_client(region, appsync_url)
@@ -44,7 +42,7 @@ def form_event(detailType, detail):
     return {
         'Source': 'com.betting.settlement',
         'DetailType': detailType,
-        'Detail': json.dumps(detail),
+        'Detail': json_utils.dumps(detail),
         'EventBusName': event_bus_name
     }
 
@@ -176,7 +174,9 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         settle_bet(event['betId'], event['userId'])
 
         event_data = form_event('BetSettlementComplete', response)
-        events.put_events(Entries=[event_data])
+        errors = publisher.publish([event_data])
+        if errors:
+            logger.error(f"Failed to publish BetSettlementComplete: {errors[0]}")
 
         return event_data
     except Exception as e:
@@ -0,0 +1,99 @@
+import threading
+
+import boto3
+
+# One session per container. Its loader parses each service model once, however many
+# clients and resources are created from it
+session = boto3.Session()
+
+_clients = {}
+_lock = threading.Lock()
+
+
+class Lazy:
+    """
+    Stand-in for an AWS client, resource or table that creates it on first use.
+
+    Functions assign these to module globals at import, as they did the real
+    objects, so a cold start only pays for the clients an invocation actually
+    uses. Tests can still patch the globals as before.
+    """
+
+    def __init__(self, create):
+        self._create = create
+        self._target = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name in ('_create', '_target', '_lock'):
+            raise AttributeError(name)
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._create()
+        return getattr(self._target, name)
+
+
+def get(kind: str, service_name: str, **kwargs):
+    """
+    Get the shared client or resource of a service, creating it on first use.
+
+    Args:
+        kind: 'client' or 'resource'
+        service_name: AWS service name such as 'events'
+        **kwargs: Arguments of the session's client or resource method, such as region_name or config
+
+    Returns:
+        The client or resource, the same object for the same arguments
+    """
+    key = (kind, service_name, tuple(sorted(kwargs.items(), key=lambda item: item[0])))
+    created = _clients.get(key)
+    if created is None:
+        # Creating clients from one session is not thread-safe
+        with _lock:
+            created = _clients.get(key)
+            if created is None:
+                created = getattr(session, kind)(service_name, **kwargs)
+                _clients[key] = created
+    return created
+
+
+def client(service_name: str, **kwargs) -> Lazy:
+    """
+    Get a client of a service that is created on first use.
+
+    Args:
+        service_name: AWS service name such as 'events'
+        **kwargs: Arguments of boto3.Session.client
+
+    Returns:
+        Lazy client
+    """
+    return Lazy(lambda: get('client', service_name, **kwargs))
+
+
+def resource(service_name: str, **kwargs) -> Lazy:
+    """
+    Get a resource of a service that is created on first use.
+
+    Args:
+        service_name: AWS service name such as 'dynamodb'
+        **kwargs: Arguments of boto3.Session.resource
+
+    Returns:
+        Lazy resource
+    """
+    return Lazy(lambda: get('resource', service_name, **kwargs))
+
+
+def table(table_name: str) -> Lazy:
+    """
+    Get a DynamoDB table that is created on first use.
+
+    Args:
+        table_name: Name of the table
+
+    Returns:
+        Lazy table
+    """
+    return Lazy(lambda: get('resource', 'dynamodb').Table(table_name))
@@ -0,0 +1,211 @@
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import chain
+
+from aws_lambda_powertools.metrics import EphemeralMetrics, MetricUnit
+
+# EventBridge accepts at most 10 entries and 256KB per PutEvents request
+MAX_ENTRIES_PER_PUT = 10
+MAX_PUT_SIZE_BYTES = 256 * 1024
+
+
+class EventPublisher:
+    """
+    Publishes EventBridge entries gathered during an invocation in as few requests as possible.
+
+    Entries are added as a function produces them and sent together by
+    flush, or streamed from an iterable by publish_indexed, split into
+    chunks EventBridge accepts in one PutEvents request and sent
+    concurrently. Only the entries EventBridge rejects are retried,
+    after an exponential backoff with full jitter. Each flush emits its
+    counts as CloudWatch embedded metrics.
+    """
+
+    def __init__(self, client, max_workers: int = 4, max_attempts: int = 3, base_delay: float = 0.05,
+                 max_delay: float = 1.0, namespace: str | None = None, sleep=time.sleep):
+        self.client = client
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Ephemeral so the counts of a flush are never mixed with metrics the function publishes itself
+        self.metrics = EphemeralMetrics(namespace=namespace or os.getenv('POWERTOOLS_METRICS_NAMESPACE', 'Sportsbook'))
+        self.sleep = sleep
+        self._entries = []
+
+    def add(self, entry: dict) -> int:
+        """
+        Add an entry to the next flush.
+
+        Args:
+            entry: Formatted EventBridge entry
+
+        Returns:
+            Index of the entry in the next flush
+        """
+        self._entries.append(entry)
+        return len(self._entries) - 1
+
+    def flush(self) -> dict:
+        """
+        Publish every entry added since the last flush.
+
+        Returns:
+            Dictionary of index to error code for entries that could not be published
+        """
+        entries, self._entries = self._entries, []
+        return self.publish_indexed(enumerate(entries))
+
+    def publish(self, entries: list) -> dict:
+        """
+        Add entries and flush at once.
+
+        Args:
+            entries: Formatted EventBridge entries
+
+        Returns:
+            Dictionary of index to error code for entries that could not be published
+        """
+        for entry in entries:
+            self.add(entry)
+        return self.flush()
+
+    def publish_indexed(self, indexed_entries) -> dict:
+        """
+        Publish (key, entry) pairs from any iterable, consuming it as chunks are sent.
+
+        At most max_workers chunks are in flight at once, so a generator is
+        never held in memory as a whole and the first chunks are sent before
+        it is exhausted.
+
+        Args:
+            indexed_entries: Iterable of (key, entry) pairs, the key identifying the entry to the caller
+
+        Returns:
+            Dictionary of key to error code for entries that could not be published
+        """
+        started = time.perf_counter()
+        chunks = chunk_entries(indexed_entries)
+        first = next(chunks, None)
+        if first is None:
+            return {}
+        second = next(chunks, None)
+
+        if second is None:
+            sent = len(first)
+            results = [self._put_with_retry(first)]
+        else:
+            sent = 0
+            results = []
+            in_flight = set()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for chunk in chain((first, second), chunks):
+                    if len(in_flight) >= self.max_workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        results += [future.result() for future in done]
+                    in_flight.add(executor.submit(self._put_with_retry, chunk))
+                    sent += len(chunk)
+                results += [future.result() for future in in_flight]
+
+        errors = {}
+        requests = retried = 0
+        for chunk_errors, chunk_requests, chunk_retried in results:
+            errors.update(chunk_errors)
+            requests += chunk_requests
+            retried += chunk_retried
+        self._emit_metrics({
+            'PublishedEvents': sent - len(errors),
+            'FailedEvents': len(errors),
+            'RetriedEvents': retried,
+            'PutEventsRequests': requests
+        }, (time.perf_counter() - started) * 1000)
+        return errors
+
+    def _put_with_retry(self, chunk: list) -> tuple:
+        """
+        Send one chunk of entries, retrying only the entries that failed.
+
+        Args:
+            chunk: List of (key, entry) pairs
+
+        Returns:
+            Tuple of the errors by key of entries still failing, the requests made and the entries retried
+        """
+        pending = chunk
+        errors = {}
+        requests = retried = 0
+        for attempt in range(self.max_attempts):
+            if attempt:
+                retried += len(pending)
+                self.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+            requests += 1
+            try:
+                response = self.client.put_events(Entries=[entry for _, entry in pending])
+            except Exception as e:
+                errors = {index: type(e).__name__ for index, _ in pending}
+                continue
+
+            if not response.get('FailedEntryCount'):
+                return {}, requests, retried
+
+            failed = [
+                (item, result) for item, result in zip(pending, response['Entries'])
+                if result.get('ErrorCode')
+            ]
+            pending = [item for item, _ in failed]
+            errors = {item[0]: result['ErrorCode'] for item, result in failed}
+            if not pending:
+                break
+        return errors, requests, retried
+
+    def _emit_metrics(self, counts: dict, latency_ms: float) -> None:
+        """Publish the counts and latency of a flush as CloudWatch embedded metrics."""
+        for name, value in counts.items():
+            self.metrics.add_metric(name=name, unit=MetricUnit.Count, value=value)
+        self.metrics.add_metric(name='PublishLatency', unit=MetricUnit.Milliseconds, value=round(latency_ms, 3))
+        self.metrics.flush_metrics()
+
+
+def chunk_entries(indexed_entries):
+    """
+    Split entries into chunks EventBridge accepts in a single PutEvents request.
+
+    Args:
+        indexed_entries: Iterable of (key, entry) pairs, consumed one chunk at a time
+
+    Yields:
+        Lists of (key, entry) pairs with at most 10 entries and 256KB in total
+    """
+    chunk = []
+    chunk_size = 0
+    for item in indexed_entries:
+        size = entry_size(item[1])
+        if chunk and (len(chunk) == MAX_ENTRIES_PER_PUT or chunk_size + size > MAX_PUT_SIZE_BYTES):
+            yield chunk
+            chunk = []
+            chunk_size = 0
+        chunk.append(item)
+        chunk_size += size
+    if chunk:
+        yield chunk
+
+
+def entry_size(entry: dict) -> int:
+    """
+    Calculate the size EventBridge counts towards the PutEvents limit for an entry.
+
+    Args:
+        entry: Formatted EventBridge entry
+
+    Returns:
+        Entry size in bytes
+    """
+    size = 14  # Time
+    for key in ('Source', 'DetailType', 'Detail'):
+        if entry.get(key):
+            size += len(entry[key].encode('utf-8'))
+    for resource in entry.get('Resources', []):
+        size += len(resource.encode('utf-8'))
+    return size
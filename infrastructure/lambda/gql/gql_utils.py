@@ -1,20 +1,39 @@
-import os
-from requests_aws4auth import AWS4Auth
-from gql import gql
-from gql.client import Client
-from gql.transport.requests import RequestsHTTPTransport
-from boto3 import Session as AWSSession
+from functools import lru_cache
+
+from aws_clients import Lazy, session
+
+# gql, requests and the SigV4 signer are imported on first use rather than at import, so
+# a function only pays for them when an invocation actually calls AppSync
+
 
 def get_client(region, gql_endpoint, timeout=5):
-    aws = AWSSession(aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                     aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                     aws_session_token=os.getenv('AWS_SESSION_TOKEN'),
-                     region_name=region)
-    credentials = aws.get_credentials().get_frozen_credentials()
+    """
+    Get a GraphQL client for an AppSync endpoint, created on first use.
+
+    Requests are signed with SigV4 using the credentials of the shared session.
+
+    Args:
+        region: Region of the AppSync API
+        gql_endpoint: URL of the AppSync GraphQL endpoint
+        timeout: Request timeout in seconds
+
+    Returns:
+        Lazy gql Client
+    """
+    return Lazy(lambda: create_client(region, gql_endpoint, timeout))
+
+
+def create_client(region, gql_endpoint, timeout=5):
+    """Create a SigV4 signed GraphQL client for an AppSync endpoint."""
+    from requests_aws4auth import AWS4Auth
+    from gql.client import Client
+    from gql.transport.requests import RequestsHTTPTransport
+
+    credentials = session.get_credentials().get_frozen_credentials()
     auth = AWS4Auth(
         credentials.access_key,
         credentials.secret_key,
-        aws.region_name,
+        region,
         'appsync',
         session_token=credentials.token,
     )
@@ -26,3 +45,20 @@ def get_client(region, gql_endpoint, timeout=5):
     )
     client = Client(transport=transport, fetch_schema_from_transport=False)
     return client
+
+
+@lru_cache(maxsize=None)
+def gql(request_string):
+    """
+    Parse a GraphQL operation, once per container.
+
+    Drop-in replacement for gql.gql, which parses the string on every call.
+
+    Args:
+        request_string: GraphQL operation
+
+    Returns:
+        Parsed document
+    """
+    from gql import gql as parse
+    return parse(request_string)
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import orjson
+
+# Serialization of EventBridge details, Step Functions input and SQS bodies. orjson encodes
+# and decodes several times faster than the standard library and writes datetimes as ISO 8601
+# itself; Decimals from DynamoDB are written as strings, as default=str always did
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def default(value):
+    """
+    Serialize the types orjson does not handle itself.
+
+    Args:
+        value: Value orjson could not serialize
+
+    Returns:
+        Serializable representation of the value
+
+    Raises:
+        TypeError: If the value is of any other type
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> str:
+    """
+    Serialize a value to a JSON string.
+
+    Args:
+        value: Value to serialize, which may contain Decimals, datetimes and sets
+
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(value, default=default, option=DUMPS_OPTIONS).decode('utf-8')
+
+
+def loads(data):
+    """
+    Parse a JSON string or bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    return orjson.loads(data)
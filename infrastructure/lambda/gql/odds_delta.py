@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+
+ODDS_FIELDS = ('homeOdds', 'awayOdds', 'drawOdds')
+
+
+class OddsDeltaCache:
+    """
+    Last published odds per event, used to drop updates that change nothing.
+
+    The fetcher filters the provider odds it polls and the trading receiver
+    the odds it prices, which move less often than the ticks behind them.
+    The cache lives for as long as the Lambda container, so a cold container
+    publishes everything it sees once and only real changes afterwards. The
+    number of events held is bounded, with the least recently updated event
+    evicted first, and unchanged odds are published again once they are older
+    than max_age so downstream services still converge after a missed event.
+    """
+
+    def __init__(self, max_events: int = 10000, max_age: float = 0.0, clock=time.monotonic):
+        self.max_events = max_events
+        self.max_age = max_age
+        self.clock = clock
+        self._odds = OrderedDict()
+
+    def changed(self, updates: list) -> list:
+        """
+        Filter odds updates down to the ones that differ from what was last published.
+
+        The returned updates are recorded as published; call forget for any
+        that then fail to publish so they are sent again on the next update.
+
+        Args:
+            updates: Odds updates with eventId and the odds fields
+
+        Returns:
+            Updates that change the odds of their event
+        """
+        now = self.clock()
+        result = []
+        for update in updates:
+            event_id = update['eventId']
+            odds = tuple(update.get(field) for field in ODDS_FIELDS)
+            cached = self._odds.get(event_id)
+            if cached is not None and cached[0] == odds and (not self.max_age or now - cached[1] < self.max_age):
+                continue
+            self._odds[event_id] = (odds, now)
+            self._odds.move_to_end(event_id)
+            result.append(update)
+
+        while len(self._odds) > self.max_events:
+            self._odds.popitem(last=False)
+        return result
+
+    def forget(self, event_ids) -> None:
+        """
+        Drop events from the cache so their next update is published whatever it is.
+
+        Args:
+            event_ids: IDs of the events to drop
+        """
+        for event_id in event_ids:
+            self._odds.pop(event_id, None)
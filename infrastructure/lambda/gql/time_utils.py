@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+
+def epoch_from_iso(value: str) -> Decimal:
+    """
+    Convert an AWSDateTime string to epoch seconds.
+
+    Date times without a Z or offset suffix are read as UTC, the time zone
+    every function writes them in.
+
+    Args:
+        value: ISO 8601 date time
+
+    Returns:
+        Epoch seconds as a Decimal suitable for DynamoDB
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 date time
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return Decimal(str(parsed.timestamp()))
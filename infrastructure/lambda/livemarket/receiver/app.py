@@ -1,9 +1,9 @@
 from os import getenv
-import json
-import boto3
-from gql_utils import get_client
-from mutations import update_event_odds, add_event, finish_event, suspend_market, unsuspend_market
-from gql import gql
+import aws_clients
+import json_utils
+from event_publisher import EventPublisher
+from gql_utils import get_client, gql
+from mutations import update_event_odds, add_event, add_events, finish_event, suspend_market, unsuspend_market
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -18,9 +18,9 @@ appsync_url = getenv("APPSYNC_URL")
 region = getenv("REGION")
 event_bus_name = getenv('EVENT_BUS')
 gql_client = get_client(region, appsync_url)
-session = boto3.Session()
-events = session.client('events')
-sqsqueue = session.client('sqs')
+events = aws_clients.client('events')
+publisher = EventPublisher(events)
+sqsqueue = aws_clients.client('sqs')
 queue_url = getenv('QUEUE')
 
 
@@ -104,19 +104,7 @@ def handle_add_event(item: dict) -> dict:
         Formatted event for EventBridge or None if error
     """
     try:
-        add_event_info = {
-            'eventId': item['detail']['eventId'],
-            'home': item['detail']['home'],
-            'away': item['detail']['away'],
-            'homeOdds': item['detail']['homeOdds'],
-            'awayOdds': item['detail']['awayOdds'],
-            'drawOdds': item['detail']['drawOdds'],
-            'start': item['detail']['start'],
-            'end': item['detail']['end'],
-            'updatedAt': item['detail']['updatedAt'],
-            'duration': item['detail']['duration'],
-            'eventStatus': item['detail']['eventStatus']
-        }
+        add_event_info = add_event_input(item)
 
         gql_input = {
             'input': add_event_info
@@ -135,6 +123,81 @@ def handle_add_event(item: dict) -> dict:
         return None
 
 
+@tracer.capture_method
+def handle_add_events(records: list) -> tuple:
+    """
+    Handle all add event notifications in a batch with a single addEvents call.
+    
+    Args:
+        records: List of (SQS record, parsed event) pairs for EventAdded notifications
+        
+    Returns:
+        Tuple of formatted events for EventBridge and message IDs of records that failed
+    """
+    failed_ids = []
+    message_ids = []
+    add_events_info = []
+    for record, item in records:
+        try:
+            add_events_info.append(add_event_input(item))
+            message_ids.append(record['messageId'])
+        except KeyError as e:
+            logger.error(f"Missing field in added event: {str(e)}")
+            failed_ids.append(record['messageId'])
+
+    if not add_events_info:
+        return [], failed_ids
+
+    try:
+        gql_input = {
+            'input': {'events': add_events_info}
+        }
+
+        response = gql_client.execute(gql(add_events), variable_values=gql_input)[
+            'addEvents']
+
+        if response['__typename'] == 'EventList':
+            return [form_event('com.livemarket', 'EventAdded', info) for info in add_events_info], failed_ids
+
+        logger.error(f"Failed to add events: {response['message']}")
+        return [], failed_ids + message_ids
+    except Exception as e:
+        logger.error(f"Error handling add events: {str(e)}")
+        return [], failed_ids + message_ids
+
+
+def add_event_input(item: dict) -> dict:
+    """
+    Build the addEvent input from an EventAdded notification.
+    
+    Args:
+        item: Event containing new event data
+        
+    Returns:
+        Input for the addEvent and addEvents mutations
+    """
+    add_event_info = {
+        'eventId': item['detail']['eventId'],
+        'home': item['detail']['home'],
+        'away': item['detail']['away'],
+        'homeOdds': item['detail']['homeOdds'],
+        'awayOdds': item['detail']['awayOdds'],
+        'drawOdds': item['detail']['drawOdds'],
+        'start': item['detail']['start'],
+        'end': item['detail']['end'],
+        'updatedAt': item['detail']['updatedAt'],
+        'duration': item['detail']['duration'],
+        'eventStatus': item['detail']['eventStatus']
+    }
+
+    # Forward numeric epochs when the publisher provides them
+    for epoch_field in ('startEpoch', 'endEpoch', 'updatedAtEpoch'):
+        if item['detail'].get(epoch_field) is not None:
+            add_event_info[epoch_field] = item['detail'][epoch_field]
+
+    return add_event_info
+
+
 def form_event(source, detail_type, detail):
     """
     Create a properly formatted event for EventBridge.
@@ -151,7 +214,7 @@ def form_event(source, detail_type, detail):
         return {
             'Source': source,
             'DetailType': detail_type,
-            'Detail': json.dumps(detail),
+            'Detail': json_utils.dumps(detail),
             'EventBusName': event_bus_name
         }
     except Exception as e:
@@ -175,10 +238,16 @@ def record_handler(record: SQSRecord):
         if not payload:
             return None
             
-        item = json.loads(payload)
+        item = json_utils.loads(payload)
         
-        if item['source'] == 'com.trading' and item['detail-type'] == 'UpdatedOdds':
-            return handle_updated_odds(item)
+        if item['source'] == 'com.trading':
+            if item['detail-type'] == 'UpdatedOdds':
+                return handle_updated_odds(item)
+            # Markets suspended automatically by the trading rules
+            elif item['detail-type'] == 'MarketSuspended':
+                return handle_market_suspended(item)
+            elif item['detail-type'] == 'MarketUnsuspended':
+                return handle_market_unsuspended(item)
             
         if item['source'] == 'com.thirdparty':
             if item['detail-type'] == 'EventClosed':
@@ -260,6 +329,30 @@ def handle_market_unsuspended(item: dict) -> dict:
         return None
 
 
+def partition_added_events(records: list) -> tuple:
+    """
+    Split SQS records into third-party EventAdded notifications and everything else.
+    
+    Args:
+        records: Raw SQS records
+        
+    Returns:
+        Tuple of (record, parsed event) pairs for EventAdded and the remaining records
+    """
+    added_records = []
+    other_records = []
+    for record in records:
+        try:
+            item = json_utils.loads(record['body']) if record.get('body') else None
+        except ValueError:
+            item = None
+        if item and item.get('source') == 'com.thirdparty' and item.get('detail-type') == 'EventAdded':
+            added_records.append((record, item))
+        else:
+            other_records.append(record)
+    return added_records, other_records
+
+
 @logger.inject_lambda_context(log_event=True)
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
@@ -274,21 +367,30 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         Batch processing response
     """
     try:
-        batch = event["Records"]
-        with processor(records=batch, handler=record_handler):
+        added_records, other_records = partition_added_events(event["Records"])
+
+        # New fixtures in the batch are written with a single addEvents call
+        output_events, failed_ids = handle_add_events(added_records) if added_records else ([], [])
+
+        with processor(records=other_records, handler=record_handler):
             processed_messages = processor.process()
 
         # Extract successful events that returned a value
-        output_events = [
+        output_events += [
             result[1] for result in processed_messages 
             if result[0] == "success" and result[1] is not None
         ]
         
         # Send events to EventBridge if any exist
         if output_events:
-            events.put_events(Entries=output_events)
+            errors = publisher.publish(output_events)
+            if errors:
+                logger.error(f"Failed to publish {len(errors)} of {len(output_events)} events",
+                             extra={'errors': sorted(set(errors.values()))})
 
-        return processor.response()
+        response = processor.response()
+        response['batchItemFailures'] += [{'itemIdentifier': message_id} for message_id in failed_ids]
+        return response
     except Exception as e:
         logger.error(f"Error in lambda handler: {str(e)}")
         return {"batchItemFailures": []}
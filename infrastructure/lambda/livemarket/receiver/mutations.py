@@ -131,6 +131,33 @@ mutation AddEvent ($input: AddEventInput!) {
 }
 """
 
+add_events = """
+mutation AddEvents ($input: AddEventsInput!) {
+  addEvents(input: $input) {
+    ... on EventList {
+      __typename
+      items {
+        eventId
+        home
+        away
+        homeOdds
+        awayOdds
+        drawOdds
+        start
+        end
+        updatedAt
+        duration
+        eventStatus
+      }
+    }
+    ... on Error {
+      __typename
+      message
+    }
+  }
+}
+"""
+
 lock_bets_for_event = """
 mutation MyMutation ($input: LockBetsForEventInput!){
   lockBetsForEvent (input: $input){
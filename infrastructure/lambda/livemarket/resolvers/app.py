@@ -1,5 +1,4 @@
 import time
-from datetime import datetime
 from decimal import Decimal
 from os import getenv
 import json
@@ -7,6 +6,9 @@ import boto3
 
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Key
+from event_publisher import EventPublisher
+from time_utils import epoch_from_iso
+from timeline import TimelineCache
 
 from aws_lambda_powertools.utilities.data_classes import AppSyncResolverEvent
 from aws_lambda_powertools import Logger, Tracer
@@ -28,6 +30,18 @@ table = dynamodb.Table(table_name)
 history_table = dynamodb.Table(history_table_name)
 event_bus_name = getenv('EVENT_BUS')
 events = session.client('events')
+publisher = EventPublisher(events)
+
+# ISO date time attributes that are also stored as numeric epochs under '<name>Epoch'
+EPOCH_FIELDS = ('start', 'end', 'updatedAt')
+
+# Point-in-time lookups are served from a per-container copy of the history table, synced past the
+# requested time. Lookups at the current time, which bets are validated at, always read the events table
+timeline = TimelineCache(
+    history_table,
+    max_events=int(getenv('TIMELINE_MAX_EVENTS', '1000')),
+    max_entries=int(getenv('TIMELINE_MAX_ENTRIES', '256'))
+)
 
 
 @app.resolver(type_name="Query", field_name="getEvents")
@@ -96,16 +110,22 @@ def get_event(eventId: str, timestamp: float = None) -> dict:
         Event data or error response
     """
     try:
+        if timestamp is not None:
+            snapshot = timeline.lookup(eventId, timestamp)
+            if snapshot is not None:
+                return event_response(snapshot)
+
         current_event = table.get_item(Key={'eventId': eventId})['Item']
 
         if timestamp is None:
             return event_response(current_event)
 
-        current_event_ts = datetime.fromisoformat(
-            current_event['updatedAt'][0:-1])
-        requested_ts = datetime.fromtimestamp(timestamp)
+        if 'updatedAtEpoch' in current_event:
+            current_event_ts = float(current_event['updatedAtEpoch'])
+        else:
+            current_event_ts = float(epoch_from_iso(current_event['updatedAt']))
 
-        if current_event_ts < requested_ts:
+        if current_event_ts < timestamp:
             return event_response(current_event)
 
         # get the first entry from history that is older than the request
@@ -113,7 +133,7 @@ def get_event(eventId: str, timestamp: float = None) -> dict:
             KeyConditionExpression='eventId = :e AND #t < :t',
             ExpressionAttributeValues={
                 ':e': eventId,
-                ':t': Decimal(requested_ts.timestamp())
+                ':t': Decimal(timestamp)
             },
             ExpressionAttributeNames={
                 '#t': 'timestamp'
@@ -153,22 +173,20 @@ def update_event_odds(input: dict) -> dict:
         now = scalar_types_utils.aws_datetime()
         response = table.update_item(
             Key={'eventId': input['eventId']},
-            UpdateExpression="set homeOdds=:h, awayOdds=:a, drawOdds=:d, updatedAt=:u",
+            UpdateExpression="set homeOdds=:h, awayOdds=:a, drawOdds=:d, updatedAt=:u, updatedAtEpoch=:ue",
             ConditionExpression="attribute_exists(eventId)",
             ExpressionAttributeValues={
                 ':h': input['homeOdds'],
                 ':a': input['awayOdds'],
                 ':d': input['drawOdds'],
-                ':u': now
+                ':u': now,
+                ':ue': epoch_from_iso(now)
             },
             ReturnValues="ALL_NEW")
         current_event = response['Attributes']
 
         # Write the current state to the history log to persist for the configured time
-        epoch = Decimal(time.time())
-        history_entry = {**current_event, **
-                         {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
-        history_table.put_item(Item=history_entry)
+        write_history(current_event)
 
         return event_response(current_event)
     except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
@@ -219,10 +237,7 @@ def suspend_market(input: dict) -> dict:
         current_event = response['Attributes']
 
         # Write the current state to the history log
-        epoch = Decimal(time.time())
-        history_entry = {**current_event, **
-                         {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
-        history_table.put_item(Item=history_entry)
+        write_history(current_event)
 
         return event_response(current_event)
     except ClientError as e:
@@ -271,10 +286,7 @@ def unsuspend_market(input: dict) -> dict:
         current_event = response['Attributes']
 
         # Write the current state to the history log
-        epoch = Decimal(time.time())
-        history_entry = {**current_event, **
-                         {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
-        history_table.put_item(Item=history_entry)
+        write_history(current_event)
 
         return event_response(current_event)
     except ClientError as e:
@@ -309,10 +321,7 @@ def close_market(input: dict) -> dict:
         current_event = response['Attributes']
 
         # Write the current state to the history log
-        epoch = Decimal(time.time())
-        history_entry = {**current_event, **
-                         {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
-        history_table.put_item(Item=history_entry)
+        write_history(current_event)
 
         return event_response(current_event)
     except ClientError as e:
@@ -339,21 +348,19 @@ def finish_event(input: dict) -> dict:
         now = scalar_types_utils.aws_datetime()
         response = table.update_item(
             Key={'eventId': input['eventId']},
-            UpdateExpression="set eventStatus=:d, updatedAt=:u, outcome=:o",
+            UpdateExpression="set eventStatus=:d, updatedAt=:u, updatedAtEpoch=:ue, outcome=:o",
             ConditionExpression="attribute_exists(eventId)",
             ExpressionAttributeValues={
                 ':d': input['eventStatus'],
                 ':u': now,
+                ':ue': epoch_from_iso(now),
                 ':o': input['outcome']
             },
             ReturnValues="ALL_NEW")
         current_event = response['Attributes']
 
         # Write the current state to the history log to persist for the configured time
-        epoch = Decimal(time.time())
-        history_entry = {**current_event, **
-                         {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
-        history_table.put_item(Item=history_entry)
+        write_history(current_event)
 
         return event_response(current_event)
     except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
@@ -477,7 +484,12 @@ def add_event(input: dict) -> dict:
         Added event data or error response
     """
     try:
+        set_epoch_fields(input)
         table.put_item(Item=input)
+
+        # Seed the history log so point-in-time lookups cover the event from creation
+        write_history(input)
+
         return event_response(input)
     except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
         return events_error('InputError', 'The event could not be added in the dynamodb table')
@@ -489,6 +501,91 @@ def add_event(input: dict) -> dict:
         return events_error('UnknownError', 'An unknown error occurred while adding event.')
 
 
+@app.resolver(type_name="Mutation", field_name="addEvents")
+@tracer.capture_method
+def add_events(input: dict) -> dict:
+    """
+    Add a batch of new events.
+    
+    Events and their initial history snapshots are written with DynamoDB batch
+    writers, which resend any unprocessed items until the batch is stored.
+    
+    Args:
+        input: Batch of event data to add
+        
+    Returns:
+        List of added events or error response
+    """
+    try:
+        items = [set_epoch_fields(event_input) for event_input in input['events']]
+        epoch = Decimal(time.time())
+
+        with table.batch_writer(overwrite_by_pkeys=['eventId']) as batch, \
+                history_table.batch_writer(overwrite_by_pkeys=['eventId', 'timestamp']) as history_batch:
+            for item in items:
+                batch.put_item(Item=item)
+                history_batch.put_item(Item=history_entry(item, epoch))
+
+        for item in items:
+            timeline.record(item['eventId'], epoch, item)
+
+        return event_list_response({'items': items})
+    except ClientError as e:
+        logger.error(f"DynamoDB client error in add_events: {str(e)}")
+        return events_error('UnknownError', 'An unknown error occurred while adding events.')
+    except Exception as e:
+        logger.error(f"Error in add_events: {str(e)}")
+        return events_error('UnknownError', 'An unknown error occurred while adding events.')
+
+
+def set_epoch_fields(event_input: dict) -> dict:
+    """
+    Store numeric epochs next to the ISO date time strings of an event.
+    
+    Epochs sent by the publisher are kept, otherwise they are derived from the strings.
+    
+    Args:
+        event_input: Event data to add
+        
+    Returns:
+        The event data with epoch fields set
+    """
+    for field in EPOCH_FIELDS:
+        epoch_field = f'{field}Epoch'
+        if event_input.get(epoch_field) is not None:
+            event_input[epoch_field] = Decimal(str(event_input[epoch_field]))
+        elif event_input.get(field):
+            event_input[epoch_field] = epoch_from_iso(event_input[field])
+    return event_input
+
+
+def write_history(current_event: dict) -> None:
+    """
+    Write the current state of an event to the history log.
+    
+    Args:
+        current_event: Event data as stored after the update
+    """
+    epoch = Decimal(time.time())
+    history_table.put_item(Item=history_entry(current_event, epoch))
+    timeline.record(current_event['eventId'], epoch, current_event)
+
+
+def history_entry(current_event: dict, epoch: Decimal) -> dict:
+    """
+    Create a history log row for an event.
+    
+    Args:
+        current_event: Event data as stored after the update
+        epoch: Time of the snapshot
+        
+    Returns:
+        History row that expires after the configured retention
+    """
+    return {**current_event, **
+            {'timestamp': epoch, 'expiry': epoch + history_retention_seconds}}
+
+
 def form_event(detail_type, event_data, market_name=None):
     """
     Create a properly formatted event for EventBridge.
@@ -521,13 +618,14 @@ def send_event(current_event, detail_type, market_name=None):
         current_event: Event data to send
         detail_type: Type of event
         market_name: Optional market name
+        
+    Raises:
+        RuntimeError: If EventBridge did not accept the event after retries
     """
-    try:
-        event_entry = form_event(detail_type, current_event, market_name)
-        events.put_events(Entries=[event_entry])
-    except Exception as e:
-        logger.error(f"Error sending event: {str(e)}")
-        raise
+    errors = publisher.publish([form_event(detail_type, current_event, market_name)])
+    if errors:
+        logger.error(f"Error sending event: {errors[0]}")
+        raise RuntimeError(f"{detail_type} event was not published: {errors[0]}")
 
 
 def events_error(error_type: str, error_msg: str) -> dict:
@@ -0,0 +1,201 @@
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from decimal import Decimal
+
+# History rows are written by any container running the resolvers, and the epoch is
+# taken just before the put_item lands. Treat the last sync as slightly older than it
+# was so a row written during the sync window is still picked up by the next refresh.
+SYNC_GUARD_SECONDS = 1.0
+
+
+class EventTimeline:
+    """
+    Sorted snapshots of a single event, keyed by their history epoch.
+
+    Epochs and snapshots are kept as parallel lists so point-in-time lookups
+    are a bisect over plain floats.
+    """
+    __slots__ = ('epochs', 'snapshots', 'synced_at')
+
+    def __init__(self):
+        self.epochs = []
+        self.snapshots = []
+        self.synced_at = 0.0
+
+    def add(self, epoch: float, snapshot: dict) -> None:
+        """
+        Add a snapshot, keeping the timeline ordered by epoch.
+
+        Args:
+            epoch: History timestamp of the snapshot
+            snapshot: Event state at that timestamp
+        """
+        if not self.epochs or epoch > self.epochs[-1]:
+            self.epochs.append(epoch)
+            self.snapshots.append(snapshot)
+            return
+
+        index = bisect_left(self.epochs, epoch)
+        if index < len(self.epochs) and self.epochs[index] == epoch:
+            self.snapshots[index] = snapshot
+            return
+        insort(self.epochs, epoch)
+        self.snapshots.insert(index, snapshot)
+
+    def trim(self, max_entries: int) -> None:
+        """
+        Drop the oldest snapshots beyond max_entries.
+
+        Args:
+            max_entries: Maximum number of snapshots to keep
+        """
+        excess = len(self.epochs) - max_entries
+        if excess > 0:
+            del self.epochs[:excess]
+            del self.snapshots[:excess]
+
+    def at(self, timestamp: float) -> dict | None:
+        """
+        Get the newest snapshot strictly older than the timestamp.
+
+        Args:
+            timestamp: Requested point in time as epoch seconds
+
+        Returns:
+            Event snapshot, or None if the timeline does not reach back that far
+        """
+        index = bisect_left(self.epochs, timestamp)
+        if index == 0:
+            return None
+        return self.snapshots[index - 1]
+
+
+class TimelineCache:
+    """
+    Per-container cache of event timelines backed by the history table.
+
+    Timelines are loaded lazily on the first point-in-time lookup for an event
+    and refreshed incrementally afterwards, only reading history rows newer
+    than the last one held. A lookup is only answered from a timeline that
+    has been synced past the requested time, so answers are never stale. A
+    lookup within SYNC_GUARD_SECONDS of the current time, such as the one bet
+    validation makes, cannot be covered by any sync and is left to the
+    caller. The number of events and the number of snapshots per event are
+    both bounded, with the least recently used event evicted first.
+    """
+
+    def __init__(self, history_table, max_events: int = 1000, max_entries: int = 256, clock=time.time):
+        self.history_table = history_table
+        self.max_events = max_events
+        self.max_entries = max_entries
+        self.clock = clock
+        self._timelines = OrderedDict()
+
+    def lookup(self, event_id: str, timestamp: float) -> dict | None:
+        """
+        Get the state of an event at a point in time.
+
+        Args:
+            event_id: ID of the event
+            timestamp: Requested point in time as epoch seconds
+
+        Returns:
+            Event snapshot, or None if the answer is not held in the timeline
+            or the time is too recent to be answered from it
+        """
+        if timestamp > self.clock() - SYNC_GUARD_SECONDS:
+            return None
+
+        timeline = self._timelines.get(event_id)
+        if timeline is None:
+            timeline = EventTimeline()
+            self._timelines[event_id] = timeline
+            if len(self._timelines) > self.max_events:
+                self._timelines.popitem(last=False)
+        else:
+            self._timelines.move_to_end(event_id)
+
+        if timestamp > timeline.synced_at:
+            self._refresh(event_id, timeline)
+
+        return timeline.at(timestamp)
+
+    def record(self, event_id: str, epoch, snapshot: dict) -> None:
+        """
+        Add a snapshot written by this container to an already loaded timeline.
+
+        Args:
+            event_id: ID of the event
+            epoch: History timestamp of the snapshot
+            snapshot: Event state at that timestamp
+        """
+        timeline = self._timelines.get(event_id)
+        if timeline is None:
+            return
+        timeline.add(float(epoch), _strip_history_fields(snapshot))
+        timeline.trim(self.max_entries)
+
+    def _refresh(self, event_id: str, timeline: EventTimeline) -> None:
+        """
+        Pull history rows newer than the latest snapshot held for an event.
+
+        Args:
+            event_id: ID of the event
+            timeline: Timeline to bring up to date
+        """
+        started = self.clock()
+        args = {
+            'KeyConditionExpression': 'eventId = :e',
+            'ExpressionAttributeValues': {':e': event_id},
+            'ScanIndexForward': False,
+            'ConsistentRead': True,
+            'Limit': self.max_entries
+        }
+        if timeline.epochs:
+            # Re-read from the last sync point too, in case another container's row
+            # landed after we synced with an epoch older than our newest snapshot.
+            since = min(timeline.epochs[-1], timeline.synced_at)
+            args['KeyConditionExpression'] = 'eventId = :e AND #t > :t'
+            args['ExpressionAttributeNames'] = {'#t': 'timestamp'}
+            args['ExpressionAttributeValues'][':t'] = _history_timestamp(since)
+
+        response = self.history_table.query(**args)
+        items = response.get('Items', [])
+
+        # A full or truncated page means rows may be missing between what we hold and
+        # what was returned, so start the timeline again from the returned rows.
+        if len(items) >= self.max_entries or response.get('LastEvaluatedKey'):
+            timeline.epochs.clear()
+            timeline.snapshots.clear()
+
+        for item in reversed(items):
+            timeline.add(float(item['timestamp']), _strip_history_fields(item))
+        timeline.trim(self.max_entries)
+        timeline.synced_at = started - SYNC_GUARD_SECONDS
+
+
+def _history_timestamp(epoch: float):
+    """
+    Convert an epoch back to the Decimal type stored in the history table.
+
+    Args:
+        epoch: Epoch seconds
+
+    Returns:
+        Decimal timestamp
+    """
+    return Decimal(repr(epoch))
+
+
+def _strip_history_fields(item: dict) -> dict:
+    """
+    Remove the history bookkeeping attributes from a snapshot.
+
+    Args:
+        item: History row or event item
+
+    Returns:
+        Event snapshot
+    """
+    return {k: v for k, v in item.items() if k not in ('timestamp', 'expiry')}
@@ -3,6 +3,7 @@ import boto3
 import json
 
 from crhelper import CfnResource
+from time_utils import epoch_from_iso
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.data_classes.appsync import scalar_types_utils
@@ -39,9 +40,13 @@ def create(event, context):
             events = json.load(f)
 
         now = scalar_types_utils.aws_datetime()
+        now_epoch = epoch_from_iso(now)
         with table.batch_writer() as batch:
             for event_item in events:
                 event_item['updatedAt'] = now
+                event_item['updatedAtEpoch'] = now_epoch
+                event_item['startEpoch'] = epoch_from_iso(event_item['start'])
+                event_item['endEpoch'] = epoch_from_iso(event_item['end'])
                 event_item['eventStatus'] = 'running'
                 batch.put_item(Item=event_item)
 
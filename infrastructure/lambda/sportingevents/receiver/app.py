@@ -1,4 +1,5 @@
 from os import getenv
+import re
 import boto3
 import json
 
@@ -6,8 +7,34 @@ from crhelper import CfnResource
 from aws_lambda_powertools import Logger
 from datetime import datetime
 
+import json_utils
+from event_publisher import EventPublisher
+
 logger = Logger()
 
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# PutEvents requests in flight at once while publishing a bulk request
+BULK_PUBLISH_CONCURRENCY = int(getenv('BULK_PUBLISH_CONCURRENCY', '8'))
+
+# Accepted types for each field of an incoming sporting event
+EVENT_SCHEMA = {
+    'eventId': (str,),
+    'homeTeam': (str,),
+    'awayTeam': (str,),
+    'startTime': (int, float),
+    'endTime': (int, float),
+    'updatedAt': (int, float),
+    'duration': (int, float, str),
+    'state': (str,),
+    'homeOdds': (str, int, float),
+    'awayOdds': (str, int, float),
+    'drawOdds': (str, int, float)
+}
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+
 helper = CfnResource(json_logging=False, log_level='DEBUG',
                      boto_level='CRITICAL')
 
@@ -15,6 +42,7 @@ try:
     event_bus_name = getenv('EVENT_BUS')
     session = boto3.Session()
     eventsClient = session.client('events')
+    publisher = EventPublisher(eventsClient, max_workers=BULK_PUBLISH_CONCURRENCY)
 except Exception as e:
     helper.init_failure(e)
 
@@ -31,8 +59,21 @@ def lambda_handler(event, context):
         Response with status code and message
     """
     try:
+        mode = request_mode(event)
+        date_format = DATE_FORMAT
+
+        if mode == 'stream':
+            return bulk_response(stream_ingest(event.get('body'), date_format))
+
+        if mode == 'bulk':
+            try:
+                betting_events = json.loads(event.get('body') or '')
+            except ValueError as e:
+                logger.error(f"Error parsing bulk events: {str(e)}")
+                return bulk_response(rejected_report(f'Malformed JSON: {str(e)}'))
+            return bulk_response(bulk_ingest(betting_events, date_format))
+
         betting_events = json.loads(event.get('body'))
-        date_format = '%Y-%m-%dT%H:%M:%SZ'
         
         for betting_event in betting_events:
             try:
@@ -68,46 +109,12 @@ def send_new_event(betting_event, date_format):
         Exception: If required fields are missing or processing fails
     """
     try:
-        # Extract required fields
-        event_id = betting_event['eventId']
-        home_team = betting_event['homeTeam']
-        away_team = betting_event['awayTeam']
-        
-        # Process timestamps
-        start_time = datetime.fromtimestamp(betting_event['startTime']/1000.0).strftime(date_format)
-        end_time = datetime.fromtimestamp(betting_event['endTime']/1000.0).strftime(date_format)
-        updated_at = datetime.fromtimestamp(betting_event['updatedAt']/1000.0).strftime(date_format)
-        
-        # Extract other fields
-        duration = betting_event['duration']
-        event_status = betting_event['state']
-        away_odds = betting_event['awayOdds']
-        draw_odds = betting_event['drawOdds']
-        home_odds = betting_event['homeOdds']
-        
-        # Validate required fields
-        if None in (event_id, home_team, away_team, start_time, duration, event_status):
-            raise Exception("Null values are not allowed in required fields")
-        
-        # Prepare event item
-        item = {
-            'eventId': event_id,
-            'home': home_team,
-            'away': away_team,
-            'start': str(start_time),
-            'updatedAt': str(updated_at),
-            'end': str(end_time),
-            'duration': str(duration),
-            'homeOdds': home_odds,
-            'eventStatus': event_status,
-            'drawOdds': draw_odds,
-            'awayOdds': away_odds
-        }
+        item = transform_event(betting_event, date_format)
         
         # Send event to EventBridge
-        eventsClient.put_events(
-            Entries=form_event('EventAdded', item)
-        )
+        errors = publisher.publish(form_event('EventAdded', item))
+        if errors:
+            raise Exception(f"EventAdded event was not published: {errors[0]}")
     except KeyError as e:
         logger.error(f"Missing required field in betting event: {str(e)}")
         raise Exception(f"Missing required field: {str(e)}")
@@ -116,6 +123,287 @@ def send_new_event(betting_event, date_format):
         raise Exception(f"Failed to process event: {str(e)}")
 
 
+def transform_event(betting_event, date_format):
+    """
+    Convert an incoming sporting event to the EventAdded detail format.
+    
+    Args:
+        betting_event: The event data to process
+        date_format: Format string for date/time fields
+        
+    Returns:
+        Event detail ready for EventBridge
+        
+    Raises:
+        KeyError: If a required field is missing
+        Exception: If a required field is null
+    """
+    # Extract required fields
+    event_id = betting_event['eventId']
+    home_team = betting_event['homeTeam']
+    away_team = betting_event['awayTeam']
+    
+    # Process timestamps, keeping the epoch seconds alongside the formatted strings
+    start_epoch = betting_event['startTime']/1000.0
+    end_epoch = betting_event['endTime']/1000.0
+    updated_epoch = betting_event['updatedAt']/1000.0
+    start_time = datetime.fromtimestamp(start_epoch).strftime(date_format)
+    end_time = datetime.fromtimestamp(end_epoch).strftime(date_format)
+    updated_at = datetime.fromtimestamp(updated_epoch).strftime(date_format)
+    
+    # Extract other fields
+    duration = betting_event['duration']
+    event_status = betting_event['state']
+    away_odds = betting_event['awayOdds']
+    draw_odds = betting_event['drawOdds']
+    home_odds = betting_event['homeOdds']
+    
+    # Validate required fields
+    if None in (event_id, home_team, away_team, start_time, duration, event_status):
+        raise Exception("Null values are not allowed in required fields")
+    
+    # Prepare event item
+    return {
+        'eventId': event_id,
+        'home': home_team,
+        'away': away_team,
+        'start': str(start_time),
+        'updatedAt': str(updated_at),
+        'end': str(end_time),
+        'startEpoch': start_epoch,
+        'updatedAtEpoch': updated_epoch,
+        'endEpoch': end_epoch,
+        'duration': str(duration),
+        'homeOdds': home_odds,
+        'eventStatus': event_status,
+        'drawOdds': draw_odds,
+        'awayOdds': away_odds
+    }
+
+
+def request_mode(event):
+    """
+    Get the ingestion mode requested with the ?mode= query string parameter.
+    
+    Args:
+        event: API Gateway proxy event
+        
+    Returns:
+        'bulk', 'stream', or None for the single event path
+    """
+    return (event.get('queryStringParameters') or {}).get('mode')
+
+
+def validate_event(betting_event):
+    """
+    Validate a sporting event against the event schema.
+    
+    Args:
+        betting_event: The event data to validate
+        
+    Returns:
+        Error message, or None if the event is valid
+    """
+    if not isinstance(betting_event, dict):
+        return 'Event must be an object'
+    for field, types in EVENT_SCHEMA.items():
+        value = betting_event.get(field)
+        if value is None:
+            return f'Missing required field: {field}'
+        if isinstance(value, bool) or not isinstance(value, types):
+            return f'Invalid type for field: {field}'
+    return None
+
+
+def bulk_ingest(betting_events, date_format):
+    """
+    Validate, transform and publish a list of sporting events in bulk.
+    
+    The whole payload is validated before anything is published. Valid events
+    are published in chunks of up to 10 entries and 256KB, and only the
+    entries that EventBridge reports as failed are retried.
+    
+    Args:
+        betting_events: List of incoming sporting events
+        date_format: Format string for date/time fields
+        
+    Returns:
+        Report with published and failed counts and a result per item, or
+        with an error when the payload is not a list
+    """
+    if not isinstance(betting_events, list):
+        return rejected_report('Bulk payload must be a list of events')
+
+    results = []
+    entries = []
+    for index, betting_event in enumerate(betting_events):
+        error = validate_event(betting_event)
+        if error is None:
+            try:
+                entries.append((index, form_event('EventAdded', transform_event(betting_event, date_format))[0]))
+            except Exception as e:
+                error = str(e)
+        results.append(item_result(index, betting_event, error, 'invalid'))
+
+    publish_errors = publish_entries(entries)
+    for index, error in publish_errors.items():
+        results[index] = item_result(index, betting_events[index], error, 'failed')
+
+    return {
+        'published': len(entries) - len(publish_errors),
+        'failed': len(results) - len(entries) + len(publish_errors),
+        'results': results
+    }
+
+
+def stream_ingest(body, date_format):
+    """
+    Parse, validate, transform and publish a JSON array of sporting events as a stream.
+    
+    Items are decoded one at a time and flow through a generator pipeline into
+    the chunked publisher, so only the chunks in flight are held as parsed
+    events or EventBridge entries, and the first chunks are published before
+    the rest of the body has been parsed. Only items that were not published
+    are listed in the report.
+    
+    Args:
+        body: Request body containing a JSON array of events
+        date_format: Format string for date/time fields
+        
+    Returns:
+        Report with published and failed counts and a result per failed item
+    """
+    report = {'published': 0, 'failed': 0, 'results': []}
+
+    def entries():
+        try:
+            for index, betting_event in enumerate(iter_json_array(body or '')):
+                error = validate_event(betting_event)
+                if error is None:
+                    try:
+                        entry = form_event('EventAdded', transform_event(betting_event, date_format))[0]
+                        report['published'] += 1
+                        yield (index, betting_event['eventId']), entry
+                        continue
+                    except Exception as e:
+                        error = str(e)
+                report['failed'] += 1
+                report['results'].append(item_result(index, betting_event, error, 'invalid'))
+        except ValueError as e:
+            logger.error(f"Error parsing streamed events: {str(e)}")
+            report['error'] = f'Malformed JSON: {str(e)}'
+
+    publish_errors = publish_entries(entries())
+    for (index, event_id), error in publish_errors.items():
+        report['results'].append({'index': index, 'eventId': event_id, 'status': 'failed', 'error': error})
+    report['published'] -= len(publish_errors)
+    report['failed'] += len(publish_errors)
+    report['results'].sort(key=lambda result: result['index'])
+    return report
+
+
+def iter_json_array(body):
+    """
+    Decode the items of a JSON array one at a time.
+    
+    Args:
+        body: JSON text containing an array
+        
+    Yields:
+        Each decoded item of the array
+        
+    Raises:
+        ValueError: If the body is not a well formed JSON array
+    """
+    pos = _WHITESPACE.match(body, 0).end()
+    if body[pos:pos + 1] != '[':
+        raise ValueError('Payload must be a JSON array')
+    pos = _WHITESPACE.match(body, pos + 1).end()
+    if body[pos:pos + 1] == ']':
+        return
+
+    while True:
+        item, pos = _JSON_DECODER.raw_decode(body, pos)
+        yield item
+        pos = _WHITESPACE.match(body, pos).end()
+        separator = body[pos:pos + 1]
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f'Expecting , or ] at position {pos}')
+        pos = _WHITESPACE.match(body, pos + 1).end()
+
+
+def rejected_report(error):
+    """
+    Build the report for a bulk request whose payload was rejected as a whole.
+    
+    Args:
+        error: Validation message for the payload
+        
+    Returns:
+        Report with no items and the error
+    """
+    return {'published': 0, 'failed': 0, 'results': [], 'error': error}
+
+
+def item_result(index, betting_event, error, error_status):
+    """
+    Build the report entry for a single item of a bulk request.
+    
+    Args:
+        index: Position of the item in the request
+        betting_event: The incoming event data
+        error: Error message, or None if the item succeeded
+        error_status: Status to report when the item has an error
+        
+    Returns:
+        Result entry for the item
+    """
+    event_id = betting_event.get('eventId') if isinstance(betting_event, dict) else None
+    if error is None:
+        return {'index': index, 'eventId': event_id, 'status': 'published'}
+    return {'index': index, 'eventId': event_id, 'status': error_status, 'error': error}
+
+
+def bulk_response(report):
+    """
+    Create the HTTP response for a bulk request.
+    
+    Args:
+        report: Bulk ingestion report
+        
+    Returns:
+        200 if every item was published, 207 if only some were, otherwise 400
+    """
+    status_code = 200
+    if report['failed'] or report.get('error'):
+        status_code = 207 if report['published'] else 400
+    return {
+        'statusCode': status_code,
+        'body': json.dumps(report)
+    }
+
+
+def publish_entries(indexed_entries):
+    """
+    Publish EventBridge entries through the shared publisher of the layer.
+    
+    The publisher consumes the entries as it sends them, a few chunks at a
+    time, so a streamed request is never held in memory as a whole.
+    
+    Args:
+        indexed_entries: Iterable of (key, entry) pairs
+        
+    Returns:
+        Dictionary of key to error for entries that could not be published
+    """
+    errors = publisher.publish_indexed(indexed_entries)
+    if errors:
+        logger.warning(f"Failed to publish {len(errors)} events", extra={'errors': sorted(set(errors.values()))})
+    return errors
+
+
 def form_event(detail_type, detail):
     """
     Create a properly formatted event for EventBridge.
@@ -131,7 +419,7 @@ def form_event(detail_type, detail):
         return [{
             'Source': 'com.thirdparty',
             'DetailType': detail_type,
-            'Detail': json.dumps(detail),
+            'Detail': json_utils.dumps(detail),
             'EventBusName': event_bus_name
         }]
     except Exception as e:
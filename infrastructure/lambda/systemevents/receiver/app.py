@@ -1,17 +1,16 @@
 from os import getenv
-import json
-import boto3
-import uuid
-from gql_utils import get_client
-from mutations import add_system_event
-from gql import gql
+from datetime import datetime
+import aws_clients
+import json_utils
+from event_publisher import EventPublisher
+from gql_utils import get_client, gql
+from mutations import add_system_events, publish_system_event_rates
+from sampling import SubscriptionSampler, parse_sampling
+from throttle import RateAggregator
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
-from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 
-processor = BatchProcessor(event_type=EventType.SQS)
 tracer = Tracer()
 logger = Logger()
 
@@ -19,74 +18,171 @@ region = getenv("REGION")
 appsync_url = getenv("APPSYNC_URL")
 event_bus_name = getenv('EVENT_BUS')
 gql_client = get_client(region, appsync_url)
-session = boto3.Session()
-events = session.client('events')
+events = aws_clients.client('events')
+publisher = EventPublisher(events)
+
+# Event counts pushed to updatedSystemEventRates subscribers at most every RATES_INTERVAL seconds
+rate_aggregator = RateAggregator(interval=float(getenv('RATES_INTERVAL', '1')))
+
+# Which recorded events are pushed to addedSystemEvents subscribers, every event is still recorded
+subscription_sampler = SubscriptionSampler(parse_sampling(getenv('SYSTEM_EVENT_SAMPLING', '')))
 
 @tracer.capture_method
-def handle_system_event(item: dict):
+def handle_system_events(records: list) -> tuple:
     """
-    Handle a system event by adding it to the system events database via GraphQL.
+    Record all system events in a batch with a single addSystemEvents call.
+    
+    Every event is recorded and republished, and the sampling rules decide
+    which of them, or which summaries, the call pushes to subscribers.
     
     Args:
-        item: The event item to process
+        records: List of (SQS record, parsed event) pairs
         
     Returns:
-        Formatted event for EventBridge or None if error
+        Tuple of (message ID, formatted event for EventBridge) pairs and
+        message IDs of records that failed
     """
+    failed_ids = []
+    message_ids = []
+    system_events_info = []
+    for record, item in records:
+        try:
+            system_events_info.append(system_event_input(item))
+            message_ids.append(record['messageId'])
+        except (KeyError, TypeError) as e:
+            logger.error(f"Invalid system event: {str(e)}")
+
+    if not system_events_info:
+        return [], failed_ids
+
     try:
-        extended_detail = item['detail']
-        extended_detail["systemEventId"] = str(uuid.uuid4())
-        
-        gql_input = { 
-            'input': 
-                {'source': item['source'],
-                'detailType': item['detail-type'],
-                'detail': extended_detail}
-            }
-
-        response = gql_client.execute(gql(add_system_event), variable_values=gql_input)[
-            'addSystemEvent']
-            
-        return {
-            'Source': response['source'],
-            'DetailType': response['detailType'],
-            'Detail': response['detail'],
-            'EventBusName': event_bus_name
+        # Sampled out and coalesced events are recorded but not pushed to subscribers
+        summaries = subscription_sampler.sample(system_events_info)
+        gql_input = {
+            'input': {'events': system_events_info, 'summaries': summaries}
         }
+
+        response = gql_client.execute(gql(add_system_events), variable_values=gql_input)[
+            'addSystemEvents']
+
+        if response['__typename'] == 'SystemEventList':
+            rate_aggregator.add(system_events_info)
+            return [
+                (message_id, {
+                    'Source': info['source'],
+                    'DetailType': info['detailType'],
+                    'Detail': info['detail'],
+                    'EventBusName': event_bus_name
+                })
+                for message_id, info in zip(message_ids, system_events_info)
+            ], failed_ids
+
+        logger.error(f"Failed to add system events: {response['message']}")
+        return [], failed_ids + message_ids
     except Exception as e:
-        logger.error(f"Error adding system event: {str(e)}")
-        return None
+        logger.error(f"Error adding system events: {str(e)}")
+        return [], failed_ids + message_ids
 
 
 @tracer.capture_method
-def record_handler(record: SQSRecord):
+def publish_rates() -> None:
     """
-    Process a single record from SQS.
+    Publish the event counts gathered since the last publish, once the interval has passed.
+    
+    Counts that fail to publish are kept for the next publish.
+    """
+    if not rate_aggregator.due():
+        return
+    aggregate = rate_aggregator.drain()
+    try:
+        response = gql_client.execute(gql(publish_system_event_rates), variable_values={'input': aggregate})[
+            'publishSystemEventRates']
+        if response['__typename'] != 'SystemEventRateList':
+            raise RuntimeError(response.get('message'))
+    except Exception as e:
+        logger.warning(f"Error publishing system event rates: {str(e)}")
+        rate_aggregator.restore(aggregate)
+
+
+def system_event_input(item: dict) -> dict:
+    """
+    Build the input of the addSystemEvents mutation.
+    
+    The detail is extended with a systemEventId, the ID EventBridge gave the
+    event, so an event delivered again overwrites the item it was stored as,
+    and serialized to the JSON string the detail field of the schema holds.
     
     Args:
-        record: SQS record to process
+        item: The EventBridge event
         
     Returns:
-        Event to be raised or None
+        Input for the system event mutations
+        
+    Raises:
+        KeyError: If the event is missing a required field
+    """
+    extended_detail = item['detail']
+    extended_detail["systemEventId"] = item['id']
+    return {
+        'source': item['source'],
+        'detailType': item['detail-type'],
+        'detail': json_utils.dumps(extended_detail),
+        'systemEventId': extended_detail["systemEventId"],
+        'timestamp': event_timestamp(item)
+    }
+
+
+def event_timestamp(item: dict):
+    """
+    Get the time an EventBridge event was raised, so it is stored under that time.
+    
+    Args:
+        item: The EventBridge event
+        
+    Returns:
+        Epoch seconds, or None to store the event under the time it is recorded
     """
     try:
-        payload = record.body
-        if not payload:
-            return None
-            
-        item = json.loads(payload)
-        return handle_system_event(item)
-    except Exception as e:
-        logger.error(f"Error processing record: {str(e)}")
+        return datetime.fromisoformat(item['time'].replace('Z', '+00:00')).timestamp()
+    except (KeyError, AttributeError, ValueError):
         return None
 
 
+def partition_system_events(records: list) -> tuple:
+    """
+    Split SQS records into parsed system events and records that are not system events.
+    
+    Args:
+        records: Raw SQS records
+        
+    Returns:
+        Tuple of (record, parsed event) pairs and the remaining records
+    """
+    event_records = []
+    other_records = []
+    for record in records:
+        try:
+            item = json_utils.loads(record['body']) if record.get('body') else None
+        except ValueError:
+            item = None
+        if isinstance(item, dict) and isinstance(item.get('detail'), dict):
+            event_records.append((record, item))
+        else:
+            other_records.append(record)
+    return event_records, other_records
+
+
 @logger.inject_lambda_context(log_event=True)
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """
     Main Lambda handler function.
     
+    Only records whose events could not be recorded or republished are
+    reported in batchItemFailures, so SQS retries just those. Records that
+    are not system events would fail the same way on every retry, so they
+    are logged and dropped.
+    
     Args:
         event: Lambda event
         context: Lambda context
@@ -95,21 +191,22 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         Batch processing response
     """
     try:
-        batch = event["Records"]
-        with processor(records=batch, handler=record_handler):
-            processed_messages = processor.process()
-
-        # Extract successful events that returned a value
-        output_events = [
-            result[1] for result in processed_messages 
-            if result[0] == "success" and result[1] is not None
-        ]
+        event_records, invalid_records = partition_system_events(event["Records"])
+        for record in invalid_records:
+            logger.error("Dropping record that is not a system event", extra={'messageId': record.get('messageId')})
+
+        # System events in the batch are recorded with a single addSystemEvents call
+        output_events, failed_ids = handle_system_events(event_records) if event_records else ([], [])
         
         # Send events to EventBridge if any exist
         if output_events:
-            events.put_events(Entries=output_events)
+            errors = publisher.publish([entry for _, entry in output_events])
+            failed_ids += [message_id for index, (message_id, _) in enumerate(output_events) if index in errors]
+
+        # Subscribers get aggregate counts rather than every event
+        publish_rates()
 
-        return processor.response()
+        return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failed_ids]}
     except Exception as e:
         logger.error(f"Error in lambda handler: {str(e)}")
-        return {"batchItemFailures": []}
+        return {"batchItemFailures": [{"itemIdentifier": record['messageId']} for record in event.get("Records", [])]}
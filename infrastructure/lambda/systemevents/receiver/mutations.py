@@ -1,11 +1,37 @@
-add_system_event = """
-mutation MyMutation ($input: SystemEventInput!) {
-  addSystemEvent(input: $input) {
-    ... on SystemEvent {
+add_system_events = """
+mutation MyMutation ($input: AddSystemEventsInput!) {
+  addSystemEvents(input: $input) {
+    ... on SystemEventList {
       __typename
-      source
-      detailType
-      detail
+      items {
+        source
+        detailType
+        detail
+        systemEventId
+        timestamp
+      }
+    }
+    ... on Error {
+      __typename
+      message
+    }
+  }
+}
+"""
+
+publish_system_event_rates = """
+mutation MyMutation ($input: SystemEventRatesInput!) {
+  publishSystemEventRates(input: $input) {
+    ... on SystemEventRateList {
+      __typename
+      interval
+      items {
+        source
+        detailType
+        counts
+        total
+        perSecond
+      }
     }
     ... on Error {
       __typename
@@ -0,0 +1,104 @@
+from collections import Counter
+
+import json_utils
+
+# Sampling rate of a rule that coalesces the matching events of a batch into one summary
+SUMMARY = 0
+
+
+def parse_sampling(spec: str) -> dict:
+    """
+    Parse sampling rules of the form "com.thirdparty/UpdatedOdds=10,com.trading=summary".
+
+    A rule applies to a source and detail type, or to every detail type of a
+    source when the detail type is left out. Its value is N to push 1 in N
+    events to subscribers, or "summary" to push one summary per batch.
+
+    Args:
+        spec: Comma separated rule=value pairs
+
+    Returns:
+        Dictionary of (source, detail type or None) to sampling rate
+
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    rules = {}
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        key, value = pair.split('=')
+        source, _, detail_type = key.strip().partition('/')
+        value = value.strip()
+        rate = SUMMARY if value == 'summary' else int(value)
+        if rate < 0:
+            raise ValueError(f'Invalid sampling rate for {key}')
+        rules[(source, detail_type or None)] = rate
+    return rules
+
+
+class SubscriptionSampler:
+    """
+    Decides which recorded system events are pushed to subscribers.
+
+    Every event is still recorded; sampling only controls the fan-out.
+    Events without a rule are all pushed. Events under a 1 in N rule are
+    pushed when a running count per source and detail type, kept for the
+    container's lifetime, comes round, so the first of every N is pushed.
+    Events under a summary rule are replaced by a single summary event per
+    source and detail type in each batch.
+    """
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+        self._seen = Counter()
+
+    def rate(self, source: str, detail_type: str) -> int:
+        """
+        Get the sampling rate of a source and detail type.
+
+        Args:
+            source: Source of the events
+            detail_type: Detail type of the events
+
+        Returns:
+            N to push 1 in N events, or SUMMARY
+        """
+        rule = self.rules.get((source, detail_type))
+        if rule is None:
+            rule = self.rules.get((source, None), 1)
+        return rule
+
+    def sample(self, events: list) -> list:
+        """
+        Flag the events of a batch that are pushed to subscribers.
+
+        Args:
+            events: Mutation inputs of the events, flagged in place with publish
+
+        Returns:
+            Summary events replacing the coalesced events of the batch, with
+            their detail serialized to a JSON string like the detail of an event
+        """
+        coalesced = {}
+        for event in events:
+            key = (event['source'], event.get('detailType'))
+            rate = self.rate(*key)
+            if rate == SUMMARY:
+                event['publish'] = False
+                summary = coalesced.setdefault(key, {'count': 0, 'from': None, 'to': None})
+                summary['count'] += 1
+                timestamp = event.get('timestamp')
+                if timestamp is not None:
+                    summary['from'] = timestamp if summary['from'] is None else min(summary['from'], timestamp)
+                    summary['to'] = timestamp if summary['to'] is None else max(summary['to'], timestamp)
+                continue
+            event['publish'] = self._seen[key] % rate == 0
+            self._seen[key] += 1
+
+        return [
+            {
+                'source': source,
+                'detailType': detail_type,
+                'detail': json_utils.dumps({'coalesced': summary['count'], 'from': summary['from'], 'to': summary['to']})
+            }
+            for (source, detail_type), summary in coalesced.items()
+        ]
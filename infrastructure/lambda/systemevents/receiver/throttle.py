@@ -0,0 +1,71 @@
+import time
+from collections import Counter
+
+
+class RateAggregator:
+    """
+    Event counts per source and detail type, flushed at most once per interval.
+
+    The receiver adds every recorded batch and publishes one aggregate when
+    the interval has passed, so subscribers get a message per interval per
+    container instead of one per event. Counts of an aggregate that fails to
+    publish are added back and go out with the next one.
+    """
+
+    def __init__(self, interval: float = 1.0, clock=time.monotonic):
+        self.interval = interval
+        self.clock = clock
+        self._counts = Counter()
+        self._since = clock()
+
+    def add(self, events: list) -> None:
+        """
+        Count a batch of recorded events.
+
+        Args:
+            events: Mutation inputs of the events, with source and detailType
+        """
+        self._counts.update((event['source'], event.get('detailType') or '') for event in events)
+
+    def due(self) -> bool:
+        """
+        Check whether an aggregate should be published.
+
+        Returns:
+            True if there are counts and the interval has passed since the last flush
+        """
+        return bool(self._counts) and self.clock() - self._since >= self.interval
+
+    def drain(self) -> dict:
+        """
+        Take the counts gathered since the last flush.
+
+        Returns:
+            Input of the publishSystemEventRates mutation
+        """
+        now = self.clock()
+        elapsed = max(now - self._since, self.interval)
+        counts, self._counts, self._since = self._counts, Counter(), now
+        return {
+            'interval': round(elapsed, 3),
+            'items': [
+                {
+                    'source': source,
+                    'detailType': detail_type,
+                    'counts': [count],
+                    'total': count,
+                    'perSecond': round(count / elapsed, 3)
+                }
+                for (source, detail_type), count in counts.most_common()
+            ]
+        }
+
+    def restore(self, aggregate: dict) -> None:
+        """
+        Add the counts of an aggregate that could not be published back.
+
+        Args:
+            aggregate: Aggregate returned by drain
+        """
+        for item in aggregate['items']:
+            self._counts[(item['source'], item['detailType'])] += item['total']
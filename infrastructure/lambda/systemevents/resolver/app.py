@@ -1,32 +1,157 @@
+from os import getenv
+import aws_clients
+
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.event_handler import AppSyncResolver
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from rates import SystemEventRates
+from store import SystemEventStore
+
 tracer = Tracer()
 logger = Logger()
 app = AppSyncResolver()
 
+table_name = getenv('DB_TABLE')
+table = aws_clients.table(table_name)
+
+# System events are kept for SYSTEM_EVENTS_TTL_DAYS and served in pages of SYSTEM_EVENTS_PAGE_SIZE
+store = SystemEventStore(
+    table,
+    ttl_seconds=int(float(getenv('SYSTEM_EVENTS_TTL_DAYS', '7')) * 24 * 3600),
+    page_size=int(getenv('SYSTEM_EVENTS_PAGE_SIZE', '100'))
+)
+
+# Rolling per-minute counts per source and detail type, kept in the same table
+rates = SystemEventRates(table)
+
+
 @app.resolver(type_name="Mutation", field_name="addSystemEvent")
 @tracer.capture_method
 def add_system_event(input: dict) -> dict:
     """
-    Add a system event to the database.
-    
-    This is a simple echo resolver that returns the input as if it was written to a data store.
-    In a production environment, this would typically write to a database.
+    Add a system event to the system event store.
     
     Args:
         input: The system event input data
-        
+    
     Returns:
-        The system event with typename
+        The stored system event with typename
     """
     try:
-        return {'__typename': 'SystemEvent', **input}
+        stored = store.put_events([input])
+        record_rates(stored)
+        return {'__typename': 'SystemEvent', **stored[0]}
     except Exception as e:
         logger.error(f"Error adding system event: {str(e)}")
-        return {'__typename': 'Error', 'message': 'Failed to add system event'}
+        return {'__typename': 'UnknownError', 'message': 'Failed to add system event'}
+
+
+@app.resolver(type_name="Mutation", field_name="addSystemEvents")
+@tracer.capture_method
+def add_system_events(input: dict) -> dict:
+    """
+    Add a batch of system events to the system event store.
+    
+    The events are written with a DynamoDB batch writer, which resends any
+    unprocessed items until the batch is stored. Events with publish set to
+    false are stored but left out of the response, and the summaries are
+    returned without being stored.
+    
+    Args:
+        input: Batch of system event input data
+        
+    Returns:
+        A SystemEventList response containing the published events and summaries
+    """
+    try:
+        events = input['events']
+        stored = store.put_events(events)
+        record_rates(stored)
+
+        # The response is what subscribers receive, so it holds only the events
+        # flagged for publishing and the summaries of coalesced ones
+        published = [event for event, event_input in zip(stored, events) if event_input.get('publish') is not False]
+        return {'__typename': 'SystemEventList', 'items': published + (input.get('summaries') or [])}
+    except Exception as e:
+        logger.error(f"Error adding system events: {str(e)}")
+        return {'__typename': 'UnknownError', 'message': 'Failed to add system events'}
+
+
+@app.resolver(type_name="Query", field_name="getSystemEvents")
+@tracer.capture_method
+def get_system_events(source: str, nextToken: str = "", **window) -> dict:
+    """
+    Get the system events of a source within a time window, oldest first.
+    
+    Args:
+        source: Source of the events
+        nextToken: Optional pagination token
+        window: from and optional to, in epoch seconds
+    
+    Returns:
+        A SystemEventList response containing the events
+    """
+    try:
+        result = store.query(source, float(window['from']),
+                             float(window['to']) if window.get('to') is not None else None, nextToken or None)
+        return {'__typename': 'SystemEventList', **result}
+    except (KeyError, ValueError) as e:
+        return {'__typename': 'InputError', 'message': str(e)}
+    except Exception as e:
+        logger.exception("Unknown error when getting system events")
+        return {'__typename': 'UnknownError', 'message': 'An unknown error occurred.'}
+
+
+@app.resolver(type_name="Query", field_name="getSystemEventRates")
+@tracer.capture_method
+def get_system_event_rates(minutes: int = 5) -> dict:
+    """
+    Get the per-minute event counts per source and detail type.
+    
+    Args:
+        minutes: Number of minutes to return, including the current one
+        
+    Returns:
+        A SystemEventRateList response with the busiest source and detail types first
+    """
+    try:
+        return {'__typename': 'SystemEventRateList', 'items': rates.rates(minutes)}
+    except Exception as e:
+        logger.exception("Unknown error when getting system event rates")
+        return {'__typename': 'UnknownError', 'message': 'An unknown error occurred.'}
+
+
+@app.resolver(type_name="Mutation", field_name="publishSystemEventRates")
+@tracer.capture_method
+def publish_system_event_rates(input: dict) -> dict:
+    """
+    Push aggregate event counts to updatedSystemEventRates subscribers.
+    
+    Args:
+        input: Event counts per source and detail type over an interval
+        
+    Returns:
+        The counts with typename
+    """
+    return {'__typename': 'SystemEventRateList', **input}
+
+
+def record_rates(stored: list) -> None:
+    """
+    Add stored events to the rate counters.
+    
+    The events are already stored, so a failure here is logged rather than
+    failing the mutation and having the events recorded again.
+    
+    Args:
+        stored: The stored events
+    """
+    try:
+        rates.record(stored)
+    except Exception as e:
+        logger.warning(f"Error recording system event rates: {str(e)}")
 
 
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.APPSYNC_RESOLVER, log_event=True)
@@ -38,7 +163,7 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     Args:
         event: Lambda event
         context: Lambda context
-        
+    
     Returns:
         AppSync resolver response
     """
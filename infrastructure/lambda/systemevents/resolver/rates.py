@@ -0,0 +1,131 @@
+import time
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+# Partition key of the counter items, one item per source and detail type
+RATES_PARTITION = 'rates'
+
+
+class SystemEventRates:
+    """
+    Rolling per-minute event counts per source and detail type.
+
+    Each source and detail type has one counter item holding a fixed ring of
+    slots, one per minute, so the item never grows however long the service
+    runs. Slot i holds the count of minute m where m % slots == i, stamped
+    with m, and is reset the first time a later minute lands on it. Counts
+    are added once per group of events in a batch with atomic updates, and
+    reading the rates of every source is a single query of small items.
+    """
+
+    def __init__(self, table, slots: int = 60, clock=time.time):
+        self.table = table
+        self.slots = slots
+        self.clock = clock
+
+    def record(self, events: list) -> None:
+        """
+        Add a batch of events to the counters of the minute they were raised in.
+
+        Args:
+            events: Stored events with source, detailType and timestamp
+        """
+        counts = Counter(
+            (event['source'], event.get('detailType') or '', int(event['timestamp'] // 60))
+            for event in events
+        )
+        for (source, detail_type, minute), count in counts.items():
+            self._add(f'{source}#{detail_type}', source, detail_type, minute, count)
+
+    def rates(self, minutes: int = 5) -> list:
+        """
+        Get the counts of the last minutes per source and detail type.
+
+        Args:
+            minutes: Number of minutes to return, including the current one
+
+        Returns:
+            List of dictionaries with source, detailType, counts per minute
+            oldest first, their total, and the events per second of the last
+            complete minute
+        """
+        minutes = max(1, min(minutes, self.slots))
+        current = int(self.clock() // 60)
+        window = range(current - minutes + 1, current + 1)
+
+        items = []
+        args = {
+            'KeyConditionExpression': 'pk = :pk',
+            'ExpressionAttributeValues': {':pk': RATES_PARTITION}
+        }
+        while True:
+            response = self.table.query(**args)
+            items += response.get('Items', [])
+            if not response.get('LastEvaluatedKey'):
+                break
+            args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        rates = []
+        for item in items:
+            counts = []
+            for minute in window:
+                slot = minute % self.slots
+                counts.append(int(item.get(f'c{slot}', 0)) if item.get(f'm{slot}') == minute else 0)
+            if not any(counts):
+                continue
+            rates.append({
+                'source': item['source'],
+                'detailType': item['detailType'],
+                'counts': counts,
+                'total': sum(counts),
+                'perSecond': round(counts[-2] / 60, 3) if len(counts) > 1 else None
+            })
+        return sorted(rates, key=lambda rate: -rate['total'])
+
+    def _add(self, key: str, source: str, detail_type: str, minute: int, count: int) -> None:
+        """
+        Add to the slot of a minute, resetting it if it holds an older minute.
+
+        Args:
+            key: Sort key of the counter item
+            source: Source of the events
+            detail_type: Detail type of the events
+            minute: Minute since the epoch the events were raised in
+            count: Number of events
+        """
+        slot = minute % self.slots
+        names = {'#c': f'c{slot}', '#m': f'm{slot}'}
+        values = {':n': count, ':m': minute}
+        key = {'pk': RATES_PARTITION, 'sk': key}
+
+        for _ in range(2):
+            try:
+                self.table.update_item(
+                    Key=key,
+                    UpdateExpression='ADD #c :n',
+                    ConditionExpression='#m = :m',
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values
+                )
+                return
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+
+            # The slot is empty or holds an older minute, start it again. Counts of a
+            # minute already overwritten by a later one are dropped.
+            try:
+                self.table.update_item(
+                    Key=key,
+                    UpdateExpression='SET #c = :n, #m = :m, #s = :s, #d = :d',
+                    ConditionExpression='attribute_not_exists(#m) OR #m < :m',
+                    ExpressionAttributeNames={**names, '#s': 'source', '#d': 'detailType'},
+                    ExpressionAttributeValues={**values, ':s': source, ':d': detail_type}
+                )
+                return
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # Another writer started the slot for this minute first, add to it
+                # or stop if it has already moved on to a later minute
@@ -0,0 +1,209 @@
+import base64
+import binascii
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+# Events of a source are partitioned by UTC day, so a window within a day is one query
+PARTITION_SECONDS = 24 * 3600
+
+
+def partition_key(source: str, epoch: float) -> str:
+    """
+    Build the partition key holding the events of a source at a point in time.
+
+    Args:
+        source: Source of the events
+        epoch: Epoch seconds
+
+    Returns:
+        Partition key of the form <source>#<YYYY-MM-DD>
+    """
+    day = datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%d')
+    return f'{source}#{day}'
+
+
+def sort_key(epoch: float, system_event_id: str = '') -> str:
+    """
+    Build the sort key of an event, ordering events of a partition by time.
+
+    Args:
+        epoch: Epoch seconds of the event
+        system_event_id: ID of the event, left empty to build a range bound
+
+    Returns:
+        Sort key of the form <epoch milliseconds, zero padded>#<systemEventId>
+    """
+    return f'{int(epoch * 1000):015d}#{system_event_id}'
+
+
+def encode_token(key: dict) -> str:
+    """
+    Encode the key a query page stopped at as an opaque pagination token.
+
+    Args:
+        key: Partition key, and sort key when the partition was not finished
+
+    Returns:
+        URL safe token
+    """
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+
+def decode_token(token: str) -> dict:
+    """
+    Decode a pagination token.
+
+    Args:
+        token: Token returned by a previous page
+
+    Returns:
+        Key the previous page stopped at
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError('Invalid nextToken') from e
+    if not isinstance(key, dict) or not isinstance(key.get('pk'), str):
+        raise ValueError('Invalid nextToken')
+    return key
+
+
+class SystemEventStore:
+    """
+    Time-partitioned store of system events in DynamoDB.
+
+    Events are keyed by source and UTC day, and sorted by time within the
+    day, so the table itself is the source plus time index: a window of up
+    to a day for one source is served by a single range query. Every event
+    carries an expiry attribute that the table TTL deletes it by.
+    """
+
+    def __init__(self, table, ttl_seconds: int = 7 * 24 * 3600, page_size: int = 100, clock=time.time):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.clock = clock
+
+    def put_events(self, events: list) -> list:
+        """
+        Write a batch of system events with batched writes.
+
+        Args:
+            events: Events with source, detailType and detail, and optionally
+                systemEventId and timestamp
+
+        Returns:
+            The stored events, with systemEventId and timestamp filled in
+        """
+        now = self.clock()
+        stored = []
+        with self.table.batch_writer() as batch:
+            for event in events:
+                system_event_id = event.get('systemEventId') or str(uuid.uuid4())
+                timestamp = float(event.get('timestamp') or now)
+                record = {
+                    'source': event['source'],
+                    'detailType': event.get('detailType'),
+                    'detail': event.get('detail'),
+                    'systemEventId': system_event_id,
+                    'timestamp': timestamp
+                }
+                batch.put_item(Item={
+                    **record,
+                    'pk': partition_key(record['source'], timestamp),
+                    'sk': sort_key(timestamp, system_event_id),
+                    'timestamp': Decimal(repr(timestamp)),
+                    'expiry': int(timestamp + self.ttl_seconds)
+                })
+                stored.append(record)
+        return stored
+
+    def query(self, source: str, start: float, end: float | None = None, next_token: str | None = None) -> dict:
+        """
+        Get the events of a source within a time window, oldest first.
+
+        The window is clamped to the retention period, and its days are
+        queried in turn until a page is full.
+
+        Args:
+            source: Source of the events
+            start: Start of the window in epoch seconds, inclusive
+            end: End of the window in epoch seconds, inclusive, defaults to now
+            next_token: Token returned by the previous page
+
+        Returns:
+            Dictionary with the items of the page, and nextToken if there are more
+
+        Raises:
+            ValueError: If the window or the token is invalid
+        """
+        now = self.clock()
+        end = now if end is None else end
+        start = max(start, now - self.ttl_seconds)
+        if end < start:
+            raise ValueError('The window must end after it starts')
+
+        last_day = partition_key(source, end)
+        day_start = start - start % PARTITION_SECONDS
+        exclusive_start = None
+        if next_token:
+            key = decode_token(next_token)
+            if not key['pk'].startswith(f'{source}#') or not partition_key(source, start) <= key['pk'] <= last_day:
+                raise ValueError('Invalid nextToken')
+            day_start = datetime.strptime(key['pk'].rsplit('#', 1)[1], '%Y-%m-%d').replace(
+                tzinfo=timezone.utc).timestamp()
+            if key.get('sk'):
+                exclusive_start = {'pk': key['pk'], 'sk': key['sk']}
+
+        items = []
+        while True:
+            pk = partition_key(source, day_start)
+            args = {
+                'KeyConditionExpression': 'pk = :pk AND sk BETWEEN :from AND :to',
+                'ExpressionAttributeValues': {
+                    ':pk': pk,
+                    ':from': sort_key(start),
+                    ':to': sort_key(end, '~')
+                },
+                'Limit': self.page_size - len(items)
+            }
+            if exclusive_start:
+                args['ExclusiveStartKey'] = exclusive_start
+                exclusive_start = None
+
+            response = self.table.query(**args)
+            items += [self._to_event(item) for item in response.get('Items', [])]
+
+            last_key = response.get('LastEvaluatedKey')
+            if last_key:
+                if len(items) >= self.page_size:
+                    return {'items': items, 'nextToken': encode_token({'pk': last_key['pk'], 'sk': last_key['sk']})}
+                exclusive_start = last_key
+                continue
+            if pk >= last_day:
+                return {'items': items}
+            day_start += PARTITION_SECONDS
+            if len(items) >= self.page_size:
+                return {'items': items, 'nextToken': encode_token({'pk': partition_key(source, day_start)})}
+
+    @staticmethod
+    def _to_event(item: dict) -> dict:
+        """
+        Strip the storage attributes from a stored event.
+
+        Args:
+            item: Item read from the table
+
+        Returns:
+            System event
+        """
+        event = {k: v for k, v in item.items() if k not in ('pk', 'sk', 'expiry')}
+        if 'timestamp' in event:
+            event['timestamp'] = float(event['timestamp'])
+        return event
@@ -1,11 +1,18 @@
 from os import getenv
-import random
 import json
+import time
 import boto3
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+import json_utils
+from event_publisher import EventPublisher
+from odds_delta import OddsDeltaCache
+from odds_engine import OddsEngine
+from replay import open_feed, read_feed, replay
+from sources import HttpOddsSource, PollCursors, SimulatedOddsSource
+
 # Initialize AWS Lambda Powertools for tracing and logging
 tracer = Tracer()
 logger = Logger()
@@ -15,6 +22,10 @@ event_bus_name = getenv('EVENT_BUS')
 # Initialize AWS session and EventBridge client
 session = boto3.Session()
 eventsClient = session.client('events')
+s3Client = session.client('s3')
+
+# Bucket holding recorded feeds for replay runs, feeds are read from the package when unset
+replay_bucket_name = getenv('REPLAY_BUCKET')
 
 # List of predefined sporting events with unique IDs
 # In a production environment, these would likely come from a database or external API
@@ -30,6 +41,34 @@ KNOWN_EVENTS = [
     {'id': '8badd072-b6e2-41fe-9c55-6d719b4af546'},
     {'id': 'ceac8915-fa87-4e08-93a7-e17c9a509fae'}
 ]
+KNOWN_EVENT_IDS = [e['id'] for e in KNOWN_EVENTS]
+
+# Odds simulation settings: events priced per run, bookmaker overround (1.1 is a
+# 10% house edge) and an optional seed for reproducible runs
+ODDS_EVENT_COUNT = int(getenv('ODDS_EVENT_COUNT', '3'))
+ODDS_OVERROUND = float(getenv('ODDS_OVERROUND', '1.1'))
+ODDS_SEED = getenv('ODDS_SEED')
+odds_engine = OddsEngine(overround=ODDS_OVERROUND, seed=int(ODDS_SEED) if ODDS_SEED else None)
+
+# Last published odds per event, so only real changes are published. Unchanged odds
+# are republished after ODDS_DELTA_MAX_AGE seconds when it is set.
+delta_cache = OddsDeltaCache(
+    max_events=int(getenv('ODDS_DELTA_MAX_EVENTS', '10000')),
+    max_age=float(getenv('ODDS_DELTA_MAX_AGE', '0'))
+)
+
+# Upstream odds sources and the position reached in each of them
+odds_sources = [SimulatedOddsSource('simulator', lambda: get_new_odds())]
+if getenv('ODDS_FEED_URL'):
+    odds_sources.append(HttpOddsSource('provider', getenv('ODDS_FEED_URL')))
+poll_cursors = PollCursors()
+
+# PutEvents requests in flight at once while publishing a run
+PUBLISH_CONCURRENCY = int(getenv('PUBLISH_CONCURRENCY', '4'))
+publisher = EventPublisher(eventsClient, max_workers=PUBLISH_CONCURRENCY)
+
+# Time kept back from the Lambda timeout when replaying a feed
+REPLAY_SAFETY_MARGIN_SECONDS = 2.0
 
 
 @tracer.capture_lambda_handler
@@ -51,120 +90,178 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
         # Get formatted events with updated odds
         events = get_events()
         # Publish events to EventBridge
-        response = eventsClient.put_events(Entries=events)
-        return {"statusCode": 200, "body": json.dumps({"message": "Events published successfully"})}
+        report = publish_events(events)
+        failed_indexes = report.pop('failedIndexes')
+        if failed_indexes:
+            # Publish these again on the next run, whether or not their odds move
+            delta_cache.forget(json.loads(events[i]['Detail'])['eventId'] for i in failed_indexes)
+            poll_cursors.discard()
+        else:
+            poll_cursors.commit()
+        if not report['failed']:
+            return {"statusCode": 200, "body": json.dumps({"message": "Events published successfully", **report})}
+        status = 207 if report['published'] else 500
+        return {"statusCode": status, "body": json.dumps({"message": "Error publishing events", **report})}
     except Exception as e:
         logger.error(f"Error in lambda handler: {str(e)}")
         return {"statusCode": 500, "body": json.dumps({"message": "Error publishing events"})}
 
 
+@tracer.capture_lambda_handler
+def replay_handler(event: dict, context: LambdaContext) -> dict:
+    """
+    Lambda handler that replays a recorded third party feed.
+    
+    Re-emits the ticks of a recorded feed to EventBridge with their original
+    inter-arrival times, scaled by a speed multiplier, so a real traffic profile
+    can be reproduced against the pipeline. A replay that does not finish before
+    the Lambda timeout reports the feed offset it reached, which can be passed as
+    start to continue it.
+    
+    Args:
+        event: Replay request with feed (key or path of the feed file), and the
+            optional speed multiplier and start offset in recorded seconds
+        context: Lambda context object with runtime information
+        
+    Returns:
+        Response dictionary with status code, message and replay statistics
+    """
+    try:
+        speed = float(event.get('speed', 1.0))
+        start = float(event.get('start', 0.0))
+        deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - REPLAY_SAFETY_MARGIN_SECONDS
+        totals = {'published': 0, 'failed': 0}
+
+        def emit(batch):
+            report = publish_events([form_event(detail_type, detail) for detail_type, detail in batch])
+            totals['published'] += report['published']
+            totals['failed'] += report['failed']
+
+        with open_feed_source(event['feed']) as lines:
+            stats = replay(read_feed(lines), emit, speed=speed, start=start, deadline=deadline)
+
+        logger.info("Feed replayed", extra={**stats, **totals})
+        return {"statusCode": 200, "body": json.dumps({"message": "Feed replayed", **stats, **totals})}
+    except (KeyError, ValueError) as e:
+        logger.error(f"Invalid replay request: {str(e)}")
+        return {"statusCode": 400, "body": json.dumps({"message": f"Invalid replay request: {str(e)}"})}
+    except Exception as e:
+        logger.error(f"Error replaying feed: {str(e)}")
+        return {"statusCode": 500, "body": json.dumps({"message": "Error replaying feed"})}
+
+
+def open_feed_source(feed):
+    """
+    Open a recorded feed from the replay bucket, or from the package when no bucket is configured.
+    
+    Args:
+        feed: Key or path of the feed file
+        
+    Returns:
+        Text lines of the feed, usable as a context manager
+    """
+    if replay_bucket_name:
+        stream = s3Client.get_object(Bucket=replay_bucket_name, Key=feed)['Body']
+    else:
+        stream = open(feed, 'rb')
+    return open_feed(stream, feed)
+
+
+@tracer.capture_method
+def publish_events(entries):
+    """
+    Publish EventBridge entries through the shared publisher of the layer.
+    
+    The publisher sends count- and size-bounded chunks concurrently and
+    retries the entries rejected by EventBridge with exponential backoff.
+    
+    Args:
+        entries: List of formatted EventBridge entries
+        
+    Returns:
+        Report with the published and failed counts, the publish latency and
+        the indexes of the entries that failed
+    """
+    started = time.perf_counter()
+    errors = publisher.publish(entries)
+
+    report = {
+        'published': len(entries) - len(errors),
+        'failed': len(errors),
+        'latencyMs': round((time.perf_counter() - started) * 1000, 1),
+        'failedIndexes': sorted(errors)
+    }
+    if errors:
+        logger.warning(f"Failed to publish {len(errors)} events", extra={'errors': sorted(set(errors.values()))})
+    logger.info(f"Published {report['published']} events in {report['latencyMs']} ms")
+    return report
+
+
 @tracer.capture_method
 def get_events():
     """
     Get formatted events for EventBridge.
     
-    Transforms the raw odds data into properly formatted EventBridge events
-    with the correct source, detail type, and event bus.
+    Polls every odds source from its last committed cursor, drops the updates
+    that do not change the last published odds and transforms the rest into
+    properly formatted EventBridge events with the correct source, detail type,
+    and event bus.
     
     Returns:
         List of formatted events ready for EventBridge
     """
     try:
+        updates = []
+        for source in odds_sources:
+            try:
+                source_updates, cursor = source.poll(poll_cursors.get(source.name))
+            except Exception as e:
+                logger.error(f"Error polling odds source {source.name}: {str(e)}")
+                continue
+            poll_cursors.advance(source.name, cursor)
+            updates.extend(source_updates)
+
+        changed = delta_cache.changed(updates)
+        logger.info(f"Polled {len(updates)} odds updates, {len(changed)} changed")
         # For each set of new odds, create a properly formatted EventBridge event
-        return [form_event('UpdatedOdds', e) for e in get_new_odds()]
+        return [form_event('UpdatedOdds', e) for e in changed]
     except Exception as e:
         logger.error(f"Error getting events: {str(e)}")
         return []
 
 
 @tracer.capture_method
-def get_new_odds():
+def get_new_odds(count: int = ODDS_EVENT_COUNT):
     """
     Simulate polling a third-party API for new odds.
     
     This method simulates a real-life scenario where you poll a third-party API
-    for new odds. It:
-    1. Selects a random subset of known events
-    2. Generates random odds for each event
-    3. Ensures the odds are unique and follow betting market rules
-    4. Applies a house edge of approximately 10% (factor of 1.1)
+    for new odds. It selects a random subset of known events and prices them all
+    in one pass of the odds engine, which applies the configured overround
+    (10% house edge by default) and keeps the three odds of each event unique.
+    The home team is always the favourite.
     
-    The generated odds represent the decimal odds for home win, away win, and draw,
-    with the sum of implied probabilities being approximately 1.1 (representing a 10% house edge).
+    Args:
+        count: Number of events to update, drawn with replacement when it
+            exceeds the number of known events
     
     Returns:
         List of events with updated odds
     """
     try:
-        results = []
-        # Randomly select 3 events to update
-        sample = random.sample(KNOWN_EVENTS, 3)
-        for event in sample:
-            count = 0
-            odds = []
-            
-            # Generate three random values between 0.1 and 1
-            # These represent the relative probabilities before normalization
-            r1 = random.uniform(0.1, 1)
-            r2 = random.uniform(0.1, 1)
-            r3 = random.uniform(0.1, 1)
-            
-            # Calculate the sum for normalization
-            sum = r1 + r2 + r3
-
-            # Convert to odds with a house edge of 10% (factor of 1.1)
-            # and round to 1 decimal place
-            odds.append(round(((r1 * 1.1) /sum), 1))
-            odds.append(round(((r2 * 1.1) /sum), 1))
-            odds.append(round(((r3 * 1.1) /sum), 1))
-
-            # Ensure all odds are unique by regenerating if duplicates exist
-            # This loop will try up to 5 times to generate unique odds
-            while (odds[0] == odds[1] or odds[0] == odds[2] or odds[1] == odds[2]):
-                r1 = random.uniform(0.1, 1)
-                r2 = random.uniform(0.1, 1)
-                r3 = random.uniform(0.1, 1)
-                
-                sum = r1 + r2 + r3
-
-                odds[0] = round(((r1 * 1.1) /sum), 1)
-                odds[1] = round(((r2 * 1.1) /sum), 1)
-                odds[2] = round(((r3 * 1.1) /sum), 1)
-                
-                # Break after 5 attempts to avoid potential infinite loop
-                if count > 5:
-                    break
-                count += 1
-
-            # Sort odds in ascending order
-            odds.sort()
-            
-            # Assign the highest odds to home team (favoring home team slightly)
-            home_odds = 1/odds[2]
-            
-            # Randomly choose between the two lower odds values for away team
-            temp_odds = random.choice([odds[0], odds[1]])
-            away_odds = 1/temp_odds
-
-            # Assign the remaining odds value to draw
-            if temp_odds == odds[0]:
-                draw_odds = 1/odds[1]
-            else:
-                draw_odds = 1/odds[0]
-
-            # Calculate total implied probability (should be ~1.1 with house edge)
-            total_odds = odds[0] + odds[1] + odds[2]
-            logger.info(f"Total probability with house edge: {total_odds}, "
-                        f"home_odds: {home_odds}, away_odds: {away_odds} and draw_odds: {draw_odds}")
-            
-            # Add the event with its new odds to the results
-            results.append({
-                'eventId': event['id'],
+        event_ids = odds_engine.sample(KNOWN_EVENT_IDS, count)
+        odds = odds_engine.odds(len(event_ids))
+        logger.info(f"Generated odds for {len(event_ids)} events with overround {odds_engine.overround}")
+
+        return [
+            {
+                'eventId': event_id,
                 'homeOdds': str(home_odds),
                 'awayOdds': str(away_odds),
                 'drawOdds': str(draw_odds),
-            })
-        return results
+            }
+            for event_id, (home_odds, away_odds, draw_odds) in zip(event_ids, odds.tolist())
+        ]
     except Exception as e:
         logger.error(f"Error generating new odds: {str(e)}")
         return []
@@ -191,7 +288,7 @@ def form_event(detail_type, detail):
         return {
             'Source': 'com.thirdparty',
             'DetailType': detail_type,
-            'Detail': json.dumps(detail),
+            'Detail': json_utils.dumps(detail),
             'EventBusName': event_bus_name
         }
     except Exception as e:
@@ -0,0 +1,88 @@
+import numpy as np
+
+# Column order of the odds arrays produced by the engine
+HOME, AWAY, DRAW = 0, 1, 2
+
+
+class OddsEngine:
+    """
+    Vectorized simulator for home/away/draw odds.
+
+    Every call generates the odds for a whole batch of events in a single pass:
+    random weights are normalized into implied probabilities, scaled by the
+    overround and rounded, then spread apart so the three outcomes of an event
+    never share a price. The favourite is always the home team, and the two
+    remaining outcomes are randomly assigned to away and draw.
+    """
+
+    def __init__(self, overround: float = 1.1, precision: int = 1, min_weight: float = 0.1,
+                 max_weight: float = 1.0, seed: int | None = None):
+        if overround <= 0:
+            raise ValueError('overround must be positive')
+        if not 0 < min_weight < max_weight:
+            raise ValueError('weights must satisfy 0 < min_weight < max_weight')
+        self.overround = overround
+        self.precision = precision
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        # Smallest distinguishable probability at the rounding precision
+        self.step = 10.0 ** -precision
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, items: list, count: int) -> list:
+        """
+        Pick the items to price in this batch.
+
+        Items are drawn without replacement while there are enough of them, and
+        with replacement once the count exceeds the number of items.
+
+        Args:
+            items: Candidates to choose from
+            count: Number of items to pick
+
+        Returns:
+            Selected items
+        """
+        indexes = self.rng.choice(len(items), size=count, replace=count > len(items))
+        return [items[i] for i in indexes.tolist()]
+
+    def probabilities(self, count: int) -> np.ndarray:
+        """
+        Generate margin-adjusted implied probabilities.
+
+        Args:
+            count: Number of events to price
+
+        Returns:
+            Array of shape (count, 3) with home, away and draw probabilities
+        """
+        weights = self.rng.uniform(self.min_weight, self.max_weight, size=(count, 3))
+        implied = weights * (self.overround / weights.sum(axis=1, keepdims=True))
+        implied = np.round(implied, self.precision)
+
+        # Sort each row and enforce a gap of at least one step between neighbours,
+        # so rounding collisions are resolved in place rather than by redrawing.
+        implied.sort(axis=1)
+        offsets = np.arange(3) * self.step
+        implied = np.maximum.accumulate(np.maximum(implied, self.step) - offsets, axis=1) + offsets
+        implied = np.round(implied, self.precision)
+
+        # Lowest probability goes to either away or draw at random
+        swap = self.rng.random(count) < 0.5
+        result = np.empty_like(implied)
+        result[:, HOME] = implied[:, 2]
+        result[:, AWAY] = np.where(swap, implied[:, 0], implied[:, 1])
+        result[:, DRAW] = np.where(swap, implied[:, 1], implied[:, 0])
+        return result
+
+    def odds(self, count: int) -> np.ndarray:
+        """
+        Generate decimal odds.
+
+        Args:
+            count: Number of events to price
+
+        Returns:
+            Array of shape (count, 3) with home, away and draw decimal odds
+        """
+        return 1.0 / self.probabilities(count)
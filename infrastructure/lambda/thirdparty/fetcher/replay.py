@@ -0,0 +1,134 @@
+import gzip
+import io
+import json
+import time
+
+# Third party event types a recorded feed may contain, as consumed by trading and livemarket
+REPLAY_DETAIL_TYPES = frozenset({
+    'UpdatedOdds',
+    'EventAdded',
+    'MarketSuspended',
+    'MarketUnsuspended',
+    'EventClosed'
+})
+
+
+def open_feed(stream, name: str):
+    """
+    Wrap a binary feed stream as text lines, decompressing gzip feeds.
+
+    Args:
+        stream: Binary file-like object with the recorded feed
+        name: File name or key of the feed, feeds ending in .gz are gzip compressed
+
+    Returns:
+        Iterable of text lines
+    """
+    if name.endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding='utf-8')
+
+
+def read_feed(lines):
+    """
+    Parse a recorded feed of line-delimited JSON ticks.
+
+    Each line holds one tick, for example
+    {"t": 1718463600.25, "type": "UpdatedOdds", "detail": {"eventId": "...", "homeOdds": "2.0"}}
+    where t is the time the tick was recorded in seconds. Blank lines are skipped.
+
+    Args:
+        lines: Iterable of feed lines
+
+    Yields:
+        Tuples of (timestamp, detail type, detail)
+
+    Raises:
+        ValueError: If a line is not a valid tick
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            tick = json.loads(line)
+            timestamp = float(tick['t'])
+            detail_type = tick['type']
+            detail = tick['detail']
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Invalid tick on line {number}: {str(e)}")
+        if detail_type not in REPLAY_DETAIL_TYPES:
+            raise ValueError(f"Invalid tick on line {number}: unknown type {detail_type}")
+        yield timestamp, detail_type, detail
+
+
+def replay(ticks, emit, speed: float = 1.0, start: float = 0.0, deadline: float | None = None,
+           clock=time.monotonic, sleep=time.sleep) -> dict:
+    """
+    Re-emit recorded ticks with their original spacing, scaled by a speed multiplier.
+
+    Ticks recorded at the same time are emitted together. Each batch is scheduled
+    against the start of the replay rather than the previous batch, so time spent
+    emitting does not accumulate as drift; batches that fall behind are emitted
+    immediately and the delay is reported as lag.
+
+    Args:
+        ticks: Iterable of (timestamp, detail type, detail) in recorded order
+        emit: Callable receiving each batch as a list of (detail type, detail)
+        speed: Speed multiplier, 2.0 replays twice as fast as recorded
+        start: Offset into the feed in recorded seconds to start from
+        deadline: Clock reading after which no more batches are emitted
+        clock: Monotonic clock in seconds
+        sleep: Sleep function in seconds
+
+    Returns:
+        Replay statistics with the number of ticks and batches emitted, the
+        maximum lag in seconds, the feed offset reached and whether the replay
+        stopped at the deadline. A truncated replay reports the offset of the
+        first batch it did not emit, so passing it as start resumes the replay
+        without emitting any batch twice
+    """
+    if speed <= 0:
+        raise ValueError('speed must be positive')
+
+    stats = {'ticks': 0, 'batches': 0, 'maxLag': 0.0, 'offset': start, 'truncated': False}
+    first = None
+    started = None
+    batch = []
+    batch_time = None
+
+    def dispatch():
+        offset = batch_time - first
+        due = started + (offset - start) / speed
+        if deadline is not None and due > deadline:
+            return False
+        wait = due - clock()
+        if wait > 0:
+            sleep(wait)
+        else:
+            stats['maxLag'] = max(stats['maxLag'], -wait)
+        emit(batch)
+        stats['ticks'] += len(batch)
+        stats['batches'] += 1
+        stats['offset'] = offset
+        return True
+
+    for timestamp, detail_type, detail in ticks:
+        if first is None:
+            first = timestamp
+        if timestamp - first < start:
+            continue
+        if batch and timestamp != batch_time:
+            if not dispatch():
+                stats['truncated'] = True
+                stats['offset'] = batch_time - first
+                return stats
+            batch = []
+        if started is None:
+            started = clock()
+        batch_time = timestamp
+        batch.append((detail_type, detail))
+
+    if batch and not dispatch():
+        stats['truncated'] = True
+        stats['offset'] = batch_time - first
+    return stats
@@ -1,13 +1,15 @@
+from os import getenv
 import boto3
-import json
-import time
-from botocore.client import BaseClient
+from botocore.config import Config
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.event_handler import AppSyncResolver
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from clients import RegionalClients
+from probes import RegionProbes
+
 tracer = Tracer()
 logger = Logger()
 app = AppSyncResolver()
@@ -15,7 +17,27 @@ app = AppSyncResolver()
 session = boto3.Session()
 regions = ['us-east-1', 'us-west-2', 'eu-west-2', 'ap-southeast-1', 'ap-northeast-1'] 
 
-clients = {region: boto3.client('ec2', region_name=region) for region in regions}
+# Seconds a probe may take to connect and to read, a slower region is skipped for that round
+ping_timeout = float(getenv('PING_TIMEOUT', '2'))
+
+# Regional EC2 clients are built on first use from the one session, which loads the
+# EC2 service model once for all of them. Probes are not retried, a retry would be timed too
+clients = RegionalClients('ec2', session, config=Config(
+    connect_timeout=ping_timeout,
+    read_timeout=ping_timeout,
+    retries={'mode': 'standard', 'max_attempts': 1}
+))
+
+# Latencies are cached per container and probed again within the invocation after
+# PING_REFRESH_AFTER seconds. A region that fails keeps its last latency for PING_TTL seconds,
+# and a sample longer than the connect and read timeouts together is discarded
+probes = RegionProbes(
+    regions,
+    clients.get,
+    ttl=float(getenv('PING_TTL', '60')),
+    refresh_after=float(getenv('PING_REFRESH_AFTER', '15')),
+    timeout=2 * ping_timeout
+)
 
 @app.resolver(type_name="Query", field_name="getPingInfo")
 @tracer.capture_method
@@ -23,19 +45,18 @@ def get_pinginfo() -> dict:
     """
     Get ping latency information from various AWS regions.
     
+    Regions are probed concurrently and the results are cached per container.
+    
     Returns:
         Response with ping latency data or error
     """
     try:
-        latency_data = []
-        for region, client in clients.items():
-            start = time.time()
-            client.describe_regions()
-            latency = time.time() - start
-            latency_data.append({
-                'pingLocation': region, 
-                'pingLatency': int(latency * 1000)
-            })
+        latency_data = [
+            {'pingLocation': region, 'pingLatency': latency}
+            for region, latency in probes.latencies()
+        ]
+        if not latency_data:
+            return getpinginfo_error('NotFoundError', 'No ping info exists')
         return getpinginfo_response({'items': latency_data})
     except KeyError as e:
         logger.error(f"Failed to get ping info: {str(e)}")
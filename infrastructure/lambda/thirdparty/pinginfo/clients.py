@@ -0,0 +1,42 @@
+import threading
+
+import boto3
+from botocore.config import Config
+
+
+class RegionalClients:
+    """
+    Clients of one AWS service per region, created on first use.
+
+    Every client comes from the same session, so the service model is loaded
+    and parsed once by the session's loader and shared by all regions, and
+    nothing is built at import. Creating clients from a session is not
+    thread-safe, so creation is serialized; clients themselves are safe to
+    use from several threads once built.
+    """
+
+    def __init__(self, service_name: str, session: boto3.Session | None = None, config: Config | None = None):
+        self.service_name = service_name
+        self.session = session or boto3.Session()
+        self.config = config
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get(self, region: str):
+        """
+        Get the client of a region, creating it on first use.
+
+        Args:
+            region: Region name
+
+        Returns:
+            The service client for the region
+        """
+        client = self._clients.get(region)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(region)
+                if client is None:
+                    client = self.session.client(self.service_name, region_name=region, config=self.config)
+                    self._clients[region] = client
+        return client
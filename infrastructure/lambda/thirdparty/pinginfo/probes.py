@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RegionProbes:
+    """
+    Latency probes of a set of AWS regions with cached results.
+
+    Regions are probed concurrently, so a probe round takes as long as the
+    slowest region rather than the sum of all of them. Results are cached
+    per container: within refresh_after seconds they are returned as they
+    are, and after that a new round is run inside the invocation before
+    answering. Probing never outlives the invocation, as Lambda freezes a
+    container between invocations and a request timed across a freeze would
+    report the freeze as latency. Only the request itself is timed, never
+    the client setup, and a sample longer than timeout is discarded.
+    """
+
+    def __init__(self, regions: list, get_client, ttl: float = 60.0, refresh_after: float = 15.0,
+                 timeout: float = 2.0, clock=time.monotonic):
+        self.regions = regions
+        self.get_client = get_client
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.timeout = timeout
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=len(regions), thread_name_prefix='probe')
+        self._latencies = {}
+        self._probed_at = None
+
+    def latencies(self) -> list:
+        """
+        Get the latency of each region, probing them if the cached results are too old.
+
+        Returns:
+            List of (region, latency in milliseconds) for the regions that answered
+        """
+        if self._probed_at is None or self.clock() - self._probed_at >= self.refresh_after:
+            self.probe()
+        oldest = self.clock() - self.ttl
+        return [
+            (region, self._latencies[region][0]) for region in self.regions
+            if region in self._latencies and self._latencies[region][1] > oldest
+        ]
+
+    def probe(self) -> None:
+        """Probe every region concurrently and cache the results."""
+        results = list(self._executor.map(self._probe_region, self.regions))
+        now = self.clock()
+        for region, latency in zip(self.regions, results):
+            # A region that failed keeps its last latency until that is older than the TTL
+            if latency is not None:
+                self._latencies[region] = (latency, now)
+        self._probed_at = now
+
+    def _probe_region(self, region: str) -> int | None:
+        """
+        Time a request to a region.
+
+        Args:
+            region: Region to probe
+
+        Returns:
+            Latency in milliseconds, or None if the request failed or took longer than the timeout
+        """
+        try:
+            client = self.get_client(region)
+            start = time.perf_counter()
+            client.describe_regions(RegionNames=[region])
+            elapsed = time.perf_counter() - start
+        except Exception:
+            return None
+        if elapsed > self.timeout:
+            return None
+        return int(elapsed * 1000)
@@ -1,12 +1,21 @@
 from os import getenv
 import json
 import boto3
+import numpy as np
 
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
+from aws_lambda_powertools.utilities.batch.exceptions import BatchProcessingError
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 
+import json_utils
+from event_publisher import EventPublisher
+from odds_delta import OddsDeltaCache
+from liability import LiabilityBook, parse_thresholds
+from pricing import PricingEngine, parse_updates
+from suspension import SuspensionBook, SuspensionRules
+
 processor = BatchProcessor(event_type=EventType.SQS)
 tracer = Tracer()
 logger = Logger()
@@ -14,6 +23,34 @@ logger = Logger()
 event_bus_name = getenv('EVENT_BUS')
 session = boto3.Session()
 events = session.client('events')
+dynamodb = session.resource('dynamodb')
+publisher = EventPublisher(events)
+
+# Our margin on top of the fair probabilities, 0.05 is a 5% overround
+pricing_engine = PricingEngine(margin=float(getenv('TRADING_MARGIN', '0.05')))
+
+# Liability per event and outcome from placed bets. Outcomes whose liability crosses a
+# threshold are shaded by the extra margin of the highest threshold crossed.
+liability_book = LiabilityBook(
+    dynamodb,
+    getenv('LIABILITY_TABLE'),
+    parse_thresholds(getenv('LIABILITY_THRESHOLDS', '1000:0.02,5000:0.05,20000:0.1')),
+    max_age=float(getenv('LIABILITY_MAX_AGE', '5'))
+)
+
+# Automatic market suspension on fast odds movement or liability growth over a sliding window
+suspension_rules = SuspensionRules(
+    window=float(getenv('SUSPENSION_WINDOW', '300')),
+    max_odds_move=float(getenv('SUSPENSION_MAX_ODDS_MOVE', '0.15')),
+    max_liability_growth=float(getenv('SUSPENSION_MAX_LIABILITY_GROWTH', '5000')),
+    min_suspension=float(getenv('SUSPENSION_MIN_SECONDS', '120'))
+)
+# Suspended markets per event, kept in the liability table and changed only once published
+suspension_book = SuspensionBook(dynamodb, getenv('LIABILITY_TABLE'))
+
+# Last published trading odds per event, so ticks that price to the same odds are dropped.
+# Unchanged odds are republished after ODDS_DELTA_MAX_AGE seconds when it is set.
+odds_delta_cache = OddsDeltaCache(max_age=float(getenv('ODDS_DELTA_MAX_AGE', '0')))
 
 
 @tracer.capture_method
@@ -42,9 +79,8 @@ def handle_updated_odds(item: dict) -> dict:
     """
     Process updated odds events.
     
-    In a real-world scenario, the odds would be assessed by this service
-    to produce new odds. Currently, we just re-raise the event under
-    the trading namespace.
+    The provider odds are priced by the pricing engine and re-raised
+    under the trading namespace.
     
     Args:
         item: Event containing updated odds
@@ -53,12 +89,94 @@ def handle_updated_odds(item: dict) -> dict:
         Formatted event for EventBridge
     """
     try:
-        return form_event('UpdatedOdds', item['detail'])
+        entries = handle_updated_odds_batch([item])
+        return entries[0] if entries else None
     except Exception as e:
         logger.error(f"Error handling updated odds: {str(e)}")
         return None
 
 
+@tracer.capture_method
+def handle_updated_odds_batch(items: list) -> list:
+    """
+    Price a batch of updated odds events in a single pass of the pricing engine.
+    
+    Outcomes carrying a large liability are shaded with extra margin. If the
+    liability cannot be read the odds are priced without shading rather than
+    held back. Each tick is also run through the suspension rules against the
+    suspended markets of its event, which are skipped for the batch if they
+    cannot be read. Ticks that price to the odds last published for their
+    event are dropped.
+    
+    Args:
+        items: Events containing updated odds
+        
+    Returns:
+        Formatted UpdatedOdds events for the items that could be priced and
+        change the published odds, in order, followed by any MarketSuspended and MarketUnsuspended events
+    """
+    if not items:
+        return []
+    details = [item['detail'] for item in items]
+    odds = parse_updates(details)
+    try:
+        exposures = liability_book.exposures([detail.get('eventId') for detail in details])
+        adjustments = liability_book.shading(exposures)
+    except Exception as e:
+        logger.error(f"Error reading liability, pricing without shading: {str(e)}")
+        exposures = np.zeros(odds.shape)
+        adjustments = None
+
+    try:
+        suspended = suspension_book.suspended_since([detail.get('eventId') for detail in details])
+    except Exception as e:
+        logger.error(f"Error reading suspended markets, skipping suspension rules: {str(e)}")
+        suspended = None
+
+    priced = pricing_engine.price_updates(details, adjustments, odds)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair = pricing_engine.fair_probabilities(odds)
+    output = []
+    suspensions = []
+    for index, detail in enumerate(priced):
+        if detail is None:
+            logger.error(f"Invalid odds for event {details[index].get('eventId')}")
+            continue
+        if odds_delta_cache.changed([detail]):
+            output.append(form_event('UpdatedOdds', detail))
+        if suspended is None:
+            continue
+        for market, detail_type, reason in suspension_rules.observe(detail['eventId'], fair[index], exposures[index],
+                                                                    suspended[index]):
+            logger.info(f"{detail_type} {detail['eventId']} {market}: {reason}")
+            suspensions.append(form_event(detail_type, {
+                'eventId': detail['eventId'],
+                'market': market,
+                'reason': reason
+            }))
+    return output + suspensions
+
+
+@tracer.capture_method
+def handle_bets_placed(item: dict) -> None:
+    """
+    Add placed bets to the liability book.
+    
+    Errors are raised so the record is retried; bets already recorded are
+    skipped on the retry. Bets with odds that cannot be parsed are logged and
+    skipped, as retrying them cannot succeed.
+    
+    Args:
+        item: Event containing the placed bets
+    """
+    for bet in item['detail']['items']:
+        try:
+            if not liability_book.record_bet(bet):
+                logger.info(f"Bet {bet['betId']} already recorded")
+        except ValueError as e:
+            logger.error(f"Skipping bet: {str(e)}")
+
+
 def form_event(detail_type: str, detail: dict) -> dict:
     """
     Create a properly formatted event for EventBridge.
@@ -74,7 +192,7 @@ def form_event(detail_type: str, detail: dict) -> dict:
         return {
             'Source': 'com.trading',
             'DetailType': detail_type,
-            'Detail': json.dumps(detail),
+            'Detail': json_utils.dumps(detail),
             'EventBusName': event_bus_name
         }
     except Exception as e:
@@ -99,7 +217,15 @@ def record_handler(record: SQSRecord) -> dict:
             return None
             
         item = json.loads(payload)
-        
+    except Exception as e:
+        logger.error(f"Error processing record: {str(e)}")
+        return None
+
+    # Failures recording bets are left to fail the record so SQS retries it
+    if item.get('source') == 'com.betting' and item.get('detail-type') == 'BetsPlaced':
+        return handle_bets_placed(item)
+
+    try:
         # Check if this is a third-party updated odds event
         if (item.get('source') == 'com.thirdparty' and 
             item.get('detail-type') == 'UpdatedOdds'):
@@ -111,12 +237,105 @@ def record_handler(record: SQSRecord) -> dict:
         return None
 
 
+def partition_updated_odds(records: list) -> tuple:
+    """
+    Split SQS records into third-party UpdatedOdds events and everything else.
+    
+    Args:
+        records: Raw SQS records
+        
+    Returns:
+        Tuple of (record, parsed event) pairs for UpdatedOdds events and the
+        remaining records
+    """
+    odds_ticks = []
+    other_records = []
+    for record in records:
+        try:
+            item = json.loads(record['body']) if record.get('body') else None
+        except ValueError:
+            item = None
+        if (item and item.get('source') == 'com.thirdparty' and
+                item.get('detail-type') == 'UpdatedOdds' and isinstance(item.get('detail'), dict)):
+            odds_ticks.append((record, item))
+        else:
+            other_records.append(record)
+    return odds_ticks, other_records
+
+
+def latest_ticks(odds_ticks: list) -> list:
+    """
+    Collapse the odds ticks of a batch to the latest one per event.
+    
+    SQS does not keep ticks in order and redelivers them, so the latest tick
+    is the one with the latest event time, falling back to batch order. The
+    superseded ticks are dropped, which acknowledges their records.
+    
+    Args:
+        odds_ticks: (record, parsed event) pairs of UpdatedOdds events
+        
+    Returns:
+        (record, parsed event) pairs with one tick per event, in batch order
+    """
+    latest = {}
+    for position, (record, item) in enumerate(odds_ticks):
+        key = (item.get('time') or '', position)
+        event_id = item['detail'].get('eventId')
+        if event_id not in latest or key >= latest[event_id][0]:
+            latest[event_id] = (key, record, item)
+    return [(record, item) for _, record, item in sorted(latest.values(), key=lambda tick: tick[0][1])]
+
+
+@tracer.capture_method
+def publish_events(entries: list) -> dict:
+    """
+    Publish EventBridge entries through the shared publisher of the layer.
+    
+    The publisher sends count- and size-bounded chunks and retries the
+    entries rejected by EventBridge with exponential backoff.
+    
+    Args:
+        entries: Formatted EventBridge entries
+        
+    Returns:
+        Dictionary of index to error for entries that could not be published
+    """
+    errors = publisher.publish(entries)
+    if errors:
+        logger.warning(f"Failed to publish {len(errors)} of {len(entries)} events",
+                       extra={'errors': sorted(set(errors.values()))})
+    return errors
+
+
+def record_suspensions(published: list) -> None:
+    """
+    Record the market suspensions and unsuspensions that were published.
+    
+    A change that cannot be recorded is logged; the market keeps its state
+    and the rules raise the change again on a later tick.
+    
+    Args:
+        published: EventBridge entries that were published
+    """
+    for entry in published:
+        if entry['DetailType'] not in ('MarketSuspended', 'MarketUnsuspended'):
+            continue
+        detail = json.loads(entry['Detail'])
+        try:
+            suspension_book.record(detail['eventId'], detail['market'], entry['DetailType'])
+        except Exception as e:
+            logger.error(f"Error recording {entry['DetailType']} {detail['eventId']} {detail['market']}: {str(e)}")
+
+
 @logger.inject_lambda_context(log_event=True)
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """
     Main Lambda handler function.
     
+    Records whose processing or events fail to publish are reported in
+    batchItemFailures so SQS retries only those records.
+    
     Args:
         event: Lambda event
         context: Lambda context
@@ -124,23 +343,50 @@ def lambda_handler(event: dict, context: LambdaContext) -> dict:
     Returns:
         Batch processing response
     """
+    records = event.get("Records", [])
     try:
-        # Process batch of records
-        batch = event.get("Records", [])
-        with processor(records=batch, handler=record_handler):
-            processed_messages = processor.process()
+        odds_ticks, other_records = partition_updated_odds(records)
+        failed_ids = set()
 
-        # Extract successful events that returned a value
+        # Process the remaining records first, so bets placed in this batch count
+        # towards the liability the odds are priced with
+        processed_messages = []
+        try:
+            with processor(records=other_records, handler=record_handler):
+                processed_messages = processor.process()
+            failed_ids.update(failure['itemIdentifier'] for failure in processor.response()['batchItemFailures'])
+        except BatchProcessingError:
+            # The processor raises instead of reporting when every record failed
+            failed_ids.update(record['messageId'] for record in other_records)
+
+        # Events to publish with the message ID of the record they were raised for
         output_events = [
-            result[1] for result in processed_messages 
+            (record['messageId'], result[1])
+            for record, result in zip(other_records, processed_messages)
             if result[0] == "success" and result[1] is not None
         ]
-        
+
+        # Odds updates in the batch are priced together in one vectorized pass,
+        # with only the latest tick of each event kept
+        ticks = latest_ticks(odds_ticks)
+        tick_ids = {item['detail'].get('eventId'): record['messageId'] for record, item in ticks}
+        for entry in handle_updated_odds_batch([item for _, item in ticks]):
+            output_events.append((tick_ids.get(json.loads(entry['Detail']).get('eventId')), entry))
+
         # Send events to EventBridge if any exist
         if output_events:
-            events.put_events(Entries=output_events)
+            errors = publish_events([entry for _, entry in output_events])
+            for index in errors:
+                message_id, entry = output_events[index]
+                failed_ids.add(message_id)
+                if entry['DetailType'] == 'UpdatedOdds':
+                    odds_delta_cache.forget([json.loads(entry['Detail'])['eventId']])
+            record_suspensions([entry for index, (_, entry) in enumerate(output_events) if index not in errors])
 
-        return processor.response()
+        return {"batchItemFailures": [
+            {"itemIdentifier": record['messageId']} for record in records
+            if record['messageId'] in failed_ids
+        ]}
     except Exception as e:
-        logger.error(f"Error in lambda handler: {str(e)}")
-        return {"batchItemFailures": []}
+        logger.exception(f"Error in lambda handler: {str(e)}")
+        return {"batchItemFailures": [{"itemIdentifier": record['messageId']} for record in records]}
@@ -0,0 +1,233 @@
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from pricing import parse_odds
+
+# Bet outcomes in the column order of the pricing engine
+BET_OUTCOMES = ('homeWin', 'awayWin', 'draw')
+
+# Sort key of the running totals item of an event, bets are marked under bet#<betId>
+TOTALS_ENTRY = 'totals'
+BET_MARKER_TTL_SECONDS = 7 * 24 * 3600
+
+# DynamoDB accepts at most 100 keys per BatchGetItem request
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_GET_ATTEMPTS = 3
+
+
+def parse_thresholds(spec: str) -> list[tuple[float, float]]:
+    """
+    Parse liability thresholds of the form "1000:0.02,5000:0.05".
+
+    Args:
+        spec: Comma separated liability:margin pairs
+
+    Returns:
+        (liability, extra margin) pairs sorted by liability
+    """
+    thresholds = []
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        liability, margin = pair.split(':')
+        thresholds.append((float(liability), float(margin)))
+    return sorted(thresholds)
+
+
+class LiabilityBook:
+    """
+    Liability per event and outcome, fed by placed bets.
+
+    Stakes and potential payouts per outcome are kept as atomic counters on a
+    totals item per event in DynamoDB, so every container of the receiver adds
+    to the same book without reading the bets table. Each bet is also written
+    as a marker in the same transaction, which makes a redelivered BetsPlaced
+    event a no-op. Reads are served from memory: an event's totals are loaded
+    once and reloaded when older than max_age, so looking up the exposure of
+    an event during pricing is a dictionary lookup.
+    """
+
+    def __init__(self, dynamodb, table_name: str, thresholds: list, max_age: float = 5.0,
+                 max_events: int = 10000, clock=time.monotonic):
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.max_age = max_age
+        self.max_events = max_events
+        self.clock = clock
+        self.levels = np.array([level for level, _ in thresholds], dtype=float)
+        self.margins = np.array([0.0] + [margin for _, margin in thresholds])
+        # event ID -> [stakes, payouts, loaded at], stakes and payouts indexed by outcome
+        self._totals = OrderedDict()
+
+    def record_bet(self, bet: dict) -> bool:
+        """
+        Add a placed bet to the liability of its event.
+
+        Args:
+            bet: Bet with eventId, betId, outcome, odds and amount
+
+        Returns:
+            True if the bet was added, False if it had already been recorded
+
+        Raises:
+            ValueError: If the odds of the bet are not valid decimal or fractional odds
+            ClientError: If the bet could not be recorded
+        """
+        event_id = bet['eventId']
+        outcome = BET_OUTCOMES.index(bet['outcome'])
+        odds = parse_odds(bet['odds'])
+        if not np.isfinite(odds):
+            raise ValueError(f"Invalid odds {bet['odds']!r} for bet {bet['betId']}")
+        stake = Decimal(str(bet['amount']))
+        payout = stake * Decimal(str(odds))
+
+        try:
+            self.dynamodb.meta.client.transact_write_items(TransactItems=[
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': {
+                            'eventId': {'S': event_id},
+                            'entry': {'S': f"bet#{bet['betId']}"},
+                            'expiry': {'N': str(int(time.time()) + BET_MARKER_TTL_SECONDS)}
+                        },
+                        'ConditionExpression': 'attribute_not_exists(eventId)'
+                    }
+                },
+                {
+                    'Update': {
+                        'TableName': self.table_name,
+                        'Key': {'eventId': {'S': event_id}, 'entry': {'S': TOTALS_ENTRY}},
+                        'UpdateExpression': 'ADD #s :s, #p :p',
+                        'ExpressionAttributeNames': {
+                            '#s': f"stake_{bet['outcome']}",
+                            '#p': f"payout_{bet['outcome']}"
+                        },
+                        'ExpressionAttributeValues': {
+                            ':s': {'N': str(stake)},
+                            ':p': {'N': str(payout)}
+                        }
+                    }
+                }
+            ])
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons') or [{}]
+            if reasons[0].get('Code') == 'ConditionalCheckFailed':
+                return False
+            raise
+
+        totals = self._totals.get(event_id)
+        if totals is not None:
+            totals[0][outcome] += float(stake)
+            totals[1][outcome] += float(payout)
+        return True
+
+    def exposure(self, event_id: str) -> np.ndarray:
+        """
+        Get the net liability of each outcome of an event held in memory.
+
+        Args:
+            event_id: ID of the event
+
+        Returns:
+            Array with the amount lost on home, away and draw, zero if not loaded
+        """
+        totals = self._totals.get(event_id)
+        if totals is None:
+            return np.zeros(len(BET_OUTCOMES))
+        stakes, payouts, _ = totals
+        return payouts - stakes.sum()
+
+    def exposures(self, event_ids: list) -> np.ndarray:
+        """
+        Get the net liability of each outcome for a batch of events.
+
+        Events not held in memory, or held for longer than max_age, are loaded
+        with a single batched read first.
+
+        Args:
+            event_ids: IDs of the events
+
+        Returns:
+            Array of shape (events, 3) with the amount lost on each outcome
+        """
+        now = self.clock()
+        stale = {
+            event_id for event_id in event_ids
+            if event_id not in self._totals or now - self._totals[event_id][2] >= self.max_age
+        }
+        if stale:
+            self._load(list(stale), now)
+        if not event_ids:
+            return np.zeros((0, len(BET_OUTCOMES)))
+        return np.stack([self.exposure(event_id) for event_id in event_ids])
+
+    def adjustments(self, event_ids: list) -> np.ndarray:
+        """
+        Get the extra margin to shade each outcome by for a batch of events.
+
+        Args:
+            event_ids: IDs of the events
+
+        Returns:
+            Array of shape (events, 3) with the margin of the highest threshold crossed
+        """
+        return self.shading(self.exposures(event_ids))
+
+    def shading(self, exposures: np.ndarray) -> np.ndarray:
+        """
+        Map liabilities to the extra margin of the highest threshold they cross.
+
+        Args:
+            exposures: Array of liabilities
+
+        Returns:
+            Array of the same shape with the extra margin for each liability
+        """
+        return self.margins[np.searchsorted(self.levels, exposures, side='right')]
+
+    def _load(self, event_ids: list, now: float) -> None:
+        """
+        Load the totals of events from DynamoDB.
+
+        Args:
+            event_ids: IDs of the events to load
+            now: Clock reading to stamp the loaded totals with
+        """
+        loaded = {}
+        unprocessed = set()
+        for start in range(0, len(event_ids), MAX_BATCH_GET_KEYS):
+            request = {
+                self.table_name: {
+                    'Keys': [
+                        {'eventId': event_id, 'entry': TOTALS_ENTRY}
+                        for event_id in event_ids[start:start + MAX_BATCH_GET_KEYS]
+                    ]
+                }
+            }
+            for _ in range(MAX_BATCH_GET_ATTEMPTS):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    loaded[item['eventId']] = item
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+            if request:
+                unprocessed.update(key['eventId'] for key in request[self.table_name]['Keys'])
+
+        # Events that could not be read keep what is held and are read again next time
+        for event_id in event_ids:
+            if event_id in unprocessed:
+                continue
+            item = loaded.get(event_id, {})
+            self._totals[event_id] = [
+                np.array([float(item.get(f'stake_{outcome}', 0)) for outcome in BET_OUTCOMES]),
+                np.array([float(item.get(f'payout_{outcome}', 0)) for outcome in BET_OUTCOMES]),
+                now
+            ]
+            self._totals.move_to_end(event_id)
+
+        while len(self._totals) > self.max_events:
+            self._totals.popitem(last=False)
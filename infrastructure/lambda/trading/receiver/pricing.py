@@ -0,0 +1,162 @@
+from decimal import Decimal
+
+import numpy as np
+
+# Outcomes priced for each market, in column order
+OUTCOMES = ('homeOdds', 'awayOdds', 'drawOdds')
+
+# Odds ladder as (from, to, increment) bands, the same shape as exchange price ladders
+LADDER_BANDS = (
+    ('1.01', '2', '0.01'),
+    ('2', '3', '0.02'),
+    ('3', '4', '0.05'),
+    ('4', '6', '0.1'),
+    ('6', '10', '0.2'),
+    ('10', '20', '0.5'),
+    ('20', '30', '1'),
+    ('30', '50', '2'),
+    ('50', '100', '5'),
+    ('100', '1000', '10')
+)
+
+
+def build_ladder() -> list[str]:
+    """
+    Expand the ladder bands into every price on the ladder.
+
+    Returns:
+        Ladder prices in ascending order, formatted as decimal odds strings
+    """
+    prices = []
+    for start, stop, step in LADDER_BANDS:
+        price, stop, step = Decimal(start), Decimal(stop), Decimal(step)
+        while price < stop:
+            prices.append(price)
+            price += step
+    prices.append(Decimal(LADDER_BANDS[-1][1]))
+    return [f'{price:.1f}' if price == price.to_integral() else str(price.normalize()) for price in prices]
+
+
+def parse_odds(value) -> float:
+    """
+    Parse decimal ("3.0") or fractional ("2/1") odds into decimal odds.
+
+    Args:
+        value: Odds as a string or number
+
+    Returns:
+        Decimal odds, or NaN if the value is not valid odds
+    """
+    try:
+        if isinstance(value, str) and '/' in value:
+            numerator, denominator = value.split('/', 1)
+            return 1.0 + float(numerator) / float(denominator)
+        return float(value)
+    except (ValueError, TypeError, ZeroDivisionError):
+        return float('nan')
+
+
+def parse_updates(updates: list) -> np.ndarray:
+    """
+    Parse the odds of a batch of updates.
+
+    Args:
+        updates: Odds update details with the odds of each outcome
+
+    Returns:
+        Array of shape (updates, 3) with decimal odds, NaN where invalid
+    """
+    return np.array([[parse_odds(update.get(outcome)) for outcome in OUTCOMES] for update in updates])
+
+
+class PricingEngine:
+    """
+    Vectorized pricing of home/away/draw markets.
+
+    Provider odds are converted to implied probabilities, the provider's margin
+    is removed by normalizing them to sum to one, our own margin is applied
+    and the resulting odds are snapped down onto the odds ladder. Snapping is
+    a lookup in a table precomputed over quantized probabilities, so a whole
+    batch of markets is priced with a handful of array operations.
+    """
+
+    def __init__(self, margin: float = 0.05, resolution: int = 100000):
+        if margin < 0:
+            raise ValueError('margin must not be negative')
+        self.margin = margin
+        self.resolution = resolution
+        self.ladder = build_ladder()
+        ladder = np.array([float(price) for price in self.ladder])
+
+        # Entry i holds the ladder index of the longest price not above the odds
+        # of probability i / resolution. Probabilities are rounded up when looked
+        # up, so the snapped price never exceeds the computed one, and is at most one
+        # ladder step shorter than it when the rounding crosses a ladder price.
+        quantized = np.arange(resolution + 1) / resolution
+        with np.errstate(divide='ignore'):
+            odds = 1.0 / quantized
+        self.lookup = np.clip(np.searchsorted(ladder, odds, side='right') - 1, 0, len(ladder) - 1).astype(np.int16)
+
+    def fair_probabilities(self, odds: np.ndarray) -> np.ndarray:
+        """
+        Remove the provider margin from a batch of odds.
+
+        Args:
+            odds: Array of shape (markets, 3) with decimal odds
+
+        Returns:
+            Array of shape (markets, 3) with probabilities summing to one per market
+        """
+        implied = 1.0 / odds
+        return implied / implied.sum(axis=1, keepdims=True)
+
+    def price(self, odds: np.ndarray, adjustments: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Price a batch of markets onto the odds ladder.
+
+        Args:
+            odds: Array of shape (markets, 3) with provider decimal odds
+            adjustments: Optional array of shape (markets, 3) with extra margin per outcome
+
+        Returns:
+            Tuple of an array of shape (markets, 3) with ladder indexes, and a
+            boolean array marking the markets with valid provider odds
+        """
+        valid = np.all(np.isfinite(odds) & (odds > 1.0), axis=1)
+        safe = np.where(valid[:, None], odds, 2.0)
+
+        margin = 1.0 + self.margin
+        if adjustments is not None:
+            margin = margin + adjustments
+        probabilities = self.fair_probabilities(safe) * margin
+
+        quantized = np.clip(np.ceil(probabilities * self.resolution), 1, self.resolution).astype(np.intp)
+        return self.lookup[quantized], valid
+
+    def price_updates(self, updates: list, adjustments: np.ndarray | None = None,
+                      odds: np.ndarray | None = None) -> list:
+        """
+        Price a batch of odds updates.
+
+        Args:
+            updates: Odds update details with eventId and the odds of each outcome
+            adjustments: Optional array of shape (updates, 3) with extra margin per outcome
+            odds: Optional odds of the updates already parsed with parse_updates
+
+        Returns:
+            Priced update per input update, or None where the provider odds were invalid
+        """
+        if not updates:
+            return []
+        if odds is None:
+            odds = parse_updates(updates)
+        indexes, valid = self.price(odds, adjustments)
+
+        ladder = self.ladder
+        results = []
+        for update, row, is_valid in zip(updates, indexes.tolist(), valid.tolist()):
+            if not is_valid:
+                results.append(None)
+                continue
+            results.append({**update, **{outcome: ladder[i] for outcome, i in zip(OUTCOMES, row)}})
+        return results
@@ -0,0 +1,275 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+# Markets of an event, in the column order of the pricing engine
+MARKETS = ('homeOdds', 'awayOdds', 'drawOdds')
+
+# Sort key of the item holding the suspended markets of an event in the liability table
+SUSPENSION_ENTRY = 'suspension'
+
+# DynamoDB accepts at most 100 keys per BatchGetItem request
+MAX_BATCH_GET_KEYS = 100
+MAX_BATCH_GET_ATTEMPTS = 3
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of timestamped samples, overwriting the oldest when full.
+
+    Samples are rows of a preallocated array, so pushing a sample and reading
+    a time window cost the same however long the event has been running.
+    """
+    __slots__ = ('times', 'values', 'head')
+
+    def __init__(self, capacity: int, width: int):
+        self.times = np.full(capacity, -np.inf)
+        self.values = np.zeros((capacity, width))
+        self.head = 0
+
+    def push(self, timestamp: float, row: np.ndarray) -> None:
+        """
+        Add a sample, replacing the oldest one when the buffer is full.
+
+        Args:
+            timestamp: Time of the sample in seconds
+            row: Sample values
+        """
+        self.times[self.head] = timestamp
+        self.values[self.head] = row
+        self.head = (self.head + 1) % len(self.times)
+
+    def window(self, since: float) -> np.ndarray:
+        """
+        Get the samples taken at or after a point in time.
+
+        Args:
+            since: Start of the window in seconds
+
+        Returns:
+            Array with one row per sample in the window, in no particular order
+        """
+        return self.values[self.times >= since]
+
+
+class SuspensionRules:
+    """
+    Rules suspending markets that move too fast or take on liability too quickly.
+
+    Every odds tick of an event is recorded in two ring buffers, one with the
+    fair probability of each outcome and one with its liability. A market is
+    suspended when, within the sliding window, its probability has moved by
+    more than max_odds_move or its liability has grown by more than
+    max_liability_growth. It is unsuspended once both measures are back under
+    release_ratio of their limits and it has been suspended for at least
+    min_suspension seconds.
+
+    The buffers are kept per container. Whether a market is suspended is not:
+    it is passed in from the SuspensionBook, which only records a change once
+    its event has been published, so any container can unsuspend a market.
+    """
+
+    def __init__(self, window: float = 300.0, capacity: int = 32, max_odds_move: float = 0.15,
+                 max_liability_growth: float = 5000.0, release_ratio: float = 0.5,
+                 min_suspension: float = 120.0, max_events: int = 10000, clock=time.time):
+        self.window = window
+        self.capacity = capacity
+        self.max_odds_move = max_odds_move
+        self.max_liability_growth = max_liability_growth
+        self.release_ratio = release_ratio
+        self.min_suspension = min_suspension
+        self.max_events = max_events
+        self.clock = clock
+        # event ID -> [odds buffer, liability buffer]
+        self._events = OrderedDict()
+
+    def observe(self, event_id: str, probabilities: np.ndarray, exposure: np.ndarray,
+                suspended_since: np.ndarray | None = None) -> list:
+        """
+        Record an odds tick of an event and evaluate the rules for its markets.
+
+        The suspension state passed in is not changed; the caller records the
+        returned changes once they have been published.
+
+        Args:
+            event_id: ID of the event
+            probabilities: Fair probability of each outcome
+            exposure: Liability of each outcome
+            suspended_since: Epoch seconds each market has been suspended since,
+                NaN for open markets, all open when left out
+
+        Returns:
+            List of (market, detail type, reason) for markets to suspend or unsuspend
+        """
+        now = self.clock()
+        if suspended_since is None:
+            suspended_since = np.full(len(MARKETS), np.nan)
+        state = self._events.get(event_id)
+        if state is None:
+            state = [RingBuffer(self.capacity, len(MARKETS)), RingBuffer(self.capacity, len(MARKETS))]
+            self._events[event_id] = state
+            if len(self._events) > self.max_events:
+                self._events.popitem(last=False)
+        else:
+            self._events.move_to_end(event_id)
+        odds_buffer, liability_buffer = state
+
+        odds_buffer.push(now, probabilities)
+        liability_buffer.push(now, exposure)
+        since = now - self.window
+        recent_odds = odds_buffer.window(since)
+        odds_move = recent_odds.max(axis=0) - recent_odds.min(axis=0)
+        liability_growth = exposure - liability_buffer.window(since).min(axis=0)
+
+        odds_breach = odds_move > self.max_odds_move
+        liability_breach = liability_growth > self.max_liability_growth
+        released = ((odds_move <= self.max_odds_move * self.release_ratio) &
+                    (liability_growth <= self.max_liability_growth * self.release_ratio))
+        suspended = ~np.isnan(suspended_since)
+
+        changes = []
+        for index, market in enumerate(MARKETS):
+            if not suspended[index] and (odds_breach[index] or liability_breach[index]):
+                reason = 'OddsMovement' if odds_breach[index] else 'Liability'
+                changes.append((market, 'MarketSuspended', reason))
+            elif suspended[index] and released[index] and now - suspended_since[index] >= self.min_suspension:
+                changes.append((market, 'MarketUnsuspended', 'Released'))
+        return changes
+
+
+class SuspensionBook:
+    """
+    Suspended markets per event, shared by every container of the receiver.
+
+    Each event has one item in the liability table holding the time each of
+    its suspended markets was suspended. A change is only recorded once the
+    MarketSuspended or MarketUnsuspended event announcing it has been
+    published, so a failed publish leaves the market as it was and the
+    change is raised again on the next tick. Writes are conditional on the
+    market still being in the state the change starts from, so a change
+    another container already recorded is not recorded twice. Reads are
+    served from memory and reloaded with a single batched read once older
+    than max_age.
+    """
+
+    def __init__(self, dynamodb, table_name: str, max_age: float = 5.0, max_events: int = 10000,
+                 clock=time.time):
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.max_age = max_age
+        self.max_events = max_events
+        self.clock = clock
+        # event ID -> [suspended since per market, loaded at]
+        self._suspended = OrderedDict()
+
+    def suspended_since(self, event_ids: list) -> np.ndarray:
+        """
+        Get the time each market of a batch of events has been suspended since.
+
+        Events not held in memory, or held for longer than max_age, are loaded
+        with a single batched read first.
+
+        Args:
+            event_ids: IDs of the events
+
+        Returns:
+            Array of shape (events, 3) with epoch seconds, NaN for open markets
+
+        Raises:
+            ClientError: If the suspended markets could not be read
+        """
+        now = self.clock()
+        stale = {
+            event_id for event_id in event_ids
+            if event_id not in self._suspended or now - self._suspended[event_id][1] >= self.max_age
+        }
+        if stale:
+            self._load(list(stale), now)
+        if not event_ids:
+            return np.zeros((0, len(MARKETS)))
+        return np.stack([
+            self._suspended[event_id][0].copy() if event_id in self._suspended else np.full(len(MARKETS), np.nan)
+            for event_id in event_ids
+        ])
+
+    def record(self, event_id: str, market: str, detail_type: str) -> None:
+        """
+        Record a published suspension change of a market.
+
+        Args:
+            event_id: ID of the event
+            market: Market that was suspended or unsuspended
+            detail_type: MarketSuspended or MarketUnsuspended
+
+        Raises:
+            ClientError: If the change could not be written
+        """
+        now = self.clock()
+        suspend = detail_type == 'MarketSuspended'
+        if suspend:
+            update = {
+                'UpdateExpression': 'SET #m = :since',
+                'ConditionExpression': 'attribute_not_exists(#m)',
+                'ExpressionAttributeValues': {':since': {'N': str(now)}}
+            }
+        else:
+            update = {'UpdateExpression': 'REMOVE #m', 'ConditionExpression': 'attribute_exists(#m)'}
+        try:
+            self.dynamodb.meta.client.update_item(
+                TableName=self.table_name,
+                Key={'eventId': {'S': event_id}, 'entry': {'S': SUSPENSION_ENTRY}},
+                ExpressionAttributeNames={'#m': market},
+                **update
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailed':
+                raise
+            # Another container recorded it first, read its state on the next tick
+            self._suspended.pop(event_id, None)
+            return
+
+        state = self._suspended.get(event_id)
+        if state is not None:
+            state[0][MARKETS.index(market)] = now if suspend else np.nan
+
+    def _load(self, event_ids: list, now: float) -> None:
+        """
+        Load the suspended markets of events from DynamoDB.
+
+        Args:
+            event_ids: IDs of the events to load
+            now: Clock reading to stamp the loaded state with
+        """
+        loaded = {}
+        for start in range(0, len(event_ids), MAX_BATCH_GET_KEYS):
+            request = {
+                self.table_name: {
+                    'Keys': [
+                        {'eventId': event_id, 'entry': SUSPENSION_ENTRY}
+                        for event_id in event_ids[start:start + MAX_BATCH_GET_KEYS]
+                    ]
+                }
+            }
+            for _ in range(MAX_BATCH_GET_ATTEMPTS):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    loaded[item['eventId']] = item
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+            if request:
+                raise ClientError({'Error': {'Code': 'UnprocessedKeys', 'Message': 'Suspended markets not read'}},
+                                  'BatchGetItem')
+
+        for event_id in event_ids:
+            item = loaded.get(event_id, {})
+            self._suspended[event_id] = [
+                np.array([float(item[market]) if market in item else np.nan for market in MARKETS]),
+                now
+            ]
+            self._suspended.move_to_end(event_id)
+
+        while len(self._suspended) > self.max_events:
+            self._suspended.popitem(last=False)
@@ -3,6 +3,7 @@ from decimal import Decimal
 from os import getenv
 import json
 import boto3
+from botocore.config import Config
 
 from aws_lambda_powertools.utilities.data_classes import AppSyncResolverEvent
 from aws_lambda_powertools import Logger, Tracer
@@ -10,6 +11,9 @@ from aws_lambda_powertools.event_handler import AppSyncResolver
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from bulk import update_all
+from event_publisher import EventPublisher
+
 tracer = Tracer()
 logger = Logger()
 app = AppSyncResolver()
@@ -19,6 +23,14 @@ session = boto3.Session()
 cognito = boto3.client('cognito-idp')
 event_bus_name = getenv('EVENT_BUS')
 events = session.client('events')
+publisher = EventPublisher(events)
+
+# Most users a single lockUsers call may update
+lock_users_max = int(getenv('LOCK_USERS_MAX', '100'))
+# Cognito updates a lockUsers call keeps in flight at once
+lock_users_concurrency = int(getenv('LOCK_USERS_CONCURRENCY', '8'))
+# Cognito client for lockUsers, which slows its own request rate when Cognito throttles it
+bulk_cognito = session.client('cognito-idp', config=Config(retries={'mode': 'adaptive', 'max_attempts': 8}))
 
 # User pool resolvers
 @app.resolver(type_name="Mutation", field_name="lockUser")
@@ -49,8 +61,10 @@ def lock_user(input: dict) -> dict:
                 }
             ]
         )
-        send_event(user_response(input))
-        return user_response(input)
+        # The lock applies to the caller, whatever userId the input carries
+        user = user_response({**input, 'userId': userId})
+        send_event(user)
+        return user
     except Exception as e:
         logger.error(f"Error locking user: {str(e)}")
         return wallet_error('Unknown error', 'An unknown error occurred.')
@@ -84,12 +98,74 @@ def lock_user_generate_event(input: dict) -> dict:
                 }
             ]
         )
-        send_event(user_response(input))
-        return user_response(input)
+        # The lock applies to the caller, whatever userId the input carries
+        user = user_response({**input, 'userId': userId})
+        send_event(user)
+        return user
     except Exception as e:
         logger.error(f"Error locking user with event generation: {str(e)}")
         return wallet_error('Unknown error', 'An unknown error occurred.')
 
+@app.resolver(type_name="Mutation", field_name="lockUsers")
+@tracer.capture_method
+def lock_users(input: dict) -> dict:
+    """
+    Lock or unlock many user accounts in one call.
+    
+    Updates each user's isLocked attribute in Cognito, a few at a time, and
+    publishes a userLocked event for every user that was updated. A user
+    that fails does not stop the others.
+    
+    Args:
+        input: Contains users, each with the userId and isLocked flag to set
+        
+    Returns:
+        dict: Result of each user in input order
+        dict: Error response if operation fails
+    """
+    users = input.get('users') or []
+    if len(users) > lock_users_max:
+        return wallet_error('InputError', f'At most {lock_users_max} users can be locked in one call.')
+
+    try:
+        errors = update_all(set_lock_status, users, lock_users_concurrency)
+        updated = [index for index, error in enumerate(errors) if error is None]
+        unpublished = publisher.publish([form_event(user_response(users[index])) for index in updated])
+        for position in unpublished:
+            errors[updated[position]] = 'EventNotPublished'
+        return {
+            '__typename': 'LockUserResultList',
+            'items': [
+                {'userId': user['userId'], 'isLocked': user['isLocked'], 'succeeded': error is None, 'error': error}
+                for user, error in zip(users, errors)
+            ]
+        }
+    except Exception as e:
+        logger.error(f"Error locking users: {str(e)}")
+        return wallet_error('UnknownError', 'An unknown error occurred.')
+
+def set_lock_status(userId: str, isLocked: str) -> None:
+    """
+    Set the isLocked attribute of a user in Cognito for lockUsers.
+    
+    Args:
+        userId: ID of the user
+        isLocked: Lock status to set
+        
+    Raises:
+        ClientError: If Cognito rejects the update after its retries
+    """
+    bulk_cognito.admin_update_user_attributes(
+        UserPoolId=getenv('USER_POOL_ID'),
+        Username=userId,
+        UserAttributes=[
+            {
+                'Name': 'custom:isLocked',
+                'Value': isLocked
+            }
+        ]
+    )
+
 def send_event(userResponse):
     """
     Send a user event to EventBridge.
@@ -98,15 +174,12 @@ def send_event(userResponse):
         userResponse: User data to include in the event
         
     Returns:
-        dict: EventBridge put_events response or None if error occurs
+        dict: Index to error code, empty if the event was published
     """
-    try:
-        data = form_event(userResponse)
-        response = events.put_events(Entries=[data])
-        return response
-    except Exception as e:
-        logger.error(f"Error sending event: {str(e)}")
-        return None
+    errors = publisher.publish([form_event(userResponse)])
+    if errors:
+        logger.error(f"Error sending event: {errors[0]}")
+    return errors
 
 def _try_get_user(userId: str):
     """
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def update_all(update, users: list, max_workers: int = 8) -> list:
+    """
+    Update the lock status of many users with bounded concurrency.
+
+    At most max_workers updates are in flight at once. Throttling is left to
+    the client passed in through update, which is expected to back off and
+    retry on its own; an update that still fails is reported for its user
+    and does not stop the others.
+
+    Args:
+        update: Function of (userId, isLocked) that updates one user
+        users: Inputs with userId and isLocked
+        max_workers: Maximum number of concurrent updates
+
+    Returns:
+        Error of each user in input order, None for users that were updated
+    """
+    def update_user(user: dict):
+        try:
+            update(user['userId'], user['isLocked'])
+            return None
+        except Exception as e:
+            return error_code(e)
+
+    if not users:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(users))) as executor:
+        return list(executor.map(update_user, users))
+
+
+def error_code(error: Exception) -> str:
+    """
+    Get the AWS error code of an exception, or its class name if it has none.
+
+    Args:
+        error: Exception raised by a client call
+
+    Returns:
+        Error code such as UserNotFoundException
+    """
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code') or type(error).__name__
+    return type(error).__name__
@@ -3,6 +3,7 @@ from decimal import Decimal
 from os import getenv
 import json
 import boto3
+from botocore.exceptions import ClientError
 from typing import TypedDict, NotRequired, Annotated, Any
 from dataclasses import dataclass, field
 
@@ -263,13 +264,15 @@ def create_wallet(input: CreateWalletInput) -> WalletResponse:
     Create a new wallet for a user.
     
     Creates a new wallet with zero balance for the specified user
-    and raises a WalletCreated event.
+    and raises a WalletCreated event. The wallet may already have been
+    created by the post confirmation trigger on sign-up, in which case it
+    is left as it is and returned.
     
     Args:
         input: User ID for whom to create the wallet
         
     Returns:
-        WalletResponse: New wallet information
+        WalletResponse: New or existing wallet information
         ErrorResponse: Error details if creation fails
     """
     try:
@@ -278,7 +281,12 @@ def create_wallet(input: CreateWalletInput) -> WalletResponse:
             'balance': Decimal(0),
         }
         
-        table.put_item(Item=item)
+        try:
+            table.put_item(Item=item, ConditionExpression='attribute_not_exists(userId)')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            item = _try_get_wallet(input['userId'])
         
         # Use event detail with proper typing
         event_detail: EventDetail = {'userId': input['userId']}
@@ -1,25 +1,23 @@
-import { Typography, Card, IconButton, Box, useTheme, useMediaQuery } from "@mui/material";
-import DeleteIcon from '@mui/icons-material/Delete';
-import { useSystemEvents, useClearHistory } from "../../hooks/useSystemEvents";
+import { Typography, Card, Box, useTheme, useMediaQuery } from "@mui/material";
+import { useSystemEventRates } from "../../hooks/useSystemEvents";
 import { DataGrid } from "@mui/x-data-grid";
 
-export const SystemEventsTable = () => {
-    const {data: systemEvents, isLoading: loadingSystemEvents } = useSystemEvents();
-    const { mutateAsync: clearHistory } = useClearHistory();
+export const SystemEventRatesTable = () => {
+    const { data: rates, isLoading: loadingRates } = useSystemEventRates();
     const theme = useTheme();
     const isMobile = useMediaQuery(theme.breakpoints.down('sm'));
     const isTablet = useMediaQuery(theme.breakpoints.down('md'));
-    
-    if(loadingSystemEvents) return <Typography>Loading...</Typography>
+
+    if(loadingRates) return <Typography>Loading...</Typography>
+
+    const rows = (rates ?? []).map(rate => ({
+        id: `${rate.source}.${rate.detailType}`,
+        ...rate,
+        // The live aggregate is fresher than the per-minute rate of the last query
+        perSecond: rate.livePerSecond ?? rate.perSecond,
+    }));
 
     const columns = [
-        {
-            field: 'id',
-            headerName: 'ID',
-            sortable: true,
-            flex: isMobile ? 0.5 : 0.1,
-            minWidth: 50,
-        },
         {
             field: 'source',
             headerName: 'Source',
@@ -27,7 +25,7 @@ export const SystemEventsTable = () => {
             flex: isMobile ? 0.8 : 0.4,
             minWidth: 80,
             renderCell: ({row}) => (
-                <Typography sx={{ 
+                <Typography sx={{
                     fontSize: isMobile ? 12 : 'inherit',
                     whiteSpace: 'normal',
                     lineHeight: 1.2
@@ -43,7 +41,7 @@ export const SystemEventsTable = () => {
             flex: isMobile ? 0.8 : 0.4,
             minWidth: 80,
             renderCell: ({row}) => (
-                <Typography sx={{ 
+                <Typography sx={{
                     fontSize: isMobile ? 12 : 'inherit',
                     whiteSpace: 'normal',
                     lineHeight: 1.2
@@ -53,50 +51,32 @@ export const SystemEventsTable = () => {
             )
         },
         {
-            field: 'detail',
-            headerName: 'Detail',
+            field: 'perSecond',
+            headerName: 'Per second',
+            type: 'number',
             sortable: true,
-            flex: 1.5,
-            minWidth: 120,
-            renderCell: ({row}) => (
-                <Box sx={{ width: '100%', overflow: 'hidden' }}>
-                    <Typography 
-                        sx={{ 
-                            fontSize: isMobile ? 12 : 'inherit',
-                            overflow: 'hidden',
-                            textOverflow: 'ellipsis',
-                            display: '-webkit-box',
-                            WebkitLineClamp: 3,
-                            WebkitBoxOrient: 'vertical',
-                            whiteSpace: 'normal',
-                            lineHeight: 1.2
-                        }}
-                    >
-                        {row.detail}
-                    </Typography>
-                </Box>
-            )
+            flex: 0.3,
+            minWidth: 70,
+            valueFormatter: (value) => value?.toFixed(2),
+        },
+        {
+            field: 'total',
+            headerName: 'Last 5 min',
+            type: 'number',
+            sortable: true,
+            flex: 0.3,
+            minWidth: 70,
         }
     ];
 
     return (
-        <Card sx={{ 
+        <Card sx={{
             maxWidth: '100%',
             overflow: 'hidden',
             padding: 1
         }}>
-            <Box sx={{ display: 'flex', justifyContent: 'flex-end', mb: 1 }}>
-                <IconButton 
-                    color="error"
-                    size="small"
-                    onClick={clearHistory}
-                >
-                    Clear
-                    <DeleteIcon />
-                </IconButton>
-            </Box>
-            <Box sx={{ 
-                width: '100%', 
+            <Box sx={{
+                width: '100%',
                 height: { xs: 400, sm: 500, md: 600 },
                 '& .MuiDataGrid-root': {
                     '& .MuiDataGrid-cell': {
@@ -114,7 +94,7 @@ export const SystemEventsTable = () => {
                 }
             }}>
                 <DataGrid
-                    rows={systemEvents}
+                    rows={rows}
                     rowHeight={isMobile ? 60 : 52}
                     columns={columns}
                     pageSizeOptions={isTablet ? [5, 10] : [10, 25]}
@@ -125,19 +105,13 @@ export const SystemEventsTable = () => {
                             },
                         },
                         sorting: {
-                            sortModel: [{field: 'id', sort: 'desc'}]
+                            sortModel: [{field: 'perSecond', sort: 'desc'}]
                         },
                     }}
-                    sx={{
-                        '& .MuiDataGrid-cell': {
-                            whiteSpace: 'normal !important',
-                            wordBreak: 'break-word'
-                        }
-                    }}
                 />
             </Box>
         </Card>
     )
 }
 
-export default SystemEventsTable;
+export default SystemEventRatesTable;
@@ -196,3 +196,22 @@ export const triggerUnsuspendMarketMutation = /* GraphQL */ `
   }
 `;
 
+export const lockUsers = /* GraphQL */ `
+  mutation LockUsers($input: LockUsersInput!) {
+    lockUsers(input: $input) {
+      ... on LockUserResultList {
+        __typename
+        items {
+          userId
+          isLocked
+          succeeded
+          error
+        }
+      }
+      ... on Error {
+        __typename
+        message
+      }
+    }
+  }
+`;
@@ -115,4 +115,46 @@ export const getPingInfo = /* GraphQL */ `
       }
     }
   }
-`;
\ No newline at end of file
+`;
+export const getSystemEvents = /* GraphQL */ `
+  query GetSystemEvents($source: String!, $from: Float!, $to: Float, $nextToken: String) {
+    getSystemEvents(source: $source, from: $from, to: $to, nextToken: $nextToken) {
+      ... on SystemEventList {
+        __typename
+        items {
+          systemEventId
+          source
+          detailType
+          detail
+          timestamp
+        }
+        nextToken
+      }
+      ... on Error {
+        __typename
+        message
+      }
+    }
+  }
+`;
+
+export const getSystemEventRates = /* GraphQL */ `
+  query GetSystemEventRates($minutes: Int) {
+    getSystemEventRates(minutes: $minutes) {
+      ... on SystemEventRateList {
+        __typename
+        items {
+          source
+          detailType
+          counts
+          total
+          perSecond
+        }
+      }
+      ... on Error {
+        __typename
+        message
+      }
+    }
+  }
+`;
@@ -37,6 +37,40 @@ export const updatedSystemEvents = /* GraphQL */ `
     }
   }
 `;
+export const addedSystemEvents = /* GraphQL */ `
+  subscription AddedSystemEvents {
+    addedSystemEvents {
+      ... on SystemEventList {
+        items {
+          source
+          detailType
+          detail
+        }
+      }
+      ... on Error {
+        message
+      }
+    }
+  }
+`;
+export const updatedSystemEventRates = /* GraphQL */ `
+  subscription UpdatedSystemEventRates {
+    updatedSystemEventRates {
+      ... on SystemEventRateList {
+        interval
+        items {
+          source
+          detailType
+          total
+          perSecond
+        }
+      }
+      ... on Error {
+        message
+      }
+    }
+  }
+`;
 export const updatedUserStatus = /* GraphQL */ `
   subscription UpdatedUserStatus {
     updatedUserStatus {
@@ -89,3 +123,27 @@ export const addEvent = /* GraphQL */ `
     }
   }
 `;
+
+export const addEvents = /* GraphQL */ `
+  subscription AddEvents {
+    addEvents {
+      ... on EventList {
+        items {
+          eventId
+          homeOdds
+          awayOdds
+          drawOdds
+          home
+          away
+          start
+          end
+          updatedAt
+          eventStatus
+        }
+      }
+      ... on Error {
+        message
+      }
+    }
+  }
+`;
@@ -132,9 +132,29 @@ export const useEvents = (config = {}) => {
       error: (error) => console.warn(error),
     });
 
+    // Subscribe to batches of new events
+    const addEventsSub = client.graphql({
+      query: subscriptions.addEvents
+    }).subscribe({
+      next: ({ data }) => {
+        queryClient.setQueryData({
+          queryKey: [CACHE_PATH],
+          updater: (oldData) => {
+            const newEvents = (data.addEvents.items ?? []).map(deserializer);
+            const newIds = new Set(newEvents.map(e => e.eventId));
+            const newItems = oldData.filter(e => !newIds.has(e.eventId));
+            newItems.push(...newEvents);
+            return newItems;
+          }
+        });
+      },
+      error: (error) => console.warn(error),
+    });
+
     return () => {
       updatedEventSub.unsubscribe();
       addEventSub.unsubscribe();
+      addEventsSub.unsubscribe();
     };
   }, [queryClient, deserializer]);
 
@@ -2,12 +2,62 @@ import { useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { generateClient } from 'aws-amplify/api';
 import * as subscriptions from "../graphql/subscriptions.js";
+import * as queries from "../graphql/queries.js";
 
 export const CACHE_PATH = "system-events";
+export const RATES_CACHE_PATH = "system-event-rates";
 const client = generateClient();
 
 let idCount = 0;
 
+// Sources the system events service records, and how far back to load them on mount
+const BACKFILL_SOURCES = [
+    "com.thirdparty",
+    "com.trading",
+    "com.livemarket",
+    "com.betting",
+    "com.betting.settlement",
+    "com.wallet",
+    "com.pam",
+];
+const BACKFILL_MINUTES = 5;
+const BACKFILL_MAX_PAGES = 5;
+
+// Stored events of one source since `from`, oldest first
+const fetchSourceEvents = async (source, from) => {
+    const items = [];
+    let nextToken = null;
+    for (let page = 0; page < BACKFILL_MAX_PAGES; page++) {
+        const { data } = await client.graphql({
+            query: queries.getSystemEvents,
+            variables: { source, from, nextToken }
+        });
+        const result = data.getSystemEvents;
+        if (result.__typename !== 'SystemEventList') {
+            console.warn(`Error loading ${source} system events: ${result.message}`);
+            break;
+        }
+        items.push(...result.items);
+        nextToken = result.nextToken;
+        if (!nextToken) break;
+    }
+    return items;
+}
+
+const fetchBackfill = async () => {
+    const from = Date.now() / 1000 - BACKFILL_MINUTES * 60;
+    const results = await Promise.allSettled(BACKFILL_SOURCES.map(source => fetchSourceEvents(source, from)));
+    return results
+        .flatMap(result => result.status === 'fulfilled' ? result.value : [])
+        .sort((a, b) => a.timestamp - b.timestamp)
+        .map(event => ({
+            ...event,
+            id: event.systemEventId,
+            // Stored as epoch seconds, rendered as epoch milliseconds
+            timestamp: event.timestamp * 1000,
+        }));
+}
+
 export const useClearHistory = () => {
     const queryClient = useQueryClient();
 
@@ -26,6 +76,20 @@ export const useSystemEvents = (config = {}) => {
     const queryClient = useQueryClient();
 
     useEffect(() => {
+        let cancelled = false;
+        // Events stored before the page opened go ahead of those received since
+        fetchBackfill().then(backfill => {
+            if (cancelled || backfill.length === 0) return;
+            queryClient.setQueryData(
+                [CACHE_PATH],
+                (oldData = []) => {
+                    const received = oldData.filter(event => !event.id.startsWith('init-'));
+                    const known = new Set(received.map(event => event.id));
+                    return [...backfill.filter(event => !known.has(event.id)), ...received];
+                }
+            );
+        });
+
         const sub = client.graphql({
             query: subscriptions.updatedSystemEvents
         }).subscribe({
@@ -47,8 +111,29 @@ export const useSystemEvents = (config = {}) => {
             error: (error) => { console.warn(error); }
         });
 
+        // Events recorded in batches arrive together
+        const batchSub = client.graphql({
+            query: subscriptions.addedSystemEvents
+        }).subscribe({
+            next: ({ data }) => {
+                queryClient.setQueryData(
+                    [CACHE_PATH],
+                    (oldData = []) => {
+                        const newEvents = (data.addedSystemEvents.items ?? []).map(event => ({
+                            id: `${Date.now()}-${idCount++}`,
+                            ...event
+                        }));
+                        return [...oldData, ...newEvents];
+                    }
+                );
+            },
+            error: (error) => { console.warn(error); }
+        });
+
         return () => {
+            cancelled = true;
             sub.unsubscribe();
+            batchSub.unsubscribe();
         };
     }, [queryClient]);
 
@@ -73,8 +158,60 @@ export const useSystemEvents = (config = {}) => {
     });
 }
 
+// Per-minute counts per source and detail type, with the latest per-second
+// aggregate pushed by the receivers merged in as it arrives
+export const useSystemEventRates = (config = {}) => {
+    const queryClient = useQueryClient();
+
+    useEffect(() => {
+        const sub = client.graphql({
+            query: subscriptions.updatedSystemEventRates
+        }).subscribe({
+            next: ({ data }) => {
+                const live = data.updatedSystemEventRates.items ?? [];
+                queryClient.setQueryData(
+                    [RATES_CACHE_PATH],
+                    (oldData = []) => {
+                        const rows = oldData.map(row => ({ ...row }));
+                        live.forEach(item => {
+                            let row = rows.find(r => r.source === item.source && r.detailType === item.detailType);
+                            if (row == undefined) {
+                                row = { source: item.source, detailType: item.detailType, counts: [], total: 0 };
+                                rows.push(row);
+                            }
+                            // Each push carries the counts since the previous one
+                            row.total += item.total;
+                            row.livePerSecond = item.perSecond;
+                        });
+                        return rows;
+                    }
+                );
+            },
+            error: (error) => { console.warn(error); }
+        });
+
+        return () => {
+            sub.unsubscribe();
+        };
+    }, [queryClient]);
+
+    return useQuery({
+        queryKey: [RATES_CACHE_PATH],
+        queryFn: async () => {
+            const { data } = await client.graphql({
+                query: queries.getSystemEventRates,
+                variables: { minutes: 5 }
+            });
+            return data.getSystemEventRates.items ?? [];
+        },
+        refetchInterval: 60000,
+        ...config,
+    });
+}
+
 const hooks = {
     useSystemEvents,
+    useSystemEventRates,
     useClearHistory,
 };
 
@@ -12,7 +12,7 @@ import {
 
 import ExpandMoreIcon from '@mui/icons-material/ExpandMore';
 import EventOdds from "../components/admin/EventOdds";
-import SystemEventsTable from "../components/admin/SystemEventsTable";
+import SystemEventRatesTable from "../components/admin/SystemEventRatesTable";
 
 export default function Admin() {
   const [expanded, setExpanded] = React.useState(false);
@@ -109,12 +109,12 @@ export default function Admin() {
                 padding: 2
               }}
             >
-              View ongoing system events across sportsbook
+              View event rates across sportsbook
             </Typography>
           )}
         </AccordionSummary>
         <AccordionDetails sx={{ overflow: 'hidden', padding: isMobile ? '8px 4px' : undefined }}>
-          <SystemEventsTable />
+          <SystemEventRatesTable />
         </AccordionDetails>
       </Accordion>
     </Box>
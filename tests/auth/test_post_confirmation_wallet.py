@@ -0,0 +1,82 @@
+import sys
+import os
+import pytest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+# Add the lambda directory to the path so we can import the post confirmation function
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/auth'))
+
+
+class LambdaContext:
+    function_name = 'post-confirmation'
+    memory_limit_in_mb = 256
+    invoked_function_arn = 'arn:aws:lambda:us-east-1:123456789012:function:post-confirmation'
+    aws_request_id = 'request-id'
+
+
+def confirmation_event(trigger_source='PostConfirmation_ConfirmSignUp'):
+    """Build a Cognito post confirmation event."""
+    return {
+        'version': '1',
+        'region': 'us-east-1',
+        'userPoolId': 'us-east-1_example',
+        'userName': 'new-user-id',
+        'triggerSource': trigger_source,
+        'request': {'userAttributes': {'sub': 'new-user-id'}},
+        'response': {}
+    }
+
+
+class TestPostConfirmationWallet:
+    """Test suite for wallet creation on sign-up."""
+
+    @pytest.fixture(autouse=True)
+    def setup_auth_app(self, wallet_table):
+        """Setup the post confirmation function over a mocked wallet table."""
+        with patch.dict(os.environ, {'EVENT_BUS': 'test-event-bus', 'WALLET_TABLE': 'test-wallet-table'}):
+            import postConfirmation
+
+            with patch.object(postConfirmation, 'wallet_table', wallet_table), \
+                 patch.object(postConfirmation, 'events') as mock_events:
+                self.auth_app = postConfirmation
+                self.mock_events = mock_events
+                self.wallet_table = wallet_table
+                yield
+
+    def test_wallet_created_on_sign_up(self):
+        """Test a new user gets an empty wallet and the UserSignedUp event is still sent."""
+        event = confirmation_event()
+
+        assert self.auth_app.lambda_handler(event, LambdaContext()) == event
+
+        item = self.wallet_table.get_item(Key={'userId': 'new-user-id'})['Item']
+        assert item['balance'] == Decimal('0')
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        assert entries[0]['DetailType'] == 'UserSignedUp'
+
+    def test_existing_wallet_is_kept(self):
+        """Test a wallet that already exists is not overwritten."""
+        self.wallet_table.put_item(Item={'userId': 'new-user-id', 'balance': Decimal('25.00')})
+
+        assert self.auth_app.create_wallet('new-user-id') is False
+
+        item = self.wallet_table.get_item(Key={'userId': 'new-user-id'})['Item']
+        assert item['balance'] == Decimal('25.00')
+
+    def test_no_wallet_on_password_reset(self):
+        """Test confirming a forgotten password does not touch wallets."""
+        self.auth_app.lambda_handler(confirmation_event('PostConfirmation_ConfirmForgotPassword'), LambdaContext())
+
+        assert 'Item' not in self.wallet_table.get_item(Key={'userId': 'new-user-id'})
+
+    def test_wallet_failure_does_not_fail_sign_up(self):
+        """Test sign-up completes and sends its event when the wallet cannot be written."""
+        failing_table = MagicMock()
+        failing_table.put_item.side_effect = Exception('Unavailable')
+        event = confirmation_event()
+
+        with patch.object(self.auth_app, 'wallet_table', failing_table):
+            assert self.auth_app.lambda_handler(event, LambdaContext()) == event
+
+        self.mock_events.put_events.assert_called_once()
@@ -0,0 +1,138 @@
+"""
+Import time benchmark for every Lambda function.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_cold_start.py [--runs N] [--save FILE] [--baseline FILE]
+        [--function PATH] [--invoke NAME]
+
+Each function is imported several times, each time in a fresh interpreter
+as a new Lambda container would, with the shared layer on the path, and the
+median import time is reported. With --save the results are written as
+JSON; with --baseline they are compared against a saved run and functions
+that got more than 20% and 10 ms slower are flagged, and the exit status is
+non-zero if any were. Functions whose dependencies are not installed are
+reported as such.
+
+--function limits the run to the functions under a path such as
+thirdparty/pinginfo. --invoke also times the first call of a function of
+the handler module, such as get_pinginfo, made without arguments right
+after the import. AWS API calls are answered locally with empty responses,
+so it measures client construction and the function's own work rather than
+the network. It is saved and compared as <function>:<name>.
+"""
+import sys
+import os
+import argparse
+import glob
+import json
+import statistics
+import subprocess
+
+LAMBDA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../infrastructure/lambda'))
+LAYER_DIR = os.path.join(LAMBDA_DIR, 'gql')
+ENVIRONMENT = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'REGION': 'us-east-1',
+    'DB_TABLE': 'bench-table',
+    'DB_HISTORY_TABLE': 'bench-history-table',
+    'DB_HISTORY_RETENTION': '86400',
+    'EVENT_BUS': 'bench-event-bus',
+    'APPSYNC_URL': 'https://bench.appsync-api.us-east-1.amazonaws.com/graphql',
+    'POWERTOOLS_TRACE_DISABLED': 'true',
+    'POWERTOOLS_LOG_LEVEL': 'WARNING'
+}
+# A function is flagged when it is both this much and this many milliseconds slower
+REGRESSION_RATIO = 1.2
+REGRESSION_MS = 10.0
+
+CHILD = """
+import sys, time
+sys.path[:0] = [{directory!r}, {layer!r}]
+started = time.perf_counter()
+import {module}
+print((time.perf_counter() - started) * 1000)
+"""
+INVOKE = """
+from botocore.client import BaseClient
+BaseClient._make_api_call = lambda self, operation, params: {{}}
+started = time.perf_counter()
+{module}.{invoke}()
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def functions() -> dict:
+    """Find the handler module of every function, keyed by its path under infrastructure/lambda."""
+    found = {}
+    for path in sorted(glob.glob(os.path.join(LAMBDA_DIR, '**', '*.py'), recursive=True)):
+        if '__pycache__' in path or os.path.dirname(path) == LAYER_DIR:
+            continue
+        with open(path) as source:
+            if 'def lambda_handler' not in source.read():
+                continue
+        name = os.path.relpath(path, LAMBDA_DIR)[:-len('.py')]
+        found[name] = (os.path.dirname(path), os.path.basename(path)[:-len('.py')])
+    return found
+
+
+def cold_start(directory: str, module: str, invoke: str | None = None) -> list:
+    """Import a handler module in a new interpreter, and optionally call a function of it, in milliseconds."""
+    code = CHILD.format(directory=directory, layer=LAYER_DIR, module=module)
+    if invoke:
+        code += INVOKE.format(module=module, invoke=invoke)
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        env={**os.environ, **ENVIRONMENT}, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    return [float(line) for line in result.stdout.strip().splitlines()[-(2 if invoke else 1):]]
+
+
+def main(runs: int, save: str | None, baseline: str | None, function: str | None = None,
+         invoke: str | None = None) -> int:
+    previous = {}
+    if baseline:
+        with open(baseline) as file:
+            previous = json.load(file)
+
+    results = {}
+    regressions = 0
+    print(f"{'function':<45} {'ms':>10} {'baseline':>10}")
+    for name, (directory, module) in functions().items():
+        if function and not name.startswith(function):
+            continue
+        try:
+            samples = [cold_start(directory, module, invoke) for _ in range(runs)]
+        except ImportError as e:
+            print(f"{name:<45} {'skipped':>10}  {e}")
+            continue
+        keys = [name, f'{name}:{invoke}'] if invoke else [name]
+        for position, key in enumerate(keys):
+            median = statistics.median(sample[position] for sample in samples)
+            results[key] = round(median, 1)
+            before = previous.get(key)
+            flag = ''
+            if before is not None and median > before * REGRESSION_RATIO and median - before > REGRESSION_MS:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{key:<45} {median:>10.1f} {before if before is not None else '':>10}{flag}")
+
+    if save:
+        with open(save, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import time of every Lambda function')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per function')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against results saved with --save')
+    parser.add_argument('--function', help='only the functions under this path, such as thirdparty/pinginfo')
+    parser.add_argument('--invoke', help='also time the first call of this function of the handler module')
+    arguments = parser.parse_args()
+    sys.exit(main(arguments.runs, arguments.save, arguments.baseline, arguments.function, arguments.invoke))
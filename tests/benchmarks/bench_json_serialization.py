@@ -0,0 +1,114 @@
+"""
+Serialization benchmark for event payloads.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_json_serialization.py [bets ...]
+
+Compares the shared serializer of the layer with the standard library on the
+payloads functions actually send: SettlementStarted details carrying a
+BetList of DynamoDB items, LiveMarket Event details and the SQS bodies the
+receivers parse. Reports microseconds per payload for each.
+"""
+import sys
+import os
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+import json_utils
+
+REPEATS = 20
+LOOPS = 200
+
+
+def make_bet_list(count: int) -> dict:
+    """Build a SettlementStarted detail with a BetList of DynamoDB bet items."""
+    return {
+        'eventId': str(uuid.uuid4()),
+        'bets': [
+            {
+                'betId': str(uuid.uuid4()),
+                'userId': str(uuid.uuid4()),
+                'eventId': str(uuid.uuid4()),
+                'odds': Decimal('2.35'),
+                'amount': Decimal(f'{10 + i}.50'),
+                'outcome': 'homeWin',
+                'betStatus': 'Locked',
+                'placedAt': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc).isoformat(),
+                'result': {
+                    'executionArn': f'arn:aws:states:us-east-1:123456789012:execution:settlement:{i}',
+                    'startDate': datetime(2024, 5, 1, 12, 31, tzinfo=timezone.utc)
+                }
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def make_event() -> dict:
+    """Build a LiveMarket Event detail."""
+    return {
+        'eventId': str(uuid.uuid4()),
+        'home': 'Home Team',
+        'away': 'Away Team',
+        'homeOdds': '2.10',
+        'awayOdds': '3.40',
+        'drawOdds': '3.25',
+        'eventStatus': 'Running',
+        'marketStatus': 'Active',
+        'start': '2024-05-01T12:00:00Z',
+        'end': '2024-05-01T14:00:00Z',
+        'updatedAt': '2024-05-01T12:45:00Z',
+        'duration': 90
+    }
+
+
+def make_sqs_body(detail: dict) -> str:
+    """Wrap a detail as EventBridge delivers it to an SQS queue."""
+    return json.dumps({
+        'version': '0',
+        'id': str(uuid.uuid4()),
+        'detail-type': 'UpdatedOdds',
+        'source': 'com.trading',
+        'account': '123456789012',
+        'time': '2024-05-01T12:45:00Z',
+        'region': 'us-east-1',
+        'resources': [],
+        'detail': detail
+    }, default=str)
+
+
+def best_of(fn, repeats: int = REPEATS, loops: int = LOOPS) -> float:
+    """Best time of several runs, in microseconds per call."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / loops * 1e6
+
+
+def main(sizes):
+    cases = [(f'BetList detail, {size} bets', make_bet_list(size)) for size in sizes]
+    cases.append(('Event detail', make_event()))
+
+    print(f"{'payload':<28} {'operation':<7} {'json us':>10} {'json_utils us':>14} {'speedup':>8}")
+    for name, payload in cases:
+        before = best_of(lambda: json.dumps(payload, default=str))
+        after = best_of(lambda: json_utils.dumps(payload))
+        print(f"{name:<28} {'dumps':<7} {before:>10.1f} {after:>14.1f} {before / after:>7.1f}x")
+
+        body = make_sqs_body(payload)
+        before = best_of(lambda: json.loads(body))
+        after = best_of(lambda: json_utils.loads(body))
+        print(f"{name:<28} {'loads':<7} {before:>10.1f} {after:>14.1f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100])
@@ -0,0 +1,58 @@
+"""
+Throughput benchmark for the trading pricing engine.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_trading_pricing.py [markets ...]
+
+Reports how many markets per second the engine prices, both for the array
+stage alone and for the full path from update dicts to priced updates.
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/trading/receiver'))
+
+from pricing import PricingEngine
+
+REPEATS = 20
+
+
+def make_updates(count: int, rng) -> list:
+    """Build random provider odds updates."""
+    odds = rng.uniform(1.2, 12.0, size=(count, 3))
+    return [
+        {'eventId': str(i), 'homeOdds': str(h), 'awayOdds': str(a), 'drawOdds': str(d)}
+        for i, (h, a, d) in enumerate(odds.tolist())
+    ]
+
+
+def best_of(fn, repeats: int = REPEATS) -> float:
+    """Best wall clock time of several runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sizes):
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    engine = PricingEngine()
+    print(f"engine setup (ladder and lookup table): {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"{'markets':>8} {'array markets/s':>16} {'updates markets/s':>18}")
+    for size in sizes:
+        updates = make_updates(size, rng)
+        odds = rng.uniform(1.2, 12.0, size=(size, 3))
+        array_time = best_of(lambda: engine.price(odds))
+        updates_time = best_of(lambda: engine.price_updates(updates))
+        print(f"{size:>8} {size / array_time:>16,.0f} {size / updates_time:>18,.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 10000])
@@ -0,0 +1,79 @@
+import sys
+import os
+import pytest
+
+# Add the lambda directories to the path so we can import the lock modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/betting/resolvers'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/betting/receiver'))
+
+from locks import UserLockCache
+from projection import UserLockProjection, parse_locked
+
+
+def user_locked(user_id, is_locked, time='2025-04-01T15:00:00Z'):
+    """Build a com.pam userLocked event as delivered by EventBridge."""
+    return {
+        'source': 'com.pam',
+        'detail-type': 'userLocked',
+        'time': time,
+        'detail': {'__typename': 'User', 'userId': user_id, 'isLocked': is_locked}
+    }
+
+
+class TestUserLocks:
+    """Test suite for the user lock projection and the lock status cache."""
+
+    @pytest.fixture(autouse=True)
+    def setup_locks(self, dynamodb_resource):
+        """Setup the projection and cache over a mocked user locks table."""
+        self.table = dynamodb_resource.create_table(
+            TableName='test-user-locks-table',
+            KeySchema=[{'AttributeName': 'userId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'userId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        self.now = 0.0
+        self.projection = UserLockProjection(self.table)
+        self.cache = UserLockCache(self.table, max_users=2, ttl=30, clock=lambda: self.now)
+        yield
+
+    def test_parse_locked(self):
+        """Test the isLocked flag is read from strings and booleans."""
+        assert parse_locked('true') is True
+        assert parse_locked(True) is True
+        assert parse_locked('false') is False
+        assert parse_locked(None) is False
+
+    def test_unknown_user_is_not_locked(self):
+        """Test a user with no projection item is not locked."""
+        assert self.cache.is_locked('user-1') is False
+
+    def test_locked_user(self):
+        """Test a projected lock is seen by the cache."""
+        self.projection.apply(user_locked('user-1', 'true'))
+
+        assert self.cache.is_locked('user-1') is True
+
+    def test_out_of_order_event_is_ignored(self):
+        """Test an event older than the projected one does not overwrite it."""
+        assert self.projection.apply(user_locked('user-1', 'true', '2025-04-01T15:00:05Z'))
+        assert not self.projection.apply(user_locked('user-1', 'false', '2025-04-01T15:00:00Z'))
+
+        assert self.table.get_item(Key={'userId': 'user-1'})['Item']['isLocked'] is True
+
+    def test_status_is_cached_until_ttl(self):
+        """Test the cache answers from memory until its entry expires."""
+        self.cache.is_locked('user-1')
+        self.projection.apply(user_locked('user-1', 'true'))
+
+        self.now = 29
+        assert self.cache.is_locked('user-1') is False
+        self.now = 30
+        assert self.cache.is_locked('user-1') is True
+
+    def test_least_recently_used_user_is_evicted(self):
+        """Test the cache holds at most max_users users."""
+        for user_id in ('user-1', 'user-2', 'user-1', 'user-3'):
+            self.cache.is_locked(user_id)
+
+        assert list(self.cache._users) == ['user-1', 'user-3']
@@ -0,0 +1 @@
+# This file makes the tests/gql directory a Python package
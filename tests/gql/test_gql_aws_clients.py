@@ -0,0 +1,66 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+# Add the layer directory to the path so we can import the shared clients module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+import aws_clients
+
+
+class TestAwsClients:
+    """Test suite for the shared lazy AWS clients."""
+
+    @pytest.fixture(autouse=True)
+    def setup_session(self, aws_credentials):
+        """Setup the registry over a mocked session."""
+        self.session = MagicMock()
+        self.session.client.side_effect = lambda service_name, **kwargs: MagicMock(name=service_name)
+        with patch.object(aws_clients, 'session', self.session), \
+             patch.object(aws_clients, '_clients', {}):
+            yield
+
+    def test_nothing_is_created_at_import(self):
+        """Test a lazy client creates nothing until it is used."""
+        aws_clients.client('events')
+
+        assert self.session.client.call_count == 0
+
+    def test_client_is_created_on_first_use(self):
+        """Test the client is created once and then delegated to."""
+        events = aws_clients.client('events')
+
+        events.put_events(Entries=[])
+        events.put_events(Entries=[])
+
+        self.session.client.assert_called_once_with('events')
+        assert events._target.put_events.call_count == 2
+
+    def test_clients_are_shared(self):
+        """Test lazy clients of the same service share one client."""
+        first = aws_clients.client('events')
+        second = aws_clients.client('events')
+        first.meta
+        second.meta
+
+        assert first._target is second._target
+        assert self.session.client.call_count == 1
+
+    def test_clients_differ_by_arguments(self):
+        """Test clients created with different arguments are kept apart."""
+        east = aws_clients.get('client', 'ec2', region_name='us-east-1')
+        west = aws_clients.get('client', 'ec2', region_name='us-west-2')
+
+        assert east is not west
+        assert aws_clients.get('client', 'ec2', region_name='us-east-1') is east
+
+    def test_table_is_created_on_first_use(self):
+        """Test a lazy table comes from the shared DynamoDB resource."""
+        table = aws_clients.table('test-table')
+        assert self.session.resource.call_count == 0
+
+        table.get_item(Key={'userId': 'user-1'})
+
+        self.session.resource.assert_called_once_with('dynamodb')
+        self.session.resource.return_value.Table.assert_called_once_with('test-table')
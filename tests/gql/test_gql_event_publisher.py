@@ -0,0 +1,172 @@
+import sys
+import os
+import json
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+# Add the layer directory to the path so we can import the shared publisher module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+from event_publisher import EventPublisher, chunk_entries, MAX_PUT_SIZE_BYTES
+
+
+def entry(number, detail_size=10):
+    """Build an EventBridge entry with a detail of roughly the given size."""
+    return {
+        'Source': 'com.test',
+        'DetailType': 'TestEvent',
+        'Detail': json.dumps({'number': number, 'padding': 'x' * detail_size}),
+        'EventBusName': 'test-event-bus'
+    }
+
+
+def accept_all(Entries):
+    """PutEvents response accepting every entry."""
+    return {'FailedEntryCount': 0, 'Entries': [{'EventId': str(i)} for i in range(len(Entries))]}
+
+
+class TestEventPublisher:
+    """Test suite for the shared EventBridge publisher."""
+
+    @pytest.fixture(autouse=True)
+    def setup_publisher(self):
+        """Setup a publisher over a mocked EventBridge client that never sleeps."""
+        self.client = MagicMock()
+        self.client.put_events.side_effect = accept_all
+        self.sleeps = []
+        self.publisher = EventPublisher(self.client, sleep=self.sleeps.append)
+
+    def test_entries_are_sent_in_chunks_of_ten(self):
+        """Test 25 entries take three requests and all are published."""
+        errors = self.publisher.publish([entry(i) for i in range(25)])
+
+        assert errors == {}
+        sizes = sorted(len(call.kwargs['Entries']) for call in self.client.put_events.call_args_list)
+        assert sizes == [5, 10, 10]
+
+    def test_chunks_respect_the_size_limit(self):
+        """Test large entries are split before a request would exceed 256KB."""
+        entries = list(enumerate(entry(i, detail_size=100 * 1024) for i in range(5)))
+
+        chunks = list(chunk_entries(entries))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [index for chunk in chunks for index, _ in chunk] == [0, 1, 2, 3, 4]
+
+    def test_oversized_entry_is_sent_alone(self):
+        """Test an entry over the limit still gets a request so EventBridge reports it."""
+        entries = list(enumerate([entry(0), entry(1, detail_size=MAX_PUT_SIZE_BYTES), entry(2)]))
+
+        assert [len(chunk) for chunk in chunk_entries(entries)] == [1, 1, 1]
+
+    def test_only_failed_entries_are_retried(self):
+        """Test a partial failure resends just the rejected entries."""
+        self.client.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{'EventId': '0'}, {'ErrorCode': 'ThrottlingException'}, {'EventId': '2'}]},
+            {'FailedEntryCount': 0, 'Entries': [{'EventId': '1'}]}
+        ]
+        entries = [entry(i) for i in range(3)]
+
+        errors = self.publisher.publish(entries)
+
+        assert errors == {}
+        retry = self.client.put_events.call_args_list[1].kwargs['Entries']
+        assert retry == [entries[1]]
+        assert len(self.sleeps) == 1
+
+    def test_failures_are_reported_after_max_attempts(self):
+        """Test entries rejected on every attempt are returned by their index."""
+        self.client.put_events.side_effect = lambda Entries: {
+            'FailedEntryCount': len(Entries),
+            'Entries': [{'ErrorCode': 'InternalFailure'} for _ in Entries]
+        }
+
+        errors = self.publisher.publish([entry(0)])
+
+        assert errors == {0: 'InternalFailure'}
+        assert self.client.put_events.call_count == 3
+
+    def test_request_errors_are_retried(self):
+        """Test a request that raises is retried as a whole."""
+        self.client.put_events.side_effect = [Exception('Timeout'), {'FailedEntryCount': 0, 'Entries': [{}]}]
+
+        assert self.publisher.publish([entry(0)]) == {}
+        assert self.client.put_events.call_count == 2
+
+    def test_backoff_is_bounded(self):
+        """Test every retry waits no longer than the maximum delay."""
+        publisher = EventPublisher(self.client, max_attempts=6, base_delay=0.5, max_delay=1.0, sleep=self.sleeps.append)
+        self.client.put_events.side_effect = lambda Entries: {
+            'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]
+        }
+
+        publisher.publish([entry(0)])
+
+        assert len(self.sleeps) == 5
+        assert all(0 <= delay <= 1.0 for delay in self.sleeps)
+
+    def test_chunks_are_sent_concurrently(self):
+        """Test several chunks are in flight at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def put_events(Entries):
+            barrier.wait()
+            return accept_all(Entries)
+
+        self.client.put_events.side_effect = put_events
+
+        assert self.publisher.publish([entry(i) for i in range(20)]) == {}
+
+    def test_publish_indexed_streams_a_generator(self):
+        """Test entries are pulled from a generator as chunks are sent, keyed by the caller's keys."""
+        pulled = []
+
+        def entries():
+            for i in range(35):
+                pulled.append(i)
+                yield (f'key-{i}', entry(i))
+
+        def put_events(Entries):
+            # Entries are pulled at most two chunks and one entry ahead of the chunk being sent
+            number = json.loads(Entries[0]['Detail'])['number']
+            assert len(pulled) <= number + 21
+            if number == 30:
+                return {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}] + [{}] * (len(Entries) - 1)}
+            return accept_all(Entries)
+
+        self.client.put_events.side_effect = put_events
+        publisher = EventPublisher(self.client, max_workers=1, max_attempts=1)
+
+        errors = publisher.publish_indexed(entries())
+
+        assert errors == {'key-30': 'InternalFailure'}
+        assert self.client.put_events.call_count == 4
+
+    def test_add_and_flush(self):
+        """Test entries added one at a time are sent together and the buffer is emptied."""
+        indexes = [self.publisher.add(entry(i)) for i in range(3)]
+
+        assert indexes == [0, 1, 2]
+        assert self.publisher.flush() == {}
+        assert self.client.put_events.call_count == 1
+        assert self.publisher.flush() == {}
+        assert self.client.put_events.call_count == 1
+
+    def test_flush_emits_metrics(self, capsys):
+        """Test each flush writes its counts in embedded metric format."""
+        self.client.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{}, {'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 0, 'Entries': [{}]}
+        ]
+
+        self.publisher.publish([entry(0), entry(1)])
+
+        metrics = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert metrics['PublishedEvents'] == [2.0]
+        assert metrics['FailedEvents'] == [0.0]
+        assert metrics['RetriedEvents'] == [1.0]
+        assert metrics['PutEventsRequests'] == [2.0]
+        assert 'PublishLatency' in metrics
+        names = [metric['Name'] for metric in metrics['_aws']['CloudWatchMetrics'][0]['Metrics']]
+        assert 'PublishLatency' in names
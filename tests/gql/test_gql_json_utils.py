@@ -0,0 +1,61 @@
+import sys
+import os
+import json
+import pytest
+from datetime import datetime, date, timezone
+from decimal import Decimal
+
+# Add the layer directory to the path so we can import the shared serializer
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+import json_utils
+
+
+class TestJsonUtils:
+    """Test suite for the shared JSON serializer."""
+
+    def test_dumps_matches_standard_library(self):
+        """Test plain payloads serialize to the same document as json.dumps."""
+        value = {'eventId': 'e1', 'odds': 2.5, 'count': 3, 'open': True, 'tags': ['a', 'b'], 'none': None}
+
+        assert json.loads(json_utils.dumps(value)) == json.loads(json.dumps(value))
+        assert isinstance(json_utils.dumps(value), str)
+
+    def test_decimals_are_written_as_strings(self):
+        """Test Decimals from DynamoDB keep the format default=str gave them."""
+        bet = {'amount': Decimal('10.50'), 'odds': Decimal('2.1'), 'whole': Decimal('5')}
+
+        assert json.loads(json_utils.dumps(bet)) == {'amount': '10.50', 'odds': '2.1', 'whole': '5'}
+
+    def test_datetimes_are_iso_8601(self):
+        """Test datetimes and dates are written in ISO 8601."""
+        started = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+
+        result = json.loads(json_utils.dumps({'startDate': started, 'day': date(2024, 5, 1)}))
+
+        assert result == {'startDate': started.isoformat(), 'day': '2024-05-01'}
+
+    def test_sets_are_written_as_lists(self):
+        """Test DynamoDB string sets serialize as sorted lists."""
+        assert json.loads(json_utils.dumps({'ids': {'b', 'a'}})) == {'ids': ['a', 'b']}
+
+    def test_non_string_keys(self):
+        """Test integer keys are written as strings, as json.dumps does."""
+        assert json.loads(json_utils.dumps({1: 'a'})) == {'1': 'a'}
+
+    def test_unknown_types_are_rejected(self):
+        """Test a type with no defined representation raises rather than being stringified."""
+        with pytest.raises(TypeError):
+            json_utils.dumps({'value': object()})
+
+    def test_loads_round_trip(self):
+        """Test SQS bodies written by dumps parse back, from str or bytes."""
+        body = json_utils.dumps({'source': 'com.trading', 'detail': {'eventId': 'e1', 'homeOdds': 1.5}})
+
+        assert json_utils.loads(body) == json_utils.loads(body.encode('utf-8'))
+        assert json_utils.loads(body)['detail']['homeOdds'] == 1.5
+
+    def test_invalid_documents_raise_value_error(self):
+        """Test invalid bodies raise ValueError like json.loads."""
+        with pytest.raises(ValueError):
+            json_utils.loads('not json')
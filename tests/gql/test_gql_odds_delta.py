@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Add the layer directory to the path so we can import the shared odds delta cache
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+from odds_delta import OddsDeltaCache
+
+
+def odds(event_id, home='2.0', away='3.0', draw='4.0'):
+    """Build an odds update."""
+    return {'eventId': event_id, 'homeOdds': home, 'awayOdds': away, 'drawOdds': draw}
+
+
+class TestOddsDeltaCache:
+    """Test suite for the shared odds delta cache."""
+
+    def test_drops_unchanged_odds(self):
+        """Test only updates that move the odds are returned."""
+        cache = OddsDeltaCache()
+
+        assert cache.changed([odds('a'), odds('b')]) == [odds('a'), odds('b')]
+        assert cache.changed([odds('a'), odds('b', home='1.8')]) == [odds('b', home='1.8')]
+
+    def test_forget_and_eviction(self):
+        """Test forgotten and evicted events are published again."""
+        cache = OddsDeltaCache(max_events=2)
+        cache.changed([odds('a'), odds('b'), odds('c')])
+        cache.forget(['c'])
+
+        assert cache.changed([odds('a'), odds('b'), odds('c')]) == [odds('a'), odds('c')]
+
+    def test_republishes_after_max_age(self):
+        """Test unchanged odds are published again once older than max_age."""
+        now = [0.0]
+        cache = OddsDeltaCache(max_age=60, clock=lambda: now[0])
+        cache.changed([odds('a')])
+
+        now[0] = 30.0
+        assert cache.changed([odds('a')]) == []
+        now[0] = 61.0
+        assert cache.changed([odds('a')]) == [odds('a')]
@@ -0,0 +1,36 @@
+import sys
+import os
+import pytest
+from decimal import Decimal
+
+# Add the layer directory to the path so we can import the shared time module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+from time_utils import epoch_from_iso
+
+
+class TestTimeUtils:
+    """Test suite for the shared date time conversions."""
+
+    @pytest.mark.parametrize('value', [
+        '2024-05-01T11:00:00Z',
+        '2024-05-01T11:00:00+00:00',
+        '2024-05-01T13:00:00+02:00',
+        '2024-05-01T06:00:00-05:00'
+    ])
+    def test_suffixed_date_times(self, value):
+        """Test Z and offset suffixes convert to the same instant."""
+        assert epoch_from_iso(value) == Decimal('1714561200.0')
+
+    def test_naive_date_times_are_utc(self):
+        """Test a date time without a suffix is read as UTC rather than the local time zone."""
+        assert epoch_from_iso('2024-05-01T11:00:00') == Decimal('1714561200.0')
+
+    def test_fractional_seconds(self):
+        """Test AWSDateTime fractions are kept."""
+        assert epoch_from_iso('2024-05-01T11:00:00.250Z') == Decimal('1714561200.25')
+
+    def test_invalid_date_times_raise_value_error(self):
+        """Test a value that is not a date time raises ValueError."""
+        with pytest.raises(ValueError):
+            epoch_from_iso('not a date')
@@ -103,6 +103,10 @@ def record_handler(record):
         if item['source'] == 'com.trading':
             if item['detail-type'] == 'UpdatedOdds':
                 return handle_updated_odds(item)
+            elif item['detail-type'] == 'MarketSuspended':
+                return handle_market_suspended(item)
+            elif item['detail-type'] == 'MarketUnsuspended':
+                return handle_market_unsuspended(item)
         if item['source'] == 'com.thirdparty':
             if item['detail-type'] == 'EventClosed':
                 return handle_event_finished(item)
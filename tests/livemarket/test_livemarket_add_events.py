@@ -0,0 +1,267 @@
+import sys
+import os
+import time
+import json
+import importlib.util
+import pytest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda')
+
+# Add the gql directory to the path to find the shared layer modules
+sys.path.append(os.path.join(LAMBDA_DIR, 'gql'))
+
+
+def load_app(name, directory):
+    """Import the app module of a function under its own name, as both functions call it app."""
+    sys.path.insert(0, directory)
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(directory, 'app.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.remove(directory)
+
+
+def added_event(event_id, **detail):
+    """Build a third-party EventAdded notification."""
+    return {
+        'source': 'com.thirdparty',
+        'detail-type': 'EventAdded',
+        'detail': {
+            'eventId': event_id,
+            'home': 'Home',
+            'away': 'Away',
+            'homeOdds': '2/1',
+            'awayOdds': '3/1',
+            'drawOdds': '5/2',
+            'start': '2024-05-01T12:00:00Z',
+            'end': '2024-05-01T14:00:00Z',
+            'updatedAt': '2024-05-01T11:00:00Z',
+            'duration': 120,
+            'eventStatus': 'running',
+            **detail
+        }
+    }
+
+
+def sqs_record(message_id, item):
+    """Build an SQS record with a JSON body."""
+    return {'messageId': message_id, 'body': item if isinstance(item, str) else json.dumps(item)}
+
+
+class TestLiveMarketAddEventsReceiver:
+    """Test suite for the batched EventAdded path of the livemarket receiver."""
+
+    @pytest.fixture(autouse=True)
+    def setup_receiver(self, aws_credentials):
+        """Setup the receiver with mocked GraphQL and EventBridge clients."""
+        with patch.dict('sys.modules', {'gql_utils': MagicMock(), 'gql': MagicMock(), 'mutations': MagicMock()}), \
+             patch.dict(os.environ, {
+                 'EVENT_BUS': 'test-event-bus',
+                 'REGION': 'us-east-1',
+                 'APPSYNC_URL': 'https://example.com/graphql'
+             }):
+            receiver = load_app('livemarket_receiver_app', os.path.join(LAMBDA_DIR, 'livemarket/receiver'))
+
+        self.mock_events = MagicMock()
+        self.mock_events.put_events.side_effect = lambda Entries: {
+            'FailedEntryCount': 0, 'Entries': [{} for _ in Entries]
+        }
+        self.mock_gql_client = MagicMock()
+        with patch.object(receiver, 'gql_client', self.mock_gql_client), \
+             patch.object(receiver, 'publisher', receiver.EventPublisher(self.mock_events, sleep=lambda s: None)):
+            self.receiver = receiver
+            yield
+
+    def test_partition_added_events(self):
+        """Test only third-party EventAdded notifications are batched."""
+        records = [
+            sqs_record('m0', added_event('e0')),
+            sqs_record('m1', {'source': 'com.trading', 'detail-type': 'UpdatedOdds', 'detail': {}}),
+            sqs_record('m2', 'not json'),
+            {'messageId': 'm3', 'body': ''},
+            sqs_record('m4', added_event('e4'))
+        ]
+
+        added, other = self.receiver.partition_added_events(records)
+
+        assert [record['messageId'] for record, _ in added] == ['m0', 'm4']
+        assert [record['messageId'] for record in other] == ['m1', 'm2', 'm3']
+
+    def test_batch_is_added_in_one_call(self):
+        """Test every added event in the batch is written with one addEvents call and republished."""
+        self.mock_gql_client.execute.return_value = {'addEvents': {'__typename': 'EventList', 'items': []}}
+        records = [sqs_record(f'm{i}', added_event(f'e{i}')) for i in range(3)]
+
+        result = self.receiver.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        self.mock_gql_client.execute.assert_called_once()
+        gql_input = self.mock_gql_client.execute.call_args.kwargs['variable_values']['input']
+        assert [event['eventId'] for event in gql_input['events']] == ['e0', 'e1', 'e2']
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        assert [json.loads(entry['Detail'])['eventId'] for entry in entries] == ['e0', 'e1', 'e2']
+
+    def test_invalid_items_fail_alone(self):
+        """Test an added event missing a field fails its record while the rest are added."""
+        self.mock_gql_client.execute.return_value = {'addEvents': {'__typename': 'EventList', 'items': []}}
+        invalid = added_event('e1')
+        del invalid['detail']['home']
+        records = [sqs_record('m0', added_event('e0')), sqs_record('m1', invalid)]
+
+        result = self.receiver.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}]}
+        gql_input = self.mock_gql_client.execute.call_args.kwargs['variable_values']['input']
+        assert [event['eventId'] for event in gql_input['events']] == ['e0']
+
+    def test_failed_call_retries_the_batch(self):
+        """Test every record of a failed addEvents call goes back to SQS and nothing is republished."""
+        self.mock_gql_client.execute.return_value = {
+            'addEvents': {'__typename': 'UnknownError', 'message': 'An unknown error occurred while adding events.'}
+        }
+        records = [sqs_record('m0', added_event('e0')), sqs_record('m1', added_event('e1'))]
+
+        result = self.receiver.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm0'}, {'itemIdentifier': 'm1'}]}
+        self.mock_events.put_events.assert_not_called()
+
+    def test_other_records_fall_through_to_record_handler(self):
+        """Test records that are not added events are handled one at a time next to the batch."""
+        self.mock_gql_client.execute.side_effect = lambda query, variable_values: {
+            'addEvents': {'__typename': 'EventList', 'items': []},
+            'updateEventOdds': {'__typename': 'Event', 'eventId': 'e9'}
+        }
+        odds = {
+            'source': 'com.trading',
+            'detail-type': 'UpdatedOdds',
+            'detail': {'eventId': 'e9', 'homeOdds': '2.0', 'awayOdds': '3.0', 'drawOdds': '4.0'}
+        }
+        records = [sqs_record('m0', added_event('e0')), sqs_record('m1', odds)]
+
+        with patch.object(self.receiver, 'record_handler', wraps=self.receiver.record_handler) as record_handler:
+            result = self.receiver.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        assert record_handler.call_count == 1
+        assert record_handler.call_args.kwargs['record'].message_id == 'm1'
+        assert self.mock_gql_client.execute.call_count == 2
+
+
+class TestLiveMarketAddEventsResolver:
+    """Test suite for the addEvents resolver and the epochs stored next to event date times."""
+
+    @pytest.fixture(autouse=True)
+    def setup_resolver(self, aws_credentials):
+        """Setup the resolvers with mocked tables."""
+        with patch.dict(os.environ, {
+            'DB_TABLE': 'test-events-table',
+            'DB_HISTORY_TABLE': 'test-events-history-table',
+            'DB_HISTORY_RETENTION': '86400',
+            'EVENT_BUS': 'test-event-bus'
+        }):
+            resolvers = load_app('livemarket_resolvers_app', os.path.join(LAMBDA_DIR, 'livemarket/resolvers'))
+
+        self.mock_table = MagicMock()
+        self.mock_history_table = MagicMock()
+        self.batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+        self.history_batch = self.mock_history_table.batch_writer.return_value.__enter__.return_value
+        self.timeline = MagicMock()
+        with patch.object(resolvers, 'table', self.mock_table), \
+             patch.object(resolvers, 'history_table', self.mock_history_table), \
+             patch.object(resolvers, 'timeline', self.timeline):
+            self.resolvers = resolvers
+            yield
+
+    def test_add_events_writes_events_and_history(self):
+        """Test each event and its initial snapshot are written through the batch writers."""
+        events = [added_event(f'e{i}')['detail'] for i in range(2)]
+
+        result = self.resolvers.add_events({'events': events})
+
+        assert result['__typename'] == 'EventList'
+        assert [item['eventId'] for item in result['items']] == ['e0', 'e1']
+        assert self.batch.put_item.call_count == 2
+        assert self.history_batch.put_item.call_count == 2
+        item = self.batch.put_item.call_args_list[0].kwargs['Item']
+        assert item['startEpoch'] == Decimal('1714564800.0')
+        assert self.timeline.record.call_count == 2
+
+    def test_add_events_write_failure(self):
+        """Test a DynamoDB failure returns an error so the receiver retries the batch."""
+        self.batch.put_item.side_effect = ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'slow down'}}, 'BatchWriteItem')
+
+        result = self.resolvers.add_events({'events': [added_event('e0')['detail']]})
+
+        assert result['__typename'] == 'UnknownError'
+        self.timeline.record.assert_not_called()
+
+    def test_add_events_invalid_item(self):
+        """Test an event with an unparseable date time fails the batch before anything is written."""
+        events = [added_event('e0')['detail'], added_event('e1', start='not a date')['detail']]
+
+        result = self.resolvers.add_events({'events': events})
+
+        assert result['__typename'] == 'UnknownError'
+        self.batch.put_item.assert_not_called()
+
+    def test_set_epoch_fields(self):
+        """Test epochs are derived from the ISO strings, and epochs sent by the publisher are kept."""
+        event = added_event('e0', start='2024-05-01T14:00:00+02:00', end='2024-05-01T14:00:00',
+                            updatedAtEpoch=1714561200.5)['detail']
+
+        self.resolvers.set_epoch_fields(event)
+
+        assert event['startEpoch'] == Decimal('1714564800.0')
+        assert event['endEpoch'] == Decimal('1714572000.0')
+        assert event['updatedAtEpoch'] == Decimal('1714561200.5')
+
+    def test_set_epoch_fields_skips_missing_fields(self):
+        """Test a date time that is not set gets no epoch."""
+        event = {'eventId': 'e0', 'updatedAt': '2024-05-01T11:00:00Z'}
+
+        assert self.resolvers.set_epoch_fields(event) == {
+            'eventId': 'e0', 'updatedAt': '2024-05-01T11:00:00Z', 'updatedAtEpoch': Decimal('1714561200.0')
+        }
+
+    @pytest.mark.parametrize('item', [
+        {'updatedAt': '2024-05-01T11:00:00Z', 'updatedAtEpoch': Decimal('1714561200.0')},
+        {'updatedAt': '2024-05-01T11:00:00Z'},
+        {'updatedAt': '2024-05-01T13:00:00+02:00'},
+        {'updatedAt': '2024-05-01T11:00:00'}
+    ])
+    def test_get_event_compares_last_update(self, item):
+        """Test a timestamp after the last update returns the current event and an earlier one queries history."""
+        self.timeline.lookup.return_value = None
+        self.mock_table.get_item.return_value = {'Item': {'eventId': 'e0', **item}}
+        self.mock_history_table.query.return_value = {'Items': [{'eventId': 'e0', 'homeOdds': '2.0'}]}
+
+        current = self.resolvers.get_event('e0', 1714561201.0)
+        historical = self.resolvers.get_event('e0', 1714561199.0)
+
+        assert current == {'__typename': 'Event', 'eventId': 'e0', **item}
+        assert historical == {'__typename': 'Event', 'eventId': 'e0', 'homeOdds': '2.0'}
+        self.mock_history_table.query.assert_called_once()
+
+    def test_get_event_at_current_time_reads_the_events_table(self):
+        """Test a lookup at the current time, as bet validation makes, gets the stored event and not the timeline."""
+        now = time.time()
+        self.mock_table.get_item.return_value = {
+            'Item': {'eventId': 'e0', 'homeOdds': '1.5', 'updatedAtEpoch': Decimal(str(now - 10))}
+        }
+        self.mock_history_table.query.return_value = {'Items': [
+            {'eventId': 'e0', 'homeOdds': '2.0', 'timestamp': Decimal(str(now - 100))}
+        ]}
+        timeline = self.resolvers.TimelineCache(self.mock_history_table)
+
+        with patch.object(self.resolvers, 'timeline', timeline):
+            event = self.resolvers.get_event('e0', now)
+
+        assert event['homeOdds'] == '1.5'
+        self.mock_history_table.query.assert_not_called()
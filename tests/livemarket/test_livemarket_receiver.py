@@ -213,6 +213,25 @@ class TestLiveMarketReceiver:
         assert 'eventId' in json.loads(result['Detail'])
         assert result['EventBusName'] == 'test-event-bus'
 
+    def test_record_handler_with_trading_market_suspended(self):
+        """Test the record_handler function with a MarketSuspended event from trading."""
+        mock_record = MagicMock()
+        mock_record.body = json.dumps({
+            'source': 'com.trading',
+            'detail-type': 'MarketSuspended',
+            'detail': {
+                'eventId': '123',
+                'market': 'homeOdds',
+                'reason': 'OddsMovement'
+            }
+        })
+        
+        result = self.livemarket_app.record_handler(mock_record)
+        
+        assert result['Source'] == 'com.livemarket'
+        assert result['DetailType'] == 'MarketSuspended'
+        assert json.loads(result['Detail'])['market'] == 'homeOdds'
+
     def test_record_handler_with_market_unsuspended(self):
         """Test the record_handler function with MarketUnsuspended event."""
         # Create a mock SQSRecord
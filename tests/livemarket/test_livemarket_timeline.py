@@ -0,0 +1,137 @@
+import sys
+import os
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+# Add the lambda directory to the path so we can import the timeline module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/livemarket/resolvers'))
+
+from timeline import TimelineCache, EventTimeline
+
+
+def history_row(event_id, timestamp, home_odds):
+    """Build a history table row as written by the resolvers."""
+    return {
+        'eventId': event_id,
+        'homeOdds': home_odds,
+        'awayOdds': '3.0',
+        'drawOdds': '4.0',
+        'timestamp': Decimal(str(timestamp)),
+        'expiry': Decimal(str(timestamp + 3600))
+    }
+
+
+class TestLiveMarketTimeline:
+    """Test suite for the livemarket point-in-time timeline cache."""
+
+    @pytest.fixture(autouse=True)
+    def setup_timeline(self):
+        """Setup a timeline cache over a mocked history table."""
+        self.mock_history_table = MagicMock()
+        self.mock_history_table.query.return_value = {
+            'Items': [
+                history_row('event-1', 300, '1.5'),
+                history_row('event-1', 200, '1.8'),
+                history_row('event-1', 100, '2.0')
+            ]
+        }
+        self.timeline = TimelineCache(self.mock_history_table, max_events=2, max_entries=5)
+        yield
+
+    def test_lookup_returns_snapshot_before_timestamp(self):
+        """Test a lookup returns the newest snapshot older than the timestamp."""
+        snapshot = self.timeline.lookup('event-1', 250)
+
+        assert snapshot['homeOdds'] == '1.8'
+        assert 'timestamp' not in snapshot
+        assert 'expiry' not in snapshot
+
+    def test_lookup_before_history_returns_none(self):
+        """Test a lookup older than the held history is left to the caller."""
+        assert self.timeline.lookup('event-1', 50) is None
+
+    def test_lookup_in_synced_range_is_served_from_memory(self):
+        """Test lookups inside the synced window do not query the history table."""
+        self.timeline.lookup('event-1', 250)
+        self.timeline.lookup('event-1', 150)
+
+        self.mock_history_table.query.assert_called_once()
+
+    def test_current_lookups_bypass_the_timeline(self):
+        """Test a lookup at the current time, as bet validation makes, is never answered from memory."""
+        now = [1000.0]
+        timeline = TimelineCache(self.mock_history_table, clock=lambda: now[0])
+        timeline.lookup('event-1', 250)
+
+        assert timeline.lookup('event-1', now[0]) is None
+        now[0] += 0.5
+        assert timeline.lookup('event-1', now[0] - 0.2) is None
+        self.mock_history_table.query.assert_called_once()
+
+    def test_lookup_past_last_sync_refreshes(self):
+        """Test a lookup newer than the last sync reads the history table again rather than serving stale odds."""
+        now = [1000.0]
+        timeline = TimelineCache(self.mock_history_table, clock=lambda: now[0])
+        timeline.lookup('event-1', 250)
+        now[0] += 10.0
+
+        timeline.lookup('event-1', 1005.0)
+
+        assert self.mock_history_table.query.call_count == 2
+
+    def test_refresh_reads_only_newer_rows(self):
+        """Test a refresh queries from the newest held snapshot and appends the result."""
+        self.timeline.lookup('event-1', 250)
+        self.timeline._timelines['event-1'].synced_at = 0.0
+        self.mock_history_table.query.return_value = {
+            'Items': [history_row('event-1', 400, '1.2')]
+        }
+
+        snapshot = self.timeline.lookup('event-1', 500)
+
+        args = self.mock_history_table.query.call_args.kwargs
+        assert args['KeyConditionExpression'] == 'eventId = :e AND #t > :t'
+        assert args['ExpressionAttributeValues'][':t'] == Decimal('0.0')
+        assert snapshot['homeOdds'] == '1.2'
+        assert self.timeline._timelines['event-1'].epochs == [100.0, 200.0, 300.0, 400.0]
+
+    def test_record_appends_to_loaded_timeline(self):
+        """Test snapshots written by this container are added to a loaded timeline."""
+        self.timeline.lookup('event-1', 250)
+
+        self.timeline.record('event-1', Decimal('350'), {'eventId': 'event-1', 'homeOdds': '1.4'})
+        self.timeline.record('event-2', Decimal('350'), {'eventId': 'event-2', 'homeOdds': '1.4'})
+
+        assert self.timeline._timelines['event-1'].at(360)['homeOdds'] == '1.4'
+        assert 'event-2' not in self.timeline._timelines
+
+    def test_least_recently_used_event_is_evicted(self):
+        """Test the number of cached events is bounded."""
+        self.timeline.lookup('event-1', 250)
+        self.timeline.lookup('event-2', 250)
+        self.timeline.lookup('event-1', 250)
+        self.timeline.lookup('event-3', 250)
+
+        assert list(self.timeline._timelines) == ['event-1', 'event-3']
+
+    def test_full_page_replaces_timeline(self):
+        """Test a full page of history resets the timeline rather than leaving a gap."""
+        self.mock_history_table.query.return_value = {
+            'Items': [history_row('event-1', t, str(t)) for t in (900, 800, 700, 600, 500)]
+        }
+
+        self.timeline.lookup('event-1', 1000)
+
+        assert self.timeline._timelines['event-1'].epochs == [500.0, 600.0, 700.0, 800.0, 900.0]
+
+    def test_event_timeline_trim_and_ordering(self):
+        """Test out of order snapshots are sorted and the oldest are trimmed."""
+        event_timeline = EventTimeline()
+        for epoch in (30.0, 10.0, 20.0, 40.0):
+            event_timeline.add(epoch, {'epoch': epoch})
+        event_timeline.add(20.0, {'epoch': 'replaced'})
+        event_timeline.trim(3)
+
+        assert event_timeline.epochs == [20.0, 30.0, 40.0]
+        assert event_timeline.at(25.0) == {'epoch': 'replaced'}
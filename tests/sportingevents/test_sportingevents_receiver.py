@@ -7,6 +7,8 @@ from datetime import datetime
 
 # Add the lambda directory to the path so we can import the app
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/sportingevents/receiver'))
+# Add the gql directory to the path to find the shared layer modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
 
 class TestSportingEventsReceiver:
     """Test suite for sportingevents receiver functions."""
@@ -28,10 +30,13 @@ class TestSportingEventsReceiver:
                 # Configure the mock_events_client
                 mock_events_client.put_events = MagicMock()
                 
-                # Make the imports and mocks available to the test methods
-                self.sportingevents_app = sportingevents_app
-                self.mock_events_client = mock_events_client
-                yield
+                # Publish through the mocked client without waiting between retries
+                publisher = sportingevents_app.EventPublisher(mock_events_client, sleep=lambda s: None)
+                with patch.object(sportingevents_app, 'publisher', publisher):
+                    # Make the imports and mocks available to the test methods
+                    self.sportingevents_app = sportingevents_app
+                    self.mock_events_client = mock_events_client
+                    yield
 
     def test_form_event(self):
         """Test the form_event function."""
@@ -102,6 +107,9 @@ class TestSportingEventsReceiver:
         assert detail['homeOdds'] == '2/1'
         assert detail['awayOdds'] == '3/1'
         assert detail['drawOdds'] == '5/2'
+        assert detail['startEpoch'] == current_timestamp / 1000.0
+        assert detail['endEpoch'] == (current_timestamp + 7200000) / 1000.0
+        assert detail['updatedAtEpoch'] == (current_timestamp - 3600000) / 1000.0
         
     def test_send_new_event_missing_required_fields(self):
         """Test the send_new_event function with missing required fields."""
@@ -196,3 +204,167 @@ class TestSportingEventsReceiver:
             # Verify the result
             assert result['statusCode'] == 400
             assert result['body'] == 'Bad Request!'
+
+    def make_betting_events(self, count):
+        """Build a list of valid incoming sporting events."""
+        current_timestamp = int(datetime.now().timestamp() * 1000)
+        return [{
+            'eventId': f'test-event-id-{i}',
+            'homeTeam': 'Home Team',
+            'awayTeam': 'Away Team',
+            'startTime': current_timestamp,
+            'endTime': current_timestamp + 7200000,
+            'duration': 120,
+            'state': 'SCHEDULED',
+            'homeOdds': '2/1',
+            'awayOdds': '3/1',
+            'drawOdds': '5/2',
+            'updatedAt': current_timestamp - 3600000
+        } for i in range(count)]
+
+    def test_validate_event(self):
+        """Test the validate_event function against the event schema."""
+        betting_event = self.make_betting_events(1)[0]
+        assert self.sportingevents_app.validate_event(betting_event) is None
+
+        betting_event['startTime'] = 'tomorrow'
+        assert self.sportingevents_app.validate_event(betting_event) == 'Invalid type for field: startTime'
+
+        del betting_event['awayTeam']
+        assert self.sportingevents_app.validate_event(betting_event) == 'Missing required field: awayTeam'
+
+        assert self.sportingevents_app.validate_event(['not', 'an', 'event']) == 'Event must be an object'
+
+    def test_bulk_ingest_publishes_in_chunks(self):
+        """Test bulk ingestion publishes at most 10 entries per put_events call."""
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+        betting_events = self.make_betting_events(25)
+
+        report = self.sportingevents_app.bulk_ingest(betting_events, '%Y-%m-%dT%H:%M:%SZ')
+
+        chunk_sizes = sorted(len(c.kwargs['Entries']) for c in self.mock_events_client.put_events.call_args_list)
+        assert chunk_sizes == [5, 10, 10]
+        assert report['published'] == 25
+        assert report['failed'] == 0
+        assert all(result['status'] == 'published' for result in report['results'])
+
+    def test_bulk_ingest_reports_invalid_and_retries_failed_entries(self):
+        """Test bulk ingestion reports invalid items and only retries failed entries."""
+        betting_events = self.make_betting_events(3)
+        betting_events[1]['homeTeam'] = None
+        self.mock_events_client.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{'EventId': '1'}, {'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 0, 'Entries': [{'EventId': '2'}]}
+        ]
+
+        report = self.sportingevents_app.bulk_ingest(betting_events, '%Y-%m-%dT%H:%M:%SZ')
+
+        retried = self.mock_events_client.put_events.call_args_list[1].kwargs['Entries']
+        assert json.loads(retried[0]['Detail'])['eventId'] == 'test-event-id-2'
+        assert report['published'] == 2
+        assert report['failed'] == 1
+        assert report['results'][1] == {
+            'index': 1,
+            'eventId': 'test-event-id-1',
+            'status': 'invalid',
+            'error': 'Missing required field: homeTeam'
+        }
+
+    def test_bulk_ingest_reports_entries_that_keep_failing(self):
+        """Test entries still failing after all attempts are reported as failed."""
+        betting_events = self.make_betting_events(1)
+        self.mock_events_client.put_events.return_value = {
+            'FailedEntryCount': 1,
+            'Entries': [{'ErrorCode': 'InternalFailure'}]
+        }
+
+        report = self.sportingevents_app.bulk_ingest(betting_events, '%Y-%m-%dT%H:%M:%SZ')
+
+        assert self.mock_events_client.put_events.call_count == self.sportingevents_app.publisher.max_attempts
+        assert report['results'][0]['status'] == 'failed'
+        assert report['results'][0]['error'] == 'InternalFailure'
+
+    def test_lambda_handler_bulk_mode(self):
+        """Test the lambda_handler function routes ?mode=bulk requests to bulk ingestion."""
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+        betting_events = self.make_betting_events(2)
+        betting_events.append({'eventId': 'bad-event'})
+        event = {
+            'body': json.dumps(betting_events),
+            'queryStringParameters': {'mode': 'bulk'}
+        }
+
+        result = self.sportingevents_app.lambda_handler(event, {})
+
+        body = json.loads(result['body'])
+        assert result['statusCode'] == 207
+        assert body['published'] == 2
+        assert body['failed'] == 1
+        assert body['results'][2]['status'] == 'invalid'
+
+    @pytest.mark.parametrize('body, error', [
+        ('[{"eventId": "truncated"', 'Malformed JSON'),
+        (None, 'Malformed JSON'),
+        ('{"eventId": "not-a-list"}', 'Bulk payload must be a list of events')
+    ])
+    def test_lambda_handler_bulk_mode_rejects_invalid_payload(self, body, error):
+        """Test a bulk body that is not a JSON array is rejected with a validation message."""
+        event = {'body': body, 'queryStringParameters': {'mode': 'bulk'}}
+
+        result = self.sportingevents_app.lambda_handler(event, {})
+
+        report = json.loads(result['body'])
+        assert result['statusCode'] == 400
+        assert report['error'].startswith(error)
+        assert report['published'] == 0
+        self.mock_events_client.put_events.assert_not_called()
+
+    def test_iter_json_array(self):
+        """Test the iter_json_array function decodes items one at a time."""
+        items = self.sportingevents_app.iter_json_array(' [ {"a": 1} ,{"b": [2, 3]}, "c" ] ')
+
+        assert next(items) == {'a': 1}
+        assert list(items) == [{'b': [2, 3]}, 'c']
+        assert list(self.sportingevents_app.iter_json_array('[]')) == []
+
+        with pytest.raises(ValueError):
+            list(self.sportingevents_app.iter_json_array('{"a": 1}'))
+        with pytest.raises(ValueError):
+            list(self.sportingevents_app.iter_json_array('[{"a": 1} {"b": 2}]'))
+
+    def test_stream_ingest_publishes_items_before_malformed_tail(self):
+        """Test streamed items are published in chunks as they are decoded, ahead of a malformed tail."""
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+        betting_events = self.make_betting_events(12)
+        body = json.dumps(betting_events)[:-1] + ', {"eventId": "truncated"'
+
+        with patch.object(self.sportingevents_app.publisher, 'max_workers', 1):
+            report = self.sportingevents_app.stream_ingest(body, '%Y-%m-%dT%H:%M:%SZ')
+
+        chunk_sizes = [len(c.kwargs['Entries']) for c in self.mock_events_client.put_events.call_args_list]
+        assert chunk_sizes == [10, 2]
+        assert report['published'] == 12
+        assert report['error'].startswith('Malformed JSON')
+
+    def test_lambda_handler_stream_mode(self):
+        """Test the lambda_handler function routes ?mode=stream requests to streaming ingestion."""
+        self.mock_events_client.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{'EventId': '1'}, {'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]}
+        ]
+        betting_events = self.make_betting_events(2)
+        betting_events.insert(1, {'eventId': 'bad-event'})
+        event = {
+            'body': json.dumps(betting_events),
+            'queryStringParameters': {'mode': 'stream'}
+        }
+
+        result = self.sportingevents_app.lambda_handler(event, {})
+
+        body = json.loads(result['body'])
+        assert result['statusCode'] == 207
+        assert body['published'] == 1
+        assert body['failed'] == 2
+        assert [r['status'] for r in body['results']] == ['invalid', 'failed']
+        assert body['results'][1]['eventId'] == 'test-event-id-1'
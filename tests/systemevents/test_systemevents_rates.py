@@ -0,0 +1,80 @@
+import sys
+import os
+import pytest
+
+# Add the lambda directory to the path so we can import the rates module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/systemevents/resolver'))
+
+from rates import SystemEventRates
+
+# Start of a minute, 2024-01-01T00:00:00Z
+MINUTE = 1704067200.0
+
+
+class TestSystemEventRates:
+    """Test suite for the rolling system event rate counters."""
+
+    @pytest.fixture(autouse=True)
+    def setup_rates(self, dynamodb_resource):
+        """Setup rate counters over a moto system events table."""
+        self.table = dynamodb_resource.create_table(
+            TableName='test-system-events',
+            KeySchema=[
+                {'AttributeName': 'pk', 'KeyType': 'HASH'},
+                {'AttributeName': 'sk', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        self.now = MINUTE + 150
+        self.rates = SystemEventRates(self.table, slots=4, clock=lambda: self.now)
+
+    def events(self, source, detail_type, *timestamps):
+        """Build stored events of one source and detail type."""
+        return [{'source': source, 'detailType': detail_type, 'timestamp': t} for t in timestamps]
+
+    def test_counts_per_minute(self):
+        """Test events are counted in the minute they were raised in, per source and detail type."""
+        self.rates.record(
+            self.events('com.betting', 'BetsPlaced', MINUTE + 10, MINUTE + 70, MINUTE + 80, MINUTE + 130) +
+            self.events('com.wallet', 'FundsDeducted', MINUTE + 75)
+        )
+
+        rates = self.rates.rates(3)
+
+        assert rates == [
+            {'source': 'com.betting', 'detailType': 'BetsPlaced', 'counts': [1, 2, 1], 'total': 4, 'perSecond': 0.033},
+            {'source': 'com.wallet', 'detailType': 'FundsDeducted', 'counts': [0, 1, 0], 'total': 1, 'perSecond': 0.017}
+        ]
+
+    def test_counts_are_added_across_batches(self):
+        """Test later batches add to the counts of the same minute."""
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE + 130))
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE + 131, MINUTE + 132))
+
+        assert self.rates.rates(1)[0]['counts'] == [3]
+
+    def test_slots_are_reused_for_later_minutes(self):
+        """Test a slot holding an older minute is reset rather than added to."""
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE - 120))
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE + 120))
+
+        item = self.table.get_item(Key={'pk': 'rates', 'sk': 'com.betting#BetsPlaced'})['Item']
+        assert item['c2'] == 1
+        assert item['m2'] == int(MINUTE // 60) + 2
+
+    def test_late_events_for_overwritten_minutes_are_dropped(self):
+        """Test events for a minute whose slot has moved on do not corrupt the newer count."""
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE + 120))
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE - 120))
+
+        assert self.rates.rates(1)[0]['counts'] == [1]
+
+    def test_idle_counters_are_left_out(self):
+        """Test sources without events in the window are not returned."""
+        self.rates.record(self.events('com.betting', 'BetsPlaced', MINUTE - 600))
+
+        assert self.rates.rates(4) == []
@@ -4,8 +4,9 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Add the lambda directory to the path so we can import the app
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/systemevents/receiver'))
+# Add the lambda directory to the path so we can import the app, ahead of the
+# resolver directory the store tests add, which has an app module of its own
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/systemevents/receiver'))
 # Add the gql directory to the path to find gql_utils
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
 
@@ -25,6 +26,8 @@ class TestSystemEventsReceiver:
     @pytest.fixture(autouse=True)
     def setup_systemevents_app(self, aws_credentials):
         """Setup the systemevents app with mocked AWS resources."""
+        # Clock of the rate aggregator
+        self.now = 0.0
         # Mock the modules before importing app
         with patch.dict('sys.modules', {
             'gql_utils': MagicMock(),
@@ -40,13 +43,17 @@ class TestSystemEventsReceiver:
                 import app as systemevents_app
                 
                 # Mock the boto3 session and resources
-                with patch.object(systemevents_app, 'session') as mock_session, \
-                     patch.object(systemevents_app, 'events') as mock_events, \
+                with patch.object(systemevents_app, 'events') as mock_events, \
+                     patch.object(systemevents_app, 'publisher',
+                                  systemevents_app.EventPublisher(mock_events, sleep=lambda s: None)), \
                      patch.object(systemevents_app, 'get_client') as mock_get_client, \
-                     patch.object(systemevents_app, 'gql') as mock_gql:
+                     patch.object(systemevents_app, 'gql') as mock_gql, \
+                     patch.object(systemevents_app, 'rate_aggregator',
+                                  systemevents_app.RateAggregator(clock=lambda: self.now)):
                     
                     # Configure the mock_events
                     mock_events.put_events = MagicMock()
+                    mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
                     
                     # Configure the mock_gql
                     mock_gql.return_value = "mocked_gql_query"
@@ -62,116 +69,24 @@ class TestSystemEventsReceiver:
                     self.mock_gql = mock_gql
                     yield
 
-    def test_handle_system_event(self):
-        """Test the handle_system_event function."""
-        # Create a mock event
-        item = {
+    def test_system_event_input_is_stable_across_deliveries(self):
+        """Test an event delivered twice gets the same systemEventId and time, so it is stored once."""
+        body = json.dumps({
+            'id': '6a7e8feb-b491-4cf7-a9f1-bf3703467718',
             'source': 'com.test',
             'detail-type': 'TestEvent',
-            'detail': {
-                'testData': 'value'
-            }
-        }
-        
-        # Set up the mock response
-        mock_response = {
-            'source': 'com.test',
-            'detailType': 'TestEvent',
-            'detail': {
-                'testData': 'value',
-                'systemEventId': '12345678-1234-1234-1234-123456789012'
-            }
-        }
-        
-        # Configure the mock to return the expected response
-        self.mock_gql_client.execute.return_value = {'addSystemEvent': mock_response}
-        
-        # Mock uuid.uuid4
-        with patch('uuid.uuid4', return_value='12345678-1234-1234-1234-123456789012'):
-            # Call the function under test
-            with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
-                result = self.systemevents_app.handle_system_event(item)
-            
-            # Verify the result
-            assert result['Source'] == 'com.test'
-            assert result['DetailType'] == 'TestEvent'
-            assert result['Detail']['testData'] == 'value'
-            assert result['Detail']['systemEventId'] == '12345678-1234-1234-1234-123456789012'
-            assert result['EventBusName'] == 'test-event-bus'
-        
-    def test_handle_system_event_error(self):
-        """Test the handle_system_event function with an error."""
-        # Create a mock event
-        item = {
-            'source': 'com.test',
-            'detail-type': 'TestEvent',
-            'detail': {
-                'testData': 'value'
-            }
-        }
-        
-        # Configure the mock to raise an exception
-        self.mock_gql_client.execute.side_effect = Exception("GraphQL error")
-        
-        # Call the function and expect None as return value
-        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
-            result = self.systemevents_app.handle_system_event(item)
-            assert result is None
-        
-    def test_record_handler(self):
-        """Test the record_handler function."""
-        # Create a mock SQSRecord
-        mock_record = MagicMock()
-        mock_record.body = json.dumps({
-            'source': 'com.test',
-            'detail-type': 'TestEvent',
-            'detail': {
-                'testData': 'value'
-            }
+            'time': '2024-01-01T00:00:00Z',
+            'detail': {'testData': 'value'}
         })
-        
-        # Mock the handle_system_event function
-        with patch.object(self.systemevents_app, 'handle_system_event') as mock_handle_system_event:
-            mock_handle_system_event.return_value = {
-                'Source': 'com.test',
-                'DetailType': 'TestEvent',
-                'Detail': {
-                    'testData': 'value',
-                    'systemEventId': '12345678-1234-1234-1234-123456789012'
-                },
-                'EventBusName': 'test-event-bus'
-            }
-            
-            # Call the function
-            result = self.systemevents_app.record_handler(mock_record)
-            
-            # Verify the result
-            assert result['Source'] == 'com.test'
-            assert result['DetailType'] == 'TestEvent'
-            assert result['Detail']['testData'] == 'value'
-            assert result['Detail']['systemEventId'] == '12345678-1234-1234-1234-123456789012'
-            assert result['EventBusName'] == 'test-event-bus'
-            
-            # Verify handle_system_event was called with the correct parameters
-            mock_handle_system_event.assert_called_once_with({
-                'source': 'com.test',
-                'detail-type': 'TestEvent',
-                'detail': {
-                    'testData': 'value'
-                }
-            })
-    
-    def test_record_handler_empty_payload(self):
-        """Test the record_handler function with empty payload."""
-        # Create a mock SQSRecord
-        mock_record = MagicMock()
-        mock_record.body = None
-        
-        # With the improved implementation, we expect the function to handle
-        # the empty payload gracefully and return None
-        result = self.systemevents_app.record_handler(mock_record)
-        assert result is None
-    
+
+        first = self.systemevents_app.system_event_input(json.loads(body))
+        second = self.systemevents_app.system_event_input(json.loads(body))
+
+        assert first == second
+        assert first['systemEventId'] == '6a7e8feb-b491-4cf7-a9f1-bf3703467718'
+        assert json.loads(first['detail']) == {'testData': 'value', 'systemEventId': first['systemEventId']}
+        assert first['timestamp'] == 1704067200.0
+
     def test_lambda_handler(self):
         """Test the lambda_handler function."""
         # Create a mock event with SQS records
@@ -181,6 +96,7 @@ class TestSystemEventsReceiver:
                     "messageId": "19dd0b57-b21e-4ac1-bd88-01bbb068cb78",
                     "receiptHandle": "MessageReceiptHandle",
                     "body": json.dumps({
+                        'id': '6a7e8feb-b491-4cf7-a9f1-bf3703467718',
                         'source': 'com.test',
                         'detail-type': 'TestEvent',
                         'detail': {
@@ -209,19 +125,12 @@ class TestSystemEventsReceiver:
         mock_context.invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:test-function"
         mock_context.aws_request_id = "test-request-id"
         
-        # Mock the processor.process method to return a list of tuples
-        with patch.object(self.systemevents_app.processor, 'process', return_value=[
-            ('success', {
-                'Source': 'com.test',
-                'DetailType': 'TestEvent',
-                'Detail': {
-                    'testData': 'value',
-                    'systemEventId': '12345678-1234-1234-1234-123456789012'
-                },
-                'EventBusName': 'test-event-bus'
-            })
-        ]), \
-        patch.object(self.systemevents_app.processor, 'response', return_value={'batchItemFailures': []}), \
+        # The batch is recorded with a single addSystemEvents call
+        self.mock_gql_client.execute.return_value = {
+            'addSystemEvents': {'__typename': 'SystemEventList', 'items': []}
+        }
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client), \
         patch.object(self.systemevents_app.logger, 'info'), \
         patch.object(self.systemevents_app.logger, 'debug'):
             
@@ -232,54 +141,127 @@ class TestSystemEventsReceiver:
             self.mock_events.put_events.assert_called_once()
             assert result == {'batchItemFailures': []}
     
-    def test_lambda_handler_no_output_events(self):
-        """Test the lambda_handler function with no output events."""
-        # Create a mock event with SQS records
-        event = {
-            "Records": [
-                {
-                    "messageId": "19dd0b57-b21e-4ac1-bd88-01bbb068cb78",
-                    "receiptHandle": "MessageReceiptHandle",
-                    "body": json.dumps({
-                        'source': 'com.test',
-                        'detail-type': 'TestEvent',
-                        'detail': {
-                            'testData': 'value'
-                        }
-                    }),
-                    "attributes": {
-                        "ApproximateReceiveCount": "1",
-                        "SentTimestamp": "1523232000000",
-                        "SenderId": "123456789012",
-                        "ApproximateFirstReceiveTimestamp": "1523232000001"
-                    },
-                    "messageAttributes": {},
-                    "md5OfBody": "7b270e59b47ff90a553787216d55d91d",
-                    "eventSource": "aws:sqs",
-                    "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:MyQueue",
-                    "awsRegion": "us-east-1"
-                }
-            ]
+    def test_lambda_handler_drops_records_that_are_not_system_events(self):
+        """Test records that cannot be parsed are logged and dropped rather than retried."""
+        records = [
+            {'messageId': 'm0', 'body': ''},
+            {'messageId': 'm1', 'body': 'not json'},
+            {'messageId': 'm2', 'body': json.dumps({'source': 'com.test', 'detail': 'not an object'})}
+        ]
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client), \
+             patch.object(self.systemevents_app.logger, 'error') as mock_error:
+            result = self.systemevents_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        assert mock_error.call_count == 3
+        self.mock_gql_client.execute.assert_not_called()
+        self.mock_events.put_events.assert_not_called()
+
+    def sqs_record(self, message_id, detail_type='TestEvent'):
+        """Build an SQS record carrying a system event."""
+        return {
+            'messageId': message_id,
+            'body': json.dumps({
+                'id': f'event-{message_id}',
+                'source': 'com.test',
+                'detail-type': detail_type,
+                'detail': {'testData': message_id}
+            })
         }
-        
-        # Create a mock Lambda context
-        mock_context = MagicMock()
-        mock_context.function_name = "test-function"
-        mock_context.memory_limit_in_mb = 128
-        mock_context.invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:test-function"
-        mock_context.aws_request_id = "test-request-id"
-        
-        # Mock the processor.process method to return a list of tuples with None
-        with patch.object(self.systemevents_app.processor, 'process', return_value=[
-            ('success', None)
-        ]), \
-        patch.object(self.systemevents_app.processor, 'response', return_value={'batchItemFailures': []}), \
-        patch.object(self.systemevents_app.logger, 'info'), \
-        patch.object(self.systemevents_app.logger, 'debug'):
-            
-            # Call the function
-            result = self.systemevents_app.lambda_handler(event, mock_context)
-            
-            # Verify events.put_events was not called
-            self.mock_events.put_events.assert_not_called()
-            assert result == {'batchItemFailures': []}
+
+    def test_lambda_handler_records_batch_in_one_call(self):
+        """Test every event in the batch is recorded with one addSystemEvents call."""
+        self.mock_gql_client.execute.return_value = {
+            'addSystemEvents': {'__typename': 'SystemEventList', 'items': []}
+        }
+        self.mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': [{}, {}, {}]}
+        records = [self.sqs_record(f'm{i}') for i in range(3)]
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
+            result = self.systemevents_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        self.mock_gql_client.execute.assert_called_once()
+        gql_input = self.mock_gql_client.execute.call_args.kwargs['variable_values']['input']
+        assert [json.loads(e['detail'])['testData'] for e in gql_input['events']] == ['m0', 'm1', 'm2']
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        assert [json.loads(e['Detail'])['testData'] for e in entries] == ['m0', 'm1', 'm2']
+
+    def test_lambda_handler_failed_batch_is_retried(self):
+        """Test the records of a failed addSystemEvents call go back to SQS."""
+        self.mock_gql_client.execute.return_value = {
+            'addSystemEvents': {'__typename': 'UnknownError', 'message': 'Failed to add system events'}
+        }
+        records = [self.sqs_record('m0'), self.sqs_record('m1'), {'messageId': 'm2', 'body': 'not json'}]
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
+            result = self.systemevents_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm0'}, {'itemIdentifier': 'm1'}]}
+        self.mock_events.put_events.assert_not_called()
+
+    def test_lambda_handler_reports_only_unpublished_records(self):
+        """Test only records whose events EventBridge rejected go back to SQS."""
+        self.mock_gql_client.execute.return_value = {
+            'addSystemEvents': {'__typename': 'SystemEventList', 'items': []}
+        }
+        # The rejected entry is retried on its own and rejected every time
+        self.mock_events.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{}, {'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]}
+        ]
+        records = [self.sqs_record('m0'), self.sqs_record('m1')]
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
+            result = self.systemevents_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}]}
+        assert self.mock_events.put_events.call_count == 3
+
+    def test_lambda_handler_publishes_rates_once_per_interval(self):
+        """Test subscribers get one aggregate per interval rather than every event."""
+        self.mock_gql_client.execute.side_effect = lambda query, variable_values: {
+            'addSystemEvents': {'__typename': 'SystemEventList', 'items': []},
+            'publishSystemEventRates': {'__typename': 'SystemEventRateList', 'items': []}
+        }
+        self.mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client):
+            self.systemevents_app.lambda_handler({'Records': [self.sqs_record('m0'), self.sqs_record('m1')]}, MagicMock())
+            self.now = 0.5
+            self.systemevents_app.lambda_handler({'Records': [self.sqs_record('m2', 'Other')]}, MagicMock())
+            published_early = self.mock_gql_client.execute.call_count
+            self.now = 1.0
+            self.systemevents_app.lambda_handler({'Records': [self.sqs_record('m3')]}, MagicMock())
+
+        assert published_early == 2
+        assert self.mock_gql_client.execute.call_count == 4
+        aggregate = self.mock_gql_client.execute.call_args.kwargs['variable_values']['input']
+        assert aggregate['items'] == [
+            {'source': 'com.test', 'detailType': 'TestEvent', 'counts': [3], 'total': 3, 'perSecond': 3.0},
+            {'source': 'com.test', 'detailType': 'Other', 'counts': [1], 'total': 1, 'perSecond': 1.0}
+        ]
+
+    def test_lambda_handler_samples_subscription_fan_out(self):
+        """Test every event is recorded while only sampled ones are flagged for subscribers."""
+        self.mock_gql_client.execute.return_value = {
+            'addSystemEvents': {'__typename': 'SystemEventList', 'items': []}
+        }
+        self.mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+        sampler = self.systemevents_app.SubscriptionSampler(
+            self.systemevents_app.parse_sampling('com.test/TestEvent=2,com.test/Noisy=summary'))
+        records = [self.sqs_record(f'm{i}') for i in range(3)] + [self.sqs_record('n0', 'Noisy')]
+
+        with patch.object(self.systemevents_app, 'gql_client', self.mock_gql_client), \
+             patch.object(self.systemevents_app, 'subscription_sampler', sampler):
+            result = self.systemevents_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        gql_input = self.mock_gql_client.execute.call_args.kwargs['variable_values']['input']
+        assert [e['publish'] for e in gql_input['events']] == [True, False, True, False]
+        assert [(s['detailType'], json.loads(s['detail'])['coalesced']) for s in gql_input['summaries']] == [('Noisy', 1)]
+        # Summaries carry their detail as a JSON string, like the events they replace
+        assert {type(item['detail']) for item in gql_input['events'] + gql_input['summaries']} == {str}
+        assert len(self.mock_events.put_events.call_args.kwargs['Entries']) == 4
@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+import pytest
+
+# Add the lambda directory to the path so we can import the sampling module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/systemevents/receiver'))
+# Add the layer directory to the path so we can import the shared JSON module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
+
+from sampling import SubscriptionSampler, parse_sampling, SUMMARY
+
+
+def system_events(source, detail_type, count, start=0.0):
+    """Build mutation inputs of recorded system events."""
+    return [
+        {'source': source, 'detailType': detail_type, 'detail': '{}', 'timestamp': start + i}
+        for i in range(count)
+    ]
+
+
+class TestSubscriptionSampler:
+    """Test suite for the system event subscription sampler."""
+
+    def test_parse_sampling(self):
+        """Test rules for a detail type or a whole source are parsed."""
+        rules = parse_sampling(' com.thirdparty/UpdatedOdds=10, com.trading=summary,')
+
+        assert rules == {('com.thirdparty', 'UpdatedOdds'): 10, ('com.trading', None): SUMMARY}
+
+    def test_parse_sampling_rejects_invalid_rate(self):
+        """Test a rate that is not a count or summary is rejected."""
+        with pytest.raises(ValueError):
+            parse_sampling('com.thirdparty/UpdatedOdds=often')
+
+    def test_unmatched_events_are_all_published(self):
+        """Test events without a rule are all pushed to subscribers."""
+        sampler = SubscriptionSampler(parse_sampling('com.thirdparty/UpdatedOdds=10'))
+        events = system_events('com.betting.settlement', 'BetSettlementComplete', 3)
+
+        assert sampler.sample(events) == []
+        assert [e['publish'] for e in events] == [True, True, True]
+
+    def test_one_in_n_across_batches(self):
+        """Test 1 in N events are published, counting across batches."""
+        sampler = SubscriptionSampler(parse_sampling('com.thirdparty/UpdatedOdds=3'))
+        first = system_events('com.thirdparty', 'UpdatedOdds', 4)
+        second = system_events('com.thirdparty', 'UpdatedOdds', 4)
+
+        sampler.sample(first)
+        sampler.sample(second)
+
+        assert [e['publish'] for e in first + second] == [True, False, False, True, False, False, True, False]
+
+    def test_detail_type_rule_overrides_source_rule(self):
+        """Test a rule for a detail type takes precedence over the rule of its source."""
+        sampler = SubscriptionSampler(parse_sampling('com.trading=summary,com.trading/MarketSuspended=1'))
+
+        assert sampler.rate('com.trading', 'MarketSuspended') == 1
+        assert sampler.rate('com.trading', 'UpdatedOdds') == SUMMARY
+
+    def test_summary_per_batch(self):
+        """Test coalesced events are replaced by one summary per source and detail type."""
+        sampler = SubscriptionSampler(parse_sampling('com.trading=summary'))
+        events = system_events('com.trading', 'UpdatedOdds', 3, 100.0) + system_events('com.trading', 'MarketSuspended', 1)
+
+        summaries = sampler.sample(events)
+
+        assert not any(e['publish'] for e in events)
+        assert [(s['source'], s['detailType']) for s in summaries] == [
+            ('com.trading', 'UpdatedOdds'), ('com.trading', 'MarketSuspended')
+        ]
+        assert json.loads(summaries[0]['detail']) == {'coalesced': 3, 'from': 100.0, 'to': 102.0}
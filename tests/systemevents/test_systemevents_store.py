@@ -0,0 +1,98 @@
+import sys
+import os
+import pytest
+
+# Add the lambda directory to the path so we can import the store module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/systemevents/resolver'))
+
+from store import SystemEventStore, partition_key, encode_token
+
+# 2024-01-01T23:00:00Z
+NOW = 1704150000.0
+
+
+class TestSystemEventStore:
+    """Test suite for the system event store."""
+
+    @pytest.fixture(autouse=True)
+    def setup_store(self, dynamodb_resource):
+        """Setup a store over a moto system events table."""
+        table = dynamodb_resource.create_table(
+            TableName='test-system-events',
+            KeySchema=[
+                {'AttributeName': 'pk', 'KeyType': 'HASH'},
+                {'AttributeName': 'sk', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        self.table = table
+        self.store = SystemEventStore(table, ttl_seconds=7 * 24 * 3600, page_size=3, clock=lambda: NOW)
+
+    def add(self, source, *timestamps):
+        """Store one event of a source at each timestamp."""
+        return self.store.put_events([
+            {'source': source, 'detailType': 'Test', 'detail': str(t), 'timestamp': t}
+            for t in timestamps
+        ])
+
+    def test_put_events_partitions_by_source_and_day(self):
+        """Test events are keyed by source and UTC day and expire after the TTL."""
+        stored = self.add('com.betting', NOW)
+
+        item = self.table.get_item(Key={
+            'pk': 'com.betting#2024-01-01',
+            'sk': f"{int(NOW * 1000):015d}#{stored[0]['systemEventId']}"
+        })['Item']
+        assert item['detail'] == str(NOW)
+        assert item['expiry'] == int(NOW) + 7 * 24 * 3600
+
+    def test_put_events_fills_in_defaults(self):
+        """Test events without an ID or timestamp get one."""
+        stored = self.store.put_events([{'source': 'com.pam', 'detailType': 'UserLocked', 'detail': '{}'}])
+
+        assert stored[0]['systemEventId']
+        assert stored[0]['timestamp'] == NOW
+
+    def test_query_window_of_one_source(self):
+        """Test a query returns only the source's events within the window, oldest first."""
+        self.add('com.betting', NOW - 300, NOW - 200, NOW - 7200)
+        self.add('com.wallet', NOW - 250)
+
+        result = self.store.query('com.betting', NOW - 3600, NOW)
+
+        assert [e['timestamp'] for e in result['items']] == [NOW - 300, NOW - 200]
+        assert 'nextToken' not in result
+        assert set(result['items'][0]) == {'source', 'detailType', 'detail', 'systemEventId', 'timestamp'}
+
+    def test_query_paginates_across_days(self):
+        """Test pages follow on from each other within and across day partitions."""
+        timestamps = [NOW - 86400 - 60, NOW - 86400 - 30, NOW - 120, NOW - 90, NOW - 60]
+        self.add('com.trading', *timestamps)
+
+        pages = [self.store.query('com.trading', NOW - 2 * 86400)]
+        while 'nextToken' in pages[-1]:
+            pages.append(self.store.query('com.trading', NOW - 2 * 86400, next_token=pages[-1]['nextToken']))
+
+        assert [e['timestamp'] for page in pages for e in page['items']] == timestamps
+        assert all(len(page['items']) <= 3 for page in pages)
+
+    def test_query_rejects_token_of_other_source(self):
+        """Test a token cannot be used to read another source's events."""
+        token = encode_token({'pk': partition_key('com.wallet', NOW)})
+
+        with pytest.raises(ValueError):
+            self.store.query('com.betting', NOW - 3600, NOW, token)
+
+    def test_query_rejects_malformed_token(self):
+        """Test a malformed token is an input error."""
+        with pytest.raises(ValueError):
+            self.store.query('com.betting', NOW - 3600, NOW, 'not-a-token')
+
+    def test_query_rejects_inverted_window(self):
+        """Test a window ending before it starts is an input error."""
+        with pytest.raises(ValueError):
+            self.store.query('com.betting', NOW, NOW - 3600)
@@ -6,6 +6,8 @@ from unittest.mock import patch, MagicMock
 
 # Add the lambda directory to the path so we can import the app
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/thirdparty/fetcher'))
+# Add the gql directory to the path to find the shared layer modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
 
 class TestThirdPartyFetcher:
     """Test suite for thirdparty fetcher functions."""
@@ -27,10 +29,14 @@ class TestThirdPartyFetcher:
                 # Configure the mock_events_client
                 mock_events_client.put_events = MagicMock()
                 
-                # Make the imports and mocks available to the test methods
-                self.thirdparty_app = thirdparty_app
-                self.mock_events_client = mock_events_client
-                yield
+                # Publish through the mocked client without waiting between retries
+                self.sleeps = []
+                publisher = thirdparty_app.EventPublisher(mock_events_client, sleep=self.sleeps.append)
+                with patch.object(thirdparty_app, 'publisher', publisher):
+                    # Make the imports and mocks available to the test methods
+                    self.thirdparty_app = thirdparty_app
+                    self.mock_events_client = mock_events_client
+                    yield
 
     def test_form_event(self):
         """Test the form_event function."""
@@ -161,3 +167,114 @@ class TestThirdPartyFetcher:
             assert 'id' in event
             assert isinstance(event['id'], str)
             assert len(event['id']) == 36  # UUID format
+
+    def test_publish_events_chunks_entries(self):
+        """Test more than 10 entries are split across PutEvents requests."""
+        entries = [self.thirdparty_app.form_event('UpdatedOdds', {'eventId': str(i)}) for i in range(25)]
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+
+        report = self.thirdparty_app.publish_events(entries)
+
+        sizes = sorted(len(c.kwargs['Entries']) for c in self.mock_events_client.put_events.call_args_list)
+        assert sizes == [5, 10, 10]
+        assert report['published'] == 25
+        assert report['failed'] == 0
+        assert 'latencyMs' in report
+
+    def test_publish_events_retries_failed_entries(self):
+        """Test only rejected entries are retried and persistent failures are reported."""
+        entries = [self.thirdparty_app.form_event('UpdatedOdds', {'eventId': str(i)}) for i in range(3)]
+        self.mock_events_client.put_events.side_effect = [
+            {'FailedEntryCount': 2, 'Entries': [{'EventId': '1'}, {'ErrorCode': 'ThrottlingException'}, {'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'EventId': '2'}, {'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'ThrottlingException'}]}
+        ]
+
+        report = self.thirdparty_app.publish_events(entries)
+
+        calls = self.mock_events_client.put_events.call_args_list
+        assert [len(c.kwargs['Entries']) for c in calls] == [3, 2, 1]
+        assert calls[2].kwargs['Entries'] == [entries[2]]
+        assert len(self.sleeps) == 2
+        assert report['published'] == 2
+        assert report['failed'] == 1
+
+    def test_lambda_handler_reports_partial_failure(self):
+        """Test the handler reports a partial publish failure."""
+        entries = [self.thirdparty_app.form_event('UpdatedOdds', {'eventId': str(i)}) for i in range(2)]
+        self.mock_events_client.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{'EventId': '1'}, {'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]}
+        ]
+
+        with patch.object(self.thirdparty_app, 'get_events', return_value=entries):
+            response = self.thirdparty_app.lambda_handler({}, MagicMock())
+
+        body = json.loads(response['body'])
+        assert response['statusCode'] == 207
+        assert body['published'] == 1
+        assert body['failed'] == 1
+
+    def test_replay_handler(self, tmp_path):
+        """Test a recorded feed is replayed to EventBridge."""
+        feed = tmp_path / 'feed.jsonl'
+        feed.write_text('\n'.join(json.dumps({'t': t, 'type': 'UpdatedOdds', 'detail': {'eventId': str(t)}})
+                                  for t in (0, 0, 0.01)))
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 60000
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+
+        with patch.object(self.thirdparty_app, 'replay_bucket_name', None):
+            response = self.thirdparty_app.replay_handler({'feed': str(feed), 'speed': 100}, context)
+
+        body = json.loads(response['body'])
+        assert response['statusCode'] == 200
+        assert body['ticks'] == 3
+        assert body['batches'] == 2
+        assert body['published'] == 3
+        sent = self.mock_events_client.put_events.call_args_list[0].kwargs['Entries']
+        assert sent[0]['Source'] == 'com.thirdparty'
+        assert sent[0]['DetailType'] == 'UpdatedOdds'
+
+    def test_replay_handler_invalid_request(self):
+        """Test a replay request without a feed is rejected."""
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 60000
+
+        response = self.thirdparty_app.replay_handler({'speed': 2}, context)
+
+        assert response['statusCode'] == 400
+
+    def test_lambda_handler_publishes_only_changed_odds(self):
+        """Test odds that did not move since the last run are not published again."""
+        first = [
+            {'eventId': 'a', 'homeOdds': '2.0', 'awayOdds': '3.0', 'drawOdds': '4.0'},
+            {'eventId': 'b', 'homeOdds': '1.5', 'awayOdds': '2.5', 'drawOdds': '3.5'}
+        ]
+        second = [first[0], {'eventId': 'b', 'homeOdds': '1.6', 'awayOdds': '2.5', 'drawOdds': '3.5'}]
+        self.mock_events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+
+        with patch.object(self.thirdparty_app, 'delta_cache', self.thirdparty_app.OddsDeltaCache()), \
+             patch.object(self.thirdparty_app, 'get_new_odds', side_effect=[first, second]):
+            self.thirdparty_app.lambda_handler({}, MagicMock())
+            self.thirdparty_app.lambda_handler({}, MagicMock())
+
+        calls = self.mock_events_client.put_events.call_args_list
+        assert len(calls[0].kwargs['Entries']) == 2
+        assert [json.loads(e['Detail'])['eventId'] for e in calls[1].kwargs['Entries']] == ['b']
+
+    def test_lambda_handler_republishes_failed_odds(self):
+        """Test odds that failed to publish are sent again even if unchanged."""
+        update = [{'eventId': 'a', 'homeOdds': '2.0', 'awayOdds': '3.0', 'drawOdds': '4.0'}]
+        failure = {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'InternalFailure'}]}
+        self.mock_events_client.put_events.side_effect = [failure] * 3 + [{'FailedEntryCount': 0, 'Entries': []}]
+
+        with patch.object(self.thirdparty_app, 'delta_cache', self.thirdparty_app.OddsDeltaCache()), \
+             patch.object(self.thirdparty_app, 'get_new_odds', side_effect=[update, update]):
+            first = self.thirdparty_app.lambda_handler({}, MagicMock())
+            second = self.thirdparty_app.lambda_handler({}, MagicMock())
+
+        assert first['statusCode'] == 500
+        assert second['statusCode'] == 200
+        assert json.loads(second['body'])['published'] == 1
@@ -0,0 +1,56 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Add the lambda directory to the path so we can import the odds engine
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/thirdparty/fetcher'))
+
+from odds_engine import OddsEngine, HOME, AWAY, DRAW
+
+
+class TestThirdPartyOddsEngine:
+    """Test suite for the vectorized odds engine."""
+
+    def test_odds_shape_and_range(self):
+        """Test a batch of odds has one row per event and valid decimal odds."""
+        odds = OddsEngine(seed=1).odds(5000)
+
+        assert odds.shape == (5000, 3)
+        assert np.all(odds > 1.0)
+
+    def test_outcomes_are_unique_and_home_is_favourite(self):
+        """Test the three prices of an event never collide and home is the shortest."""
+        odds = OddsEngine(seed=2).odds(5000)
+
+        assert np.all(odds[:, HOME] < odds[:, AWAY])
+        assert np.all(odds[:, HOME] < odds[:, DRAW])
+        assert np.all(odds[:, AWAY] != odds[:, DRAW])
+
+    def test_overround_is_applied(self):
+        """Test the implied probabilities sum to roughly the configured overround."""
+        for overround in (1.05, 1.1, 1.2):
+            probabilities = OddsEngine(overround=overround, precision=3, seed=3).probabilities(5000)
+            assert probabilities.sum(axis=1).mean() == pytest.approx(overround, abs=0.01)
+
+    def test_seed_makes_runs_reproducible(self):
+        """Test two engines with the same seed generate the same batch."""
+        first = OddsEngine(seed=42)
+        second = OddsEngine(seed=42)
+
+        assert first.sample(list('abcdef'), 3) == second.sample(list('abcdef'), 3)
+        assert np.array_equal(first.odds(100), second.odds(100))
+
+    def test_sample_repeats_items_beyond_available(self):
+        """Test sampling is without replacement until the count exceeds the items."""
+        engine = OddsEngine(seed=4)
+
+        assert len(set(engine.sample(list('abcdef'), 6))) == 6
+        assert len(engine.sample(list('abc'), 50)) == 50
+
+    def test_invalid_configuration(self):
+        """Test invalid engine settings are rejected."""
+        with pytest.raises(ValueError):
+            OddsEngine(overround=0)
+        with pytest.raises(ValueError):
+            OddsEngine(min_weight=1.0, max_weight=0.5)
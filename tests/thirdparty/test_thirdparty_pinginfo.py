@@ -0,0 +1,116 @@
+import sys
+import os
+import time
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+# Add the lambda directory to the path so we can import the probes and clients modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/thirdparty/pinginfo'))
+
+from clients import RegionalClients
+from probes import RegionProbes
+
+REGIONS = ['us-east-1', 'eu-west-2', 'ap-southeast-1']
+
+
+class TestRegionProbes:
+    """Test suite for the pinginfo region probes."""
+
+    @pytest.fixture(autouse=True)
+    def setup_probes(self):
+        """Setup probes over mocked regional clients and a controllable clock."""
+        self.now = 0.0
+        self.clients = {region: MagicMock() for region in REGIONS}
+        self.probes = RegionProbes(REGIONS, self.clients.__getitem__, ttl=60, refresh_after=15,
+                                   clock=lambda: self.now)
+
+    def calls(self):
+        """Count the requests made to each region."""
+        return [self.clients[region].describe_regions.call_count for region in REGIONS]
+
+    def test_regions_are_probed_concurrently(self):
+        """Test a probe round takes as long as the slowest region, not the sum."""
+        for client in self.clients.values():
+            client.describe_regions.side_effect = lambda **kwargs: time.sleep(0.2)
+
+        started = time.perf_counter()
+        latencies = self.probes.latencies()
+        elapsed = time.perf_counter() - started
+
+        assert [region for region, _ in latencies] == REGIONS
+        assert all(latency >= 200 for _, latency in latencies)
+        assert elapsed < 0.5
+
+    def test_fresh_results_are_cached(self):
+        """Test results within the refresh period are served without probing."""
+        self.probes.latencies()
+        self.now = 10
+        self.probes.latencies()
+
+        assert self.calls() == [1, 1, 1]
+
+    def test_stale_results_are_probed_again_before_answering(self):
+        """Test results older than the refresh period are probed again within the call."""
+        self.probes.latencies()
+        self.now = 20
+
+        latencies = self.probes.latencies()
+
+        assert len(latencies) == 3
+        assert self.calls() == [2, 2, 2]
+
+    def test_samples_longer_than_the_timeout_are_discarded(self):
+        """Test a region that answers too slowly is left out rather than reported with an inflated latency."""
+        probes = RegionProbes(REGIONS, self.clients.__getitem__, timeout=0.05, clock=lambda: self.now)
+        self.clients['eu-west-2'].describe_regions.side_effect = lambda **kwargs: time.sleep(0.1)
+
+        assert [region for region, _ in probes.latencies()] == ['us-east-1', 'ap-southeast-1']
+
+    def test_failed_region_keeps_last_latency_until_expired(self):
+        """Test a region that fails is served from its last result until that expires."""
+        self.probes.latencies()
+        self.clients['eu-west-2'].describe_regions.side_effect = Exception('Timeout')
+
+        self.now = 20
+        self.probes.latencies()
+        self.now = 50
+        assert [region for region, _ in self.probes.latencies()] == REGIONS
+        self.now = 61
+        assert [region for region, _ in self.probes.latencies()] == ['us-east-1', 'ap-southeast-1']
+
+
+class TestRegionalClients:
+    """Test suite for the pinginfo regional clients."""
+
+    @pytest.fixture(autouse=True)
+    def setup_clients(self):
+        """Setup regional clients over a mocked session."""
+        self.session = MagicMock()
+        self.session.client.side_effect = lambda service, region_name, config: MagicMock(region=region_name)
+        self.config = MagicMock()
+        self.clients = RegionalClients('ec2', self.session, config=self.config)
+
+    def test_nothing_is_built_up_front(self):
+        """Test no client is created until a region is used."""
+        assert self.session.client.call_count == 0
+
+    def test_clients_are_built_once_per_region(self):
+        """Test each region's client is created on first use and reused after."""
+        first = self.clients.get('eu-west-2')
+
+        assert self.clients.get('eu-west-2') is first
+        assert first.region == 'eu-west-2'
+        self.session.client.assert_called_once_with('ec2', region_name='eu-west-2', config=self.config)
+
+    def test_concurrent_first_use_builds_one_client(self):
+        """Test threads asking for the same new region share a single client."""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.clients.get('us-east-1'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(client) for client in results}) == 1
+        assert self.session.client.call_count == 1
@@ -0,0 +1,122 @@
+import sys
+import os
+import gzip
+import io
+import json
+import pytest
+
+# Add the lambda directory to the path so we can import the replay module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/thirdparty/fetcher'))
+
+from replay import open_feed, read_feed, replay
+
+
+class FakeClock:
+    """Clock whose time only moves when slept or advanced."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def tick(t, detail_type='UpdatedOdds', event_id='event-1'):
+    """Build a recorded feed line."""
+    return json.dumps({'t': t, 'type': detail_type, 'detail': {'eventId': event_id}})
+
+
+class TestThirdPartyReplay:
+    """Test suite for the recorded feed replay."""
+
+    @pytest.fixture(autouse=True)
+    def setup_replay(self):
+        """Setup a fake clock and a recorder for emitted batches."""
+        self.clock = FakeClock()
+        self.emitted = []
+        yield
+
+    def emit(self, batch):
+        self.emitted.append((self.clock.now, batch))
+
+    def test_read_feed(self):
+        """Test feed lines are parsed into ticks and blank lines are skipped."""
+        ticks = list(read_feed([tick(10.5), '', tick(11, 'EventClosed')]))
+
+        assert ticks == [
+            (10.5, 'UpdatedOdds', {'eventId': 'event-1'}),
+            (11.0, 'EventClosed', {'eventId': 'event-1'})
+        ]
+
+    def test_read_feed_rejects_invalid_lines(self):
+        """Test malformed and unknown ticks are reported with their line number."""
+        with pytest.raises(ValueError, match='line 2'):
+            list(read_feed([tick(1), '{"t": 2}']))
+        with pytest.raises(ValueError, match='unknown type'):
+            list(read_feed([tick(1, 'WalletCreated')]))
+
+    def test_open_feed_decompresses_gzip(self):
+        """Test gzip compressed feeds are read as text lines."""
+        data = gzip.compress((tick(1) + '\n' + tick(2) + '\n').encode('utf-8'))
+
+        ticks = list(read_feed(open_feed(io.BytesIO(data), 'saturday.jsonl.gz')))
+
+        assert [t for t, _, _ in ticks] == [1.0, 2.0]
+
+    def test_replay_keeps_inter_arrival_times(self):
+        """Test batches are emitted at their recorded offsets scaled by the speed."""
+        ticks = read_feed([tick(50), tick(50, event_id='event-2'), tick(52), tick(56)])
+
+        stats = replay(ticks, self.emit, speed=2.0, clock=self.clock, sleep=self.clock.sleep)
+
+        assert [when for when, _ in self.emitted] == [100.0, 101.0, 103.0]
+        assert len(self.emitted[0][1]) == 2
+        assert stats['ticks'] == 4
+        assert stats['batches'] == 3
+        assert stats['offset'] == 6.0
+
+    def test_replay_does_not_accumulate_drift(self):
+        """Test slow emits are caught up on rather than pushing later ticks back."""
+        def slow_emit(batch):
+            self.emit(batch)
+            self.clock.now += 1.5
+
+        stats = replay(read_feed([tick(0), tick(1), tick(2), tick(5)]), slow_emit,
+                       clock=self.clock, sleep=self.clock.sleep)
+
+        assert [when for when, _ in self.emitted] == [100.0, 101.5, 103.0, 105.0]
+        assert stats['maxLag'] == pytest.approx(1.0)
+
+    def test_replay_start_and_deadline(self):
+        """Test a replay can start part way through and stops at the deadline."""
+        ticks = read_feed([tick(0), tick(10), tick(20), tick(30)])
+
+        stats = replay(ticks, self.emit, start=10, deadline=115.0, clock=self.clock, sleep=self.clock.sleep)
+
+        assert [batch[0][1]['eventId'] for _, batch in self.emitted] == ['event-1', 'event-1']
+        assert [when for when, _ in self.emitted] == [100.0, 110.0]
+        assert stats['truncated'] is True
+        assert stats['offset'] == 30.0
+
+    def test_replay_resumes_without_duplicates(self):
+        """Test resuming from the reported offset emits every tick exactly once."""
+        lines = [tick(t, event_id=f'event-{t}') for t in (0, 0, 5, 10, 10, 15, 20)]
+
+        first = replay(read_feed(lines), self.emit, deadline=107.0, clock=self.clock, sleep=self.clock.sleep)
+        second = replay(read_feed(lines), self.emit, start=first['offset'], clock=self.clock, sleep=self.clock.sleep)
+
+        emitted = [detail['eventId'] for _, batch in self.emitted for _, detail in batch]
+        assert first['truncated'] is True
+        assert second['truncated'] is False
+        assert emitted == ['event-0', 'event-0', 'event-5', 'event-10', 'event-10', 'event-15', 'event-20']
+        assert first['ticks'] + second['ticks'] == len(lines)
+
+    def test_replay_rejects_invalid_speed(self):
+        """Test the speed multiplier must be positive."""
+        with pytest.raises(ValueError):
+            replay([], self.emit, speed=0)
@@ -0,0 +1,63 @@
+import sys
+import os
+import io
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from urllib.error import HTTPError
+
+# Add the lambda directory to the path so we can import the fetcher modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/thirdparty/fetcher'))
+
+from sources import HttpOddsSource, PollCursor, PollCursors
+
+
+def odds(event_id, home='2.0', away='3.0', draw='4.0'):
+    """Build an odds update."""
+    return {'eventId': event_id, 'homeOdds': home, 'awayOdds': away, 'drawOdds': draw}
+
+
+class TestThirdPartySources:
+    """Test suite for the fetcher odds sources."""
+
+    def test_poll_cursors_commit_and_discard(self):
+        """Test pending cursors only take effect once committed."""
+        cursors = PollCursors()
+        cursors.advance('provider', PollCursor('10', '"v1"'))
+        assert cursors.get('provider').position is None
+
+        cursors.commit()
+        cursors.advance('provider', PollCursor('20', '"v2"'))
+        cursors.discard()
+
+        assert cursors.get('provider').position == '10'
+        assert cursors.get('provider').etag == '"v1"'
+
+    def test_http_source_polls_from_cursor(self):
+        """Test the provider is asked only for data since the previous poll."""
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.read.return_value = json.dumps({'updates': [odds('a')], 'cursor': '42'}).encode()
+        response.headers = {'ETag': '"v2"'}
+        source = HttpOddsSource('provider', 'https://odds.example.com/feed')
+
+        with patch('sources.urlopen', return_value=response) as mock_urlopen:
+            updates, cursor = source.poll(PollCursor('41', '"v1"'))
+
+        request = mock_urlopen.call_args.args[0]
+        assert request.full_url == 'https://odds.example.com/feed?since=41'
+        assert request.get_header('If-none-match') == '"v1"'
+        assert updates == [odds('a')]
+        assert (cursor.position, cursor.etag) == ('42', '"v2"')
+
+    def test_http_source_not_modified(self):
+        """Test a 304 response yields no updates and keeps the cursor."""
+        source = HttpOddsSource('provider', 'https://odds.example.com/feed')
+        previous = PollCursor('41', '"v1"')
+        not_modified = HTTPError(source.url, 304, 'Not Modified', {}, io.BytesIO())
+
+        with patch('sources.urlopen', side_effect=not_modified):
+            updates, cursor = source.poll(previous)
+
+        assert updates == []
+        assert cursor is previous
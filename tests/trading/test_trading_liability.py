@@ -0,0 +1,123 @@
+import sys
+import os
+import numpy as np
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+
+# Add the lambda directory to the path so we can import the liability book
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/trading/receiver'))
+
+from liability import LiabilityBook, parse_thresholds
+
+
+def bet(bet_id, outcome, odds, amount, event_id='event-1'):
+    """Build a placed bet as published in BetsPlaced."""
+    return {'betId': bet_id, 'eventId': event_id, 'outcome': outcome, 'odds': odds, 'amount': amount}
+
+
+class TestTradingLiability:
+    """Test suite for the trading liability book."""
+
+    @pytest.fixture(autouse=True)
+    def setup_book(self):
+        """Setup a liability book over a mocked DynamoDB resource."""
+        self.now = [0.0]
+        self.mock_dynamodb = MagicMock()
+        self.mock_dynamodb.batch_get_item.return_value = {
+            'Responses': {'liability': [
+                {'eventId': 'event-1', 'entry': 'totals', 'stake_homeWin': 100, 'payout_homeWin': 250,
+                 'stake_draw': 50, 'payout_draw': 200}
+            ]}
+        }
+        self.book = LiabilityBook(self.mock_dynamodb, 'liability', [(100.0, 0.02), (500.0, 0.05)],
+                                  max_age=5.0, clock=lambda: self.now[0])
+        yield
+
+    def test_parse_thresholds(self):
+        """Test thresholds are parsed and sorted by liability."""
+        assert parse_thresholds('5000:0.05, 1000:0.02') == [(1000.0, 0.02), (5000.0, 0.05)]
+        assert parse_thresholds('') == []
+
+    def test_exposures_are_net_of_all_stakes(self):
+        """Test the liability of an outcome is its payout less every stake on the event."""
+        exposures = self.book.exposures(['event-1', 'event-2'])
+
+        assert exposures.tolist() == [[100.0, -150.0, 50.0], [0.0, 0.0, 0.0]]
+
+    def test_exposures_are_served_from_memory(self):
+        """Test totals are read in one batch and reused until they are stale."""
+        self.book.exposures(['event-1', 'event-2'])
+        self.book.exposures(['event-1'])
+        assert self.mock_dynamodb.batch_get_item.call_count == 1
+
+        self.now[0] = 6.0
+        self.book.exposures(['event-1'])
+        assert self.mock_dynamodb.batch_get_item.call_count == 2
+
+    def test_adjustments_follow_thresholds(self):
+        """Test each outcome is shaded by the margin of the highest threshold crossed."""
+        adjustments = self.book.adjustments(['event-1'])
+
+        assert adjustments.tolist() == [[0.02, 0.0, 0.0]]
+
+    def test_record_bet_updates_counters_and_memory(self):
+        """Test a bet is written atomically and added to the totals held in memory."""
+        self.book.exposures(['event-1'])
+
+        assert self.book.record_bet(bet('b1', 'awayWin', '4.0', '200')) is True
+
+        items = self.mock_dynamodb.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert items[0]['Put']['ConditionExpression'] == 'attribute_not_exists(eventId)'
+        assert items[1]['Update']['UpdateExpression'] == 'ADD #s :s, #p :p'
+        assert items[1]['Update']['ExpressionAttributeNames'] == {'#s': 'stake_awayWin', '#p': 'payout_awayWin'}
+        assert np.allclose(self.book.exposure('event-1'), [-100.0, 450.0, -150.0])
+
+    def test_record_bet_with_fractional_odds(self):
+        """Test fractional odds are converted as the pricing engine converts them."""
+        self.book.exposures(['event-1'])
+
+        assert self.book.record_bet(bet('b1', 'awayWin', '3/1', '200')) is True
+
+        items = self.mock_dynamodb.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert Decimal(items[1]['Update']['ExpressionAttributeValues'][':p']['N']) == Decimal('800')
+        assert np.allclose(self.book.exposure('event-1'), [-100.0, 450.0, -150.0])
+
+    def test_record_bet_rejects_invalid_odds(self):
+        """Test odds that cannot be parsed raise before anything is written."""
+        with pytest.raises(ValueError):
+            self.book.record_bet(bet('b1', 'draw', 'evens', '10'))
+
+        self.mock_dynamodb.meta.client.transact_write_items.assert_not_called()
+
+    def test_record_bet_twice_is_a_no_op(self):
+        """Test a redelivered bet is not counted again."""
+        self.mock_dynamodb.meta.client.transact_write_items.side_effect = ClientError(
+            {'Error': {'Code': 'TransactionCanceledException', 'Message': 'cancelled'},
+             'CancellationReasons': [{'Code': 'ConditionalCheckFailed'}, {'Code': 'None'}]},
+            'TransactWriteItems')
+        self.book.exposures(['event-1'])
+
+        assert self.book.record_bet(bet('b1', 'awayWin', '4.0', '200')) is False
+        assert self.book.exposure('event-1').tolist() == [100.0, -150.0, 50.0]
+
+    def test_record_bet_raises_other_errors(self):
+        """Test errors other than a duplicate bet are raised."""
+        self.mock_dynamodb.meta.client.transact_write_items.side_effect = ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'slow down'}},
+            'TransactWriteItems')
+
+        with pytest.raises(ClientError):
+            self.book.record_bet(bet('b1', 'draw', '3.0', '10'))
+
+    def test_unprocessed_keys_are_read_again(self):
+        """Test events DynamoDB did not return are not cached as having no liability."""
+        self.mock_dynamodb.batch_get_item.return_value = {
+            'Responses': {'liability': []},
+            'UnprocessedKeys': {'liability': {'Keys': [{'eventId': 'event-1', 'entry': 'totals'}]}}
+        }
+
+        self.book.exposures(['event-1'])
+
+        assert 'event-1' not in self.book._totals
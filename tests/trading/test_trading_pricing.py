@@ -0,0 +1,96 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Add the lambda directory to the path so we can import the pricing engine
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/trading/receiver'))
+
+from pricing import PricingEngine, build_ladder, parse_odds
+
+
+class TestTradingPricing:
+    """Test suite for the trading pricing engine."""
+
+    @pytest.fixture(autouse=True)
+    def setup_engine(self):
+        """Setup a pricing engine with a 5% margin."""
+        self.engine = PricingEngine(margin=0.05)
+        self.ladder = np.array([float(price) for price in self.engine.ladder])
+        yield
+
+    def test_ladder(self):
+        """Test the ladder is ascending and uses the band increments."""
+        ladder = build_ladder()
+
+        assert ladder[:3] == ['1.01', '1.02', '1.03']
+        assert '2.0' in ladder and '2.02' in ladder and '2.01' not in ladder
+        assert ladder[-1] == '1000.0'
+        assert [float(p) for p in ladder] == sorted(float(p) for p in ladder)
+
+    def test_parse_odds(self):
+        """Test decimal and fractional odds are parsed and invalid odds are NaN."""
+        assert parse_odds('2.5') == 2.5
+        assert parse_odds('5/2') == 3.5
+        assert parse_odds(4) == 4.0
+        assert np.isnan(parse_odds('evens'))
+        assert np.isnan(parse_odds('1/0'))
+
+    def test_provider_margin_is_removed(self):
+        """Test fair probabilities sum to one whatever the provider overround."""
+        fair = self.engine.fair_probabilities(np.array([[1.8, 4.2, 3.6], [2.0, 2.0, 2.0]]))
+
+        assert fair.sum(axis=1) == pytest.approx([1.0, 1.0])
+        assert fair[1] == pytest.approx([1 / 3] * 3)
+
+    def test_prices_are_on_ladder_and_never_above_computed_odds(self):
+        """Test snapped prices are ladder prices no longer than the margin-adjusted odds."""
+        rng = np.random.default_rng(7)
+        odds = rng.uniform(1.05, 50, size=(2000, 3))
+
+        indexes, valid = self.engine.price(odds)
+        snapped = self.ladder[indexes]
+        computed = 1.0 / (self.engine.fair_probabilities(odds) * 1.05)
+
+        exact = np.clip(np.searchsorted(self.ladder, computed, side='right') - 1, 0, len(self.ladder) - 1)
+
+        assert valid.all()
+        # Odds shorter than the bottom of the ladder are priced at its first step
+        assert np.all((snapped <= computed + 1e-9) | (snapped == self.ladder[0]))
+        # Quantizing the probability may cost at most one ladder step, and rarely does
+        assert np.all(indexes >= exact - 1)
+        assert (indexes == exact).mean() > 0.99
+
+    def test_margin_is_applied(self):
+        """Test the priced book carries roughly our margin."""
+        indexes, _ = self.engine.price(np.array([[2.5, 3.1, 3.3]]))
+
+        overround = (1.0 / self.ladder[indexes]).sum()
+        assert overround == pytest.approx(1.05, abs=0.02)
+        assert overround >= 1.05
+
+    def test_adjustments_shorten_outcomes(self):
+        """Test an extra margin on one outcome shortens only that outcome."""
+        odds = np.array([[2.5, 3.1, 3.3]])
+
+        base, _ = self.engine.price(odds)
+        adjusted, _ = self.engine.price(odds, np.array([[0.0, 0.1, 0.0]]))
+
+        assert adjusted[0, 1] < base[0, 1]
+        assert adjusted[0, 0] == base[0, 0]
+        assert adjusted[0, 2] == base[0, 2]
+
+    def test_price_updates_flags_invalid_odds(self):
+        """Test invalid provider odds do not disturb the rest of the batch."""
+        updates = [
+            {'eventId': '1', 'homeOdds': '2.0', 'awayOdds': '3.5', 'drawOdds': '4.0'},
+            {'eventId': '2', 'homeOdds': '0.5', 'awayOdds': '3.5', 'drawOdds': '4.0'},
+            {'eventId': '3', 'homeOdds': '2.0', 'awayOdds': None, 'drawOdds': '4.0'}
+        ]
+
+        priced = self.engine.price_updates(updates)
+
+        assert priced[0]['eventId'] == '1'
+        assert priced[0]['homeOdds'] in self.engine.ladder
+        assert priced[1] is None
+        assert priced[2] is None
@@ -6,6 +6,8 @@ from unittest.mock import patch, MagicMock
 
 # Add the lambda directory to the path so we can import the app
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/trading/receiver'))
+# Add the gql directory to the path to find the shared layer modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/gql'))
 
 class TestTradingReceiver:
     """Test suite for trading receiver functions."""
@@ -20,14 +22,27 @@ class TestTradingReceiver:
             # Import modules inside the test to ensure mocks are applied first
             import app as trading_app
             
+            # Liability book over a mocked DynamoDB resource with no bets placed
+            mock_dynamodb = MagicMock()
+            mock_dynamodb.batch_get_item.return_value = {'Responses': {}}
+            liability_book = trading_app.LiabilityBook(
+                mock_dynamodb, 'test-liability', [(1000.0, 0.02), (5000.0, 0.05)])
+
             # Patch the boto3 session and resources in the app module
             with patch.object(trading_app, 'session') as mock_session, \
-                 patch.object(trading_app, 'events') as mock_events:  # Use a mock instead of events_client
+                 patch.object(trading_app, 'events') as mock_events, \
+                 patch.object(trading_app, 'liability_book', liability_book), \
+                 patch.object(trading_app, 'suspension_book', trading_app.SuspensionBook(mock_dynamodb, 'test-liability')), \
+                 patch.object(trading_app, 'odds_delta_cache', trading_app.OddsDeltaCache()):  # Use a mock instead of events_client
                 
-                # Make the imports and mocks available to the test methods
-                self.trading_app = trading_app
-                self.mock_events = mock_events  # Store the mock for assertions
-                yield
+                # Publish through the mocked client without waiting between retries
+                publisher = trading_app.EventPublisher(mock_events, sleep=lambda s: None)
+                with patch.object(trading_app, 'publisher', publisher):
+                    # Make the imports and mocks available to the test methods
+                    self.trading_app = trading_app
+                    self.mock_events = mock_events  # Store the mock for assertions
+                    self.mock_dynamodb = mock_dynamodb
+                    yield
 
     def test_form_event(self):
         """Test the form_event function."""
@@ -56,9 +71,49 @@ class TestTradingReceiver:
         
         assert result['Source'] == 'com.trading'
         assert result['DetailType'] == 'UpdatedOdds'
-        assert json.loads(result['Detail']) == item['detail']
+        assert json.loads(result['Detail']) == {
+            'eventId': '123',
+            'homeOdds': '2.48',
+            'awayOdds': '3.3',
+            'drawOdds': '2.88'
+        }
         assert result['EventBusName'] == 'test-event-bus'
 
+    def test_handle_updated_odds_invalid_odds(self):
+        """Test updated odds that cannot be priced are dropped."""
+        item = {
+            'source': 'com.thirdparty',
+            'detail-type': 'UpdatedOdds',
+            'detail': {'eventId': '123', 'homeOdds': 'evens', 'awayOdds': '3.0', 'drawOdds': '4.0'}
+        }
+
+        assert self.trading_app.handle_updated_odds(item) is None
+
+    def test_lambda_handler_prices_batch_together(self):
+        """Test every odds update in the batch is priced in one engine call."""
+        records = [
+            {
+                'messageId': str(i),
+                'body': json.dumps({
+                    'source': 'com.thirdparty',
+                    'detail-type': 'UpdatedOdds',
+                    'detail': {'eventId': str(i), 'homeOdds': '2.0', 'awayOdds': '3.5', 'drawOdds': '4.0'}
+                })
+            }
+            for i in range(3)
+        ]
+        engine = self.trading_app.pricing_engine
+
+        with patch.object(engine, 'price', wraps=engine.price) as mock_price, \
+             patch.object(self.trading_app.processor, 'process', return_value=[]), \
+             patch.object(self.trading_app.processor, 'response', return_value={'batchItemFailures': []}):
+            self.trading_app.lambda_handler({'Records': records}, MagicMock())
+
+        mock_price.assert_called_once()
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        assert [json.loads(e['Detail'])['eventId'] for e in entries] == ['0', '1', '2']
+        assert all(e['Source'] == 'com.trading' for e in entries)
+
     def test_record_handler_with_updated_odds(self):
         """Test the record_handler function with UpdatedOdds event."""
         # Create a mock SQSRecord
@@ -223,3 +278,206 @@ class TestTradingReceiver:
             # Verify events.put_events was not called
             self.mock_events.put_events.assert_not_called()
             assert result == {'batchItemFailures': []}
+
+    def test_record_handler_with_bets_placed(self):
+        """Test placed bets are added to the liability book."""
+        mock_record = MagicMock()
+        mock_record.body = json.dumps({
+            'source': 'com.betting',
+            'detail-type': 'BetsPlaced',
+            'detail': {
+                'items': [
+                    {'betId': 'b1', 'eventId': '123', 'outcome': 'homeWin', 'odds': '2.5', 'amount': '100'}
+                ]
+            }
+        })
+
+        result = self.trading_app.record_handler(mock_record)
+
+        assert result is None
+        transaction = self.mock_dynamodb.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert transaction[0]['Put']['Item']['entry'] == {'S': 'bet#b1'}
+        assert transaction[1]['Update']['ExpressionAttributeValues'][':p'] == {'N': '250.0'}
+
+    def test_record_handler_with_fractional_odds_bets(self):
+        """Test bets placed at fractional odds are recorded and invalid odds are skipped."""
+        mock_record = MagicMock()
+        mock_record.body = json.dumps({
+            'source': 'com.betting',
+            'detail-type': 'BetsPlaced',
+            'detail': {
+                'items': [
+                    {'betId': 'b1', 'eventId': '123', 'outcome': 'homeWin', 'odds': 'n/a', 'amount': '10'},
+                    {'betId': 'b2', 'eventId': '123', 'outcome': 'homeWin', 'odds': '2/1', 'amount': '100'}
+                ]
+            }
+        })
+
+        result = self.trading_app.record_handler(mock_record)
+
+        assert result is None
+        self.mock_dynamodb.meta.client.transact_write_items.assert_called_once()
+        transaction = self.mock_dynamodb.meta.client.transact_write_items.call_args.kwargs['TransactItems']
+        assert transaction[0]['Put']['Item']['entry'] == {'S': 'bet#b2'}
+        assert transaction[1]['Update']['ExpressionAttributeValues'][':p'] == {'N': '300.0'}
+
+    def test_record_handler_bets_placed_failure_is_raised(self):
+        """Test a failure recording bets fails the record so it is retried."""
+        self.mock_dynamodb.meta.client.transact_write_items.side_effect = Exception('Throttled')
+        mock_record = MagicMock()
+        mock_record.body = json.dumps({
+            'source': 'com.betting',
+            'detail-type': 'BetsPlaced',
+            'detail': {'items': [{'betId': 'b1', 'eventId': '123', 'outcome': 'draw', 'odds': '3', 'amount': '5'}]}
+        })
+
+        with pytest.raises(Exception):
+            self.trading_app.record_handler(mock_record)
+
+    def test_handle_updated_odds_shades_exposed_outcome(self):
+        """Test an outcome with liability above a threshold is priced shorter."""
+        item = {
+            'source': 'com.thirdparty',
+            'detail-type': 'UpdatedOdds',
+            'detail': {'eventId': '123', 'homeOdds': '2/1', 'awayOdds': '3/1', 'drawOdds': '5/2'}
+        }
+        self.mock_dynamodb.batch_get_item.return_value = {
+            'Responses': {'test-liability': [
+                {'eventId': '123', 'entry': 'totals', 'stake_awayWin': 2000, 'payout_awayWin': 8000}
+            ]}
+        }
+
+        detail = json.loads(self.trading_app.handle_updated_odds(item)['Detail'])
+
+        assert float(detail['awayOdds']) < 3.3
+        assert detail['homeOdds'] == '2.48'
+        assert detail['drawOdds'] == '2.88'
+
+    def test_handle_updated_odds_without_liability(self):
+        """Test odds are still priced when the liability cannot be read."""
+        self.mock_dynamodb.batch_get_item.side_effect = Exception('Unavailable')
+        item = {
+            'source': 'com.thirdparty',
+            'detail-type': 'UpdatedOdds',
+            'detail': {'eventId': '123', 'homeOdds': '2/1', 'awayOdds': '3/1', 'drawOdds': '5/2'}
+        }
+
+        detail = json.loads(self.trading_app.handle_updated_odds(item)['Detail'])
+
+        assert detail['awayOdds'] == '3.3'
+
+    def test_handle_updated_odds_batch_suspends_moving_market(self):
+        """Test a sharp odds move raises a MarketSuspended event for the market."""
+        items = [
+            {
+                'source': 'com.thirdparty',
+                'detail-type': 'UpdatedOdds',
+                'detail': {'eventId': '123', 'homeOdds': home, 'awayOdds': '3.5', 'drawOdds': '4.0'}
+            }
+            for home in ('2.0', '1.05')
+        ]
+
+        with patch.object(self.trading_app, 'suspension_rules', self.trading_app.SuspensionRules()):
+            entries = self.trading_app.handle_updated_odds_batch(items)
+
+        assert [e['DetailType'] for e in entries] == ['UpdatedOdds', 'UpdatedOdds', 'MarketSuspended']
+        assert json.loads(entries[2]['Detail']) == {'eventId': '123', 'market': 'homeOdds', 'reason': 'OddsMovement'}
+
+    def odds_record(self, message_id, event_id, home='2.0', time=None):
+        """Build an SQS record carrying a third-party UpdatedOdds event."""
+        item = {
+            'source': 'com.thirdparty',
+            'detail-type': 'UpdatedOdds',
+            'detail': {'eventId': event_id, 'homeOdds': home, 'awayOdds': '3.5', 'drawOdds': '4.0'}
+        }
+        if time:
+            item['time'] = time
+        return {'messageId': message_id, 'body': json.dumps(item)}
+
+    def test_lambda_handler_keeps_latest_tick_per_event(self):
+        """Test superseded ticks of an event in the batch are dropped, not published."""
+        records = [
+            self.odds_record('m1', 'e1', '2.0', '2024-01-01T00:00:02Z'),
+            self.odds_record('m2', 'e1', '1.9', '2024-01-01T00:00:01Z'),
+            self.odds_record('m3', 'e2', '2.5')
+        ]
+
+        result = self.trading_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        details = [json.loads(e['Detail']) for e in entries]
+        assert [d['eventId'] for d in details] == ['e1', 'e2']
+        latest = json.loads(records[0]['body'])['detail']
+        assert details[0] == self.trading_app.pricing_engine.price_updates([latest])[0]
+
+    def test_lambda_handler_drops_unchanged_odds(self):
+        """Test a tick pricing to the odds already published is not published again."""
+        self.mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': [{}]}
+        self.trading_app.lambda_handler({'Records': [self.odds_record('m1', 'e1', '2.0')]}, MagicMock())
+        self.mock_events.put_events.reset_mock()
+
+        result = self.trading_app.lambda_handler({'Records': [self.odds_record('m2', 'e1', '2.001')]}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        self.mock_events.put_events.assert_not_called()
+
+    def test_lambda_handler_records_suspension_only_once_published(self):
+        """Test a MarketSuspended event that fails to publish leaves the market open, and is raised again."""
+        def put_events(Entries):
+            results = [{'ErrorCode': 'InternalFailure'} if e['DetailType'] == 'MarketSuspended' else {} for e in Entries]
+            return {'FailedEntryCount': sum('ErrorCode' in r for r in results), 'Entries': results}
+        self.mock_events.put_events.side_effect = put_events
+        update_item = self.mock_dynamodb.meta.client.update_item
+
+        with patch.object(self.trading_app, 'suspension_rules', self.trading_app.SuspensionRules()):
+            self.trading_app.lambda_handler({'Records': [self.odds_record('m1', 'e1', '2.0')]}, MagicMock())
+            result = self.trading_app.lambda_handler({'Records': [self.odds_record('m2', 'e1', '1.05')]}, MagicMock())
+
+            assert result == {'batchItemFailures': [{'itemIdentifier': 'm2'}]}
+            update_item.assert_not_called()
+
+            self.mock_events.put_events.side_effect = lambda Entries: {
+                'FailedEntryCount': 0, 'Entries': [{} for _ in Entries]
+            }
+            result = self.trading_app.lambda_handler({'Records': [self.odds_record('m2', 'e1', '1.05')]}, MagicMock())
+
+        assert result == {'batchItemFailures': []}
+        update_item.assert_called_once()
+        assert update_item.call_args.kwargs['ExpressionAttributeNames'] == {'#m': 'homeOdds'}
+
+    def test_lambda_handler_publishes_in_chunks(self):
+        """Test more than ten events are split over several PutEvents requests."""
+        self.mock_events.put_events.return_value = {'FailedEntryCount': 0, 'Entries': []}
+        records = [self.odds_record(f'm{i}', f'e{i}') for i in range(12)]
+
+        self.trading_app.lambda_handler({'Records': records}, MagicMock())
+
+        sizes = sorted(len(c.kwargs['Entries']) for c in self.mock_events.put_events.call_args_list)
+        assert sizes == [2, 10]
+
+    def test_lambda_handler_reports_failed_publish(self):
+        """Test records whose events are rejected are reported and republished on retry."""
+        self.mock_events.put_events.side_effect = [
+            {'FailedEntryCount': 1, 'Entries': [{}, {'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 1, 'Entries': [{'ErrorCode': 'ThrottlingException'}]},
+            {'FailedEntryCount': 0, 'Entries': [{}]}
+        ]
+        records = [self.odds_record('m1', 'e1'), self.odds_record('m2', 'e2')]
+
+        result = self.trading_app.lambda_handler({'Records': records}, MagicMock())
+        retried = self.trading_app.lambda_handler({'Records': records[1:]}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm2'}]}
+        assert retried == {'batchItemFailures': []}
+        assert json.loads(self.mock_events.put_events.call_args.kwargs['Entries'][0]['Detail'])['eventId'] == 'e2'
+
+    def test_lambda_handler_reports_all_records_on_error(self):
+        """Test an unexpected error fails every record instead of acknowledging them."""
+        records = [self.odds_record('m1', 'e1'), self.odds_record('m2', 'e2')]
+
+        with patch.object(self.trading_app, 'handle_updated_odds_batch', side_effect=Exception('Boom')):
+            result = self.trading_app.lambda_handler({'Records': records}, MagicMock())
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}, {'itemIdentifier': 'm2'}]}
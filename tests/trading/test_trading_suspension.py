@@ -0,0 +1,161 @@
+import sys
+import os
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+
+# Add the lambda directory to the path so we can import the suspension rules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/trading/receiver'))
+
+from suspension import RingBuffer, SuspensionBook, SuspensionRules
+
+STEADY = np.array([0.5, 0.3, 0.2])
+NO_LIABILITY = np.zeros(3)
+
+
+class TestTradingSuspension:
+    """Test suite for the automatic market suspension rules."""
+
+    @pytest.fixture(autouse=True)
+    def setup_rules(self):
+        """Setup rules over a controllable clock."""
+        self.now = [1000.0]
+        self.rules = SuspensionRules(window=60, capacity=8, max_odds_move=0.1, max_liability_growth=1000,
+                                     min_suspension=30, clock=lambda: self.now[0])
+        self.suspended = np.full(3, np.nan)
+        yield
+
+    def tick(self, seconds, probabilities=STEADY, exposure=NO_LIABILITY, event_id='event-1', publish=True):
+        """Observe a tick and, unless its events fail to publish, record the changes it raises."""
+        self.now[0] += seconds
+        changes = self.rules.observe(event_id, np.array(probabilities), np.array(exposure), self.suspended.copy())
+        if publish:
+            for market, detail_type, _ in changes:
+                index = ('homeOdds', 'awayOdds', 'drawOdds').index(market)
+                self.suspended[index] = self.now[0] if detail_type == 'MarketSuspended' else np.nan
+        return changes
+
+    def test_ring_buffer_overwrites_oldest(self):
+        """Test the buffer keeps only the most recent samples within the window."""
+        buffer = RingBuffer(3, 1)
+        for t in range(5):
+            buffer.push(float(t), np.array([t * 10.0]))
+
+        assert sorted(buffer.window(0).ravel().tolist()) == [20.0, 30.0, 40.0]
+        assert sorted(buffer.window(3.5).ravel().tolist()) == [40.0]
+
+    def test_steady_market_is_not_suspended(self):
+        """Test small movements do not trigger a suspension."""
+        assert self.tick(0) == []
+        assert self.tick(10, [0.52, 0.29, 0.19]) == []
+
+    def test_fast_odds_movement_suspends_market(self):
+        """Test a market whose probability moves past the limit within the window is suspended."""
+        self.tick(0)
+
+        changes = self.tick(10, [0.65, 0.15, 0.2])
+
+        assert changes == [('homeOdds', 'MarketSuspended', 'OddsMovement'),
+                           ('awayOdds', 'MarketSuspended', 'OddsMovement')]
+        assert self.tick(5, [0.66, 0.14, 0.2]) == []
+
+    def test_slow_movement_outside_window_is_ignored(self):
+        """Test the same movement spread over more than the window does not suspend."""
+        self.tick(0)
+
+        assert self.tick(61, [0.65, 0.2, 0.15]) == []
+
+    def test_liability_growth_suspends_market(self):
+        """Test an outcome taking on liability quickly is suspended."""
+        self.tick(0, exposure=[0, 100, 0])
+
+        changes = self.tick(10, exposure=[0, 1500, 0])
+
+        assert changes == [('awayOdds', 'MarketSuspended', 'Liability')]
+
+    def test_market_is_unsuspended_once_released(self):
+        """Test a suspended market is released after calming down and the minimum suspension."""
+        self.tick(0)
+        self.tick(10, [0.65, 0.3, 0.05])
+
+        # Still inside the window of the move
+        assert self.tick(20, [0.65, 0.3, 0.05]) == []
+        # The move has left the window and the minimum suspension has passed
+        changes = self.tick(60, [0.65, 0.3, 0.05])
+
+        assert ('homeOdds', 'MarketUnsuspended', 'Released') in changes
+        assert ('drawOdds', 'MarketUnsuspended', 'Released') in changes
+
+    def test_unpublished_suspension_is_raised_again(self):
+        """Test the rules leave the suspension state alone, so a change that was not published is raised again."""
+        self.tick(0)
+        self.tick(10, [0.65, 0.15, 0.2], publish=False)
+
+        changes = self.tick(5, [0.66, 0.14, 0.2])
+
+        assert changes == [('homeOdds', 'MarketSuspended', 'OddsMovement'),
+                           ('awayOdds', 'MarketSuspended', 'OddsMovement')]
+
+    def test_events_are_independent_and_bounded(self):
+        """Test rule state is kept per event and the number of events is bounded."""
+        rules = SuspensionRules(max_events=2, clock=lambda: self.now[0])
+        for event_id in ('a', 'b', 'c'):
+            rules.observe(event_id, STEADY, NO_LIABILITY)
+
+        assert list(rules._events) == ['b', 'c']
+
+
+class TestSuspensionBook:
+    """Test suite for the shared suspended markets of events."""
+
+    @pytest.fixture(autouse=True)
+    def setup_book(self):
+        """Setup a book over a mocked DynamoDB resource and a controllable clock."""
+        self.now = [1000.0]
+        self.dynamodb = MagicMock()
+        self.dynamodb.batch_get_item.return_value = {'Responses': {'test-liability': [
+            {'eventId': 'event-1', 'entry': 'suspension', 'awayOdds': 900}
+        ]}}
+        self.book = SuspensionBook(self.dynamodb, 'test-liability', max_age=5, clock=lambda: self.now[0])
+        yield
+
+    def test_suspended_markets_are_loaded_once_per_max_age(self):
+        """Test the suspended markets of a batch are read together and served from memory until stale."""
+        suspended = self.book.suspended_since(['event-1', 'event-2'])
+
+        assert np.isnan(suspended[0, [0, 2]]).all() and suspended[0, 1] == 900
+        assert np.isnan(suspended[1]).all()
+        self.book.suspended_since(['event-1'])
+        assert self.dynamodb.batch_get_item.call_count == 1
+
+        self.now[0] += 5
+        self.book.suspended_since(['event-1'])
+        assert self.dynamodb.batch_get_item.call_count == 2
+
+    def test_record_writes_conditionally_and_updates_memory(self):
+        """Test a published change is written only from the state it starts from and applied in memory."""
+        self.book.suspended_since(['event-1'])
+
+        self.book.record('event-1', 'homeOdds', 'MarketSuspended')
+        self.book.record('event-1', 'awayOdds', 'MarketUnsuspended')
+
+        suspend, unsuspend = [call.kwargs for call in self.dynamodb.meta.client.update_item.call_args_list]
+        assert suspend['Key'] == {'eventId': {'S': 'event-1'}, 'entry': {'S': 'suspension'}}
+        assert suspend['ConditionExpression'] == 'attribute_not_exists(#m)'
+        assert suspend['ExpressionAttributeNames'] == {'#m': 'homeOdds'}
+        assert unsuspend['UpdateExpression'] == 'REMOVE #m'
+        assert unsuspend['ConditionExpression'] == 'attribute_exists(#m)'
+        suspended = self.book.suspended_since(['event-1'])[0]
+        assert suspended[0] == 1000.0 and np.isnan(suspended[1:]).all()
+
+    def test_change_recorded_elsewhere_is_read_again(self):
+        """Test a change another container recorded first makes the event be read again."""
+        self.book.suspended_since(['event-1'])
+        self.dynamodb.meta.client.update_item.side_effect = ClientError(
+            {'Error': {'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'}}, 'UpdateItem')
+
+        self.book.record('event-1', 'homeOdds', 'MarketSuspended')
+        self.book.suspended_since(['event-1'])
+
+        assert self.dynamodb.batch_get_item.call_count == 2
@@ -0,0 +1,63 @@
+import sys
+import os
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+# Add the lambda directory to the path so we can import the bulk module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda/user/resolvers'))
+
+from bulk import update_all, error_code
+
+
+class CognitoError(Exception):
+    """Exception carrying an AWS error response, like a botocore ClientError."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code, 'Message': code}}
+
+
+def users(count):
+    """Build lockUsers inputs for a number of users."""
+    return [{'userId': f'user-{i}', 'isLocked': 'true'} for i in range(count)]
+
+
+class TestBulkLocking:
+    """Test suite for bulk user locking."""
+
+    def test_updates_are_bounded(self):
+        """Test no more than max_workers updates run at once."""
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def update(user_id, is_locked):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        errors = update_all(update, users(20), max_workers=4)
+
+        assert errors == [None] * 20
+        assert running[1] == 4
+
+    def test_failed_users_are_reported_in_order(self):
+        """Test a failing user is reported by error code without stopping the others."""
+        def update(user_id, is_locked):
+            if user_id == 'user-1':
+                raise CognitoError('UserNotFoundException')
+
+        assert update_all(update, users(3)) == [None, 'UserNotFoundException', None]
+
+    def test_no_users(self):
+        """Test an empty input makes no updates."""
+        assert update_all(MagicMock(), []) == []
+
+    def test_error_code(self):
+        """Test error codes come from the AWS response, or the exception type without one."""
+        assert error_code(CognitoError('TooManyRequestsException')) == 'TooManyRequestsException'
+        assert error_code(ValueError('bad')) == 'ValueError'
@@ -0,0 +1,148 @@
+import sys
+import os
+import json
+import importlib.util
+import pytest
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '../../infrastructure/lambda')
+
+# Add the gql directory to the path to find the shared layer modules
+sys.path.append(os.path.join(LAMBDA_DIR, 'gql'))
+
+
+def load_app(name, directory):
+    """Import the app module of a function under its own name, as every function calls it app."""
+    sys.path.insert(0, directory)
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(directory, 'app.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.remove(directory)
+
+
+# Imported while collecting, before test_user_resolvers replaces powertools in sys.modules
+with patch.dict(os.environ, {
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'USER_POOL_ID': 'test-user-pool-id',
+    'EVENT_BUS': 'test-event-bus'
+}):
+    user_app = load_app('user_resolvers_app', os.path.join(LAMBDA_DIR, 'user/resolvers'))
+
+
+def appsync_event(field_name, input, sub='caller-user-id'):
+    """Build an AppSync resolver event for a mutation called by the given user."""
+    return {
+        'info': {'parentTypeName': 'Mutation', 'fieldName': field_name},
+        'arguments': {'input': input},
+        'identity': {'sub': sub, 'claims': {'sub': sub}}
+    }
+
+
+class TestLockUser:
+    """Test suite for the lockUser and lockUserGenerateEvent resolvers."""
+
+    @pytest.fixture(autouse=True)
+    def setup_user_app(self, aws_credentials):
+        """Setup the resolvers with mocked Cognito and EventBridge clients."""
+        self.mock_cognito = MagicMock()
+        self.mock_events = MagicMock()
+        self.mock_events.put_events.side_effect = lambda Entries: {
+            'FailedEntryCount': 0, 'Entries': [{} for _ in Entries]
+        }
+        with patch.object(user_app, 'cognito', self.mock_cognito), \
+             patch.object(user_app, 'publisher', user_app.EventPublisher(self.mock_events, sleep=lambda s: None)):
+            yield
+
+    def published_details(self):
+        """Details of every event published so far."""
+        return [
+            json.loads(entry['Detail'])
+            for call in self.mock_events.put_events.call_args_list
+            for entry in call.kwargs['Entries']
+        ]
+
+    @pytest.mark.parametrize('field_name', ['lockUser', 'lockUserGenerateEvent'])
+    def test_caller_cannot_lock_another_user(self, field_name):
+        """Test a userId in the input is ignored, so only the caller's own account is locked."""
+        event = appsync_event(field_name, {'userId': 'victim-user-id', 'isLocked': 'true'})
+
+        result = user_app.app.resolve(event, MagicMock())
+
+        assert result == {'__typename': 'User', 'userId': 'caller-user-id', 'isLocked': 'true'}
+        assert self.mock_cognito.admin_update_user_attributes.call_args.kwargs['Username'] == 'caller-user-id'
+        assert self.published_details() == [{'__typename': 'User', 'userId': 'caller-user-id', 'isLocked': 'true'}]
+
+
+class TestLockUsers:
+    """Test suite for the lockUsers resolver."""
+
+    @pytest.fixture(autouse=True)
+    def setup_user_app(self, aws_credentials):
+        """Setup the resolver with mocked bulk Cognito and EventBridge clients."""
+        self.mock_cognito = MagicMock()
+        self.mock_events = MagicMock()
+        self.mock_events.put_events.side_effect = lambda Entries: {
+            'FailedEntryCount': 0, 'Entries': [{} for _ in Entries]
+        }
+        with patch.object(user_app, 'bulk_cognito', self.mock_cognito), \
+             patch.object(user_app, 'publisher', user_app.EventPublisher(self.mock_events, sleep=lambda s: None)):
+            yield
+
+    def users(self, count):
+        """Build lockUsers inputs for a number of users."""
+        return [{'userId': f'user-{i}', 'isLocked': 'true'} for i in range(count)]
+
+    def test_too_many_users_is_an_input_error(self):
+        """Test a call over the size cap is rejected before any user is updated."""
+        event = appsync_event('lockUsers', {'users': self.users(3)})
+
+        with patch.object(user_app, 'lock_users_max', 2):
+            result = user_app.app.resolve(event, MagicMock())
+
+        assert result == {'__typename': 'InputError', 'message': 'At most 2 users can be locked in one call.'}
+        self.mock_cognito.admin_update_user_attributes.assert_not_called()
+        self.mock_events.put_events.assert_not_called()
+
+    def test_failed_update_is_reported_for_its_user(self):
+        """Test a Cognito error is reported by its code and only updated users are published."""
+        def update(UserPoolId, Username, UserAttributes):
+            if Username == 'user-1':
+                raise ClientError({'Error': {'Code': 'UserNotFoundException', 'Message': 'User does not exist.'}},
+                                  'AdminUpdateUserAttributes')
+        self.mock_cognito.admin_update_user_attributes.side_effect = update
+        event = appsync_event('lockUsers', {'users': self.users(3)})
+
+        result = user_app.app.resolve(event, MagicMock())
+
+        assert result['__typename'] == 'LockUserResultList'
+        assert [(item['userId'], item['succeeded'], item['error']) for item in result['items']] == [
+            ('user-0', True, None),
+            ('user-1', False, 'UserNotFoundException'),
+            ('user-2', True, None)
+        ]
+        entries = self.mock_events.put_events.call_args.kwargs['Entries']
+        assert [json.loads(entry['Detail'])['userId'] for entry in entries] == ['user-0', 'user-2']
+
+    def test_unpublished_event_is_reported(self):
+        """Test a user whose userLocked event cannot be published is reported as EventNotPublished."""
+        def put_events(Entries):
+            # The event of user-1 is rejected on every attempt
+            results = [
+                {'ErrorCode': 'InternalFailure'} if json.loads(entry['Detail'])['userId'] == 'user-1' else {}
+                for entry in Entries
+            ]
+            return {'FailedEntryCount': sum('ErrorCode' in r for r in results), 'Entries': results}
+        self.mock_events.put_events.side_effect = put_events
+        event = appsync_event('lockUsers', {'users': self.users(3)})
+
+        result = user_app.app.resolve(event, MagicMock())
+
+        assert [(item['succeeded'], item['error']) for item in result['items']] == [
+            (True, None),
+            (False, 'EventNotPublished'),
+            (True, None)
+        ]
@@ -172,6 +172,22 @@ class TestWalletResolvers:
         # Verify the event was raised
         self.mock_raise_event.assert_called_once_with('WalletCreated', {'userId': 'new-user-id'})
 
+    def test_create_wallet_keeps_existing_wallet(self, wallet_table, appsync_event_create_wallet):
+        """Test creating a wallet that already exists leaves its balance alone."""
+        # Setup: A wallet created on sign-up that has since had a deposit
+        wallet_table.put_item(Item={'userId': 'new-user-id', 'balance': Decimal('25.00')})
+        self.wallet_app.app.current_event = self.AppSyncResolverEvent(appsync_event_create_wallet)
+        
+        # Execute the function
+        result = self.wallet_app.create_wallet({'userId': 'new-user-id'})
+        
+        # Verify the existing wallet is returned unchanged
+        assert result['__typename'] == 'Wallet'
+        assert result['balance'] == Decimal('25.00')
+        response = wallet_table.get_item(Key={'userId': 'new-user-id'})
+        assert response['Item']['balance'] == Decimal('25.00')
+        self.mock_raise_event.assert_called_once_with('WalletCreated', {'userId': 'new-user-id'})
+
     def test_deduct_funds_success(self, wallet_table, appsync_event_deduct_funds):
         """Test successful funds deduction."""
         # Setup: Create a wallet in the mock DynamoDB table